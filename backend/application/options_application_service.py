@@ -0,0 +1,259 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from application.stock_application_service import PreparedResponse, series_version
+from domain.entities.stock_data import StockData
+from domain.services.black_scholes import DAYS_PER_YEAR
+from domain.services.option_chain import OptionChain
+from domain.services.stock_service import StockService
+from domain.services.volatility_surface import VolatilitySurface
+
+
+class OptionsApplicationService:
+    """
+    Usługa aplikacyjna do obsługi operacji związanych z opcjami.
+
+    Łańcuch opcji wyceniany jest z ostatniej migawki szeregu dziennego
+    instrumentu bazowego i przechowywany w chain_cache do czasu zmiany
+    szeregu - kolejne zapytania (inne filtry, inne terminy) jedynie wybierają
+    kontrakty z gotowych kolumn. Z kwotowań łańcucha dopasowywana jest
+    powierzchnia zmienności (również raz na migawkę), z której pochodzą
+    zmienności kontraktów spoza łańcucha i zmienność dla predykcji.
+    Wycena łańcuchów i dopasowanie powierzchni wykonywane są w puli wątków,
+    aby nie blokować wspólnej pętli zdarzeń.
+    """
+
+    # Zakres dni historii dziennej (zmienność historyczna z ostatnich sesji)
+    HISTORY_DAYS = 120
+
+    def __init__(self, stock_service: StockService, chain_cache=None):
+        self.stock_service = stock_service
+        # Opcjonalna pamięć podręczna łańcuchów (get_or_build według wersji szeregu)
+        self.chain_cache = chain_cache
+        # Łączne statystyki wyznaczania zmienności implikowanej wycenionych łańcuchów
+        self._stats = {"chainsPriced": 0, "contracts": 0, "converged": 0, "unsolvable": 0, "failed": 0,
+                       "maxIterations": 0, "newtonSteps": 0, "bisectionSteps": 0}
+        self._surface_stats = {"builds": 0, "buildSeconds": 0.0, "lastBuildMs": None,
+                               "queries": 0, "querySeconds": 0.0}
+
+    async def _underlying(self, symbol: str) -> StockData:
+        """Pobiera szereg dzienny instrumentu bazowego."""
+        data = await self.stock_service.get_stock_data_async(
+            symbol,
+            interval="daily",
+            start_date=datetime.now() - timedelta(days=self.HISTORY_DAYS)
+        )
+        if not data or not len(data.series):
+            raise LookupError(f"Brak danych dla symbolu {symbol}")
+        return data
+
+    def _chain(self, symbol: str, data: StockData, version: Tuple,
+               expiration: Optional[date] = None) -> OptionChain:
+        """
+        Zwraca łańcuch dla migawki - z pamięci podręcznej lub wyceniony od nowa.
+
+        Łańcuch standardowych terminów wyceniany jest z uśmiechu zmienności,
+        a termin spoza niego (expiration) - z powierzchni dopasowanej do
+        kwotowań łańcucha standardowego.
+        """
+        if expiration is None:
+            def build():
+                return self._priced(OptionChain(symbol, data.series))
+        else:
+            def build():
+                surface = self._surface(symbol, data, version)
+                return self._priced(OptionChain(symbol, data.series, [expiration],
+                                                volatility_model=surface.volatility))
+
+        if self.chain_cache is None:
+            return build()
+        return self.chain_cache.get_or_build(("chain", symbol.upper(), expiration), version, build)
+
+    def _priced(self, chain: OptionChain) -> OptionChain:
+        self._record(chain.solver_stats)
+        print(f"[DEBUG][OptionsService] Wyceniono łańcuch {chain.symbol} - kontraktów: {len(chain)}, "
+              f"zmienność bazowa: {chain.base_volatility:.4f}, solver IV: {chain.solver_stats}")
+        return chain
+
+    def _surface(self, symbol: str, data: StockData, version: Tuple) -> VolatilitySurface:
+        """
+        Zwraca powierzchnię zmienności migawki - dopasowywaną ponownie tylko po zmianie łańcucha.
+
+        Powierzchnia dopasowywana jest do kontraktów, których kwotowania
+        wyznaczają zmienność (chain.solved). Gdy takich kwotowań jest za mało
+        (niska cena instrumentu - krok notowania to duża zmiana zmienności),
+        dopasowanie obejmuje cały łańcuch, w którym pozostałe kontrakty mają
+        zmienność modelu.
+        """
+        def build():
+            chain = self._chain(symbol, data, version)
+            try:
+                solved = chain.solved
+                surface = VolatilitySurface.fit(chain.spot, chain.rate, chain.strike[solved], chain.time[solved],
+                                                chain.implied_volatility[solved], chain.is_call[solved])
+            except ValueError:
+                print(f"[DEBUG][OptionsService] Za mało kwotowań wyznaczających zmienność {chain.symbol} "
+                      f"({int(chain.solved.sum())}) - dopasowanie do całego łańcucha")
+                surface = VolatilitySurface.fit(chain.spot, chain.rate, chain.strike, chain.time,
+                                                chain.implied_volatility, chain.is_call)
+            self._surface_stats["builds"] += 1
+            self._surface_stats["buildSeconds"] += surface.build_seconds
+            self._surface_stats["lastBuildMs"] = round(surface.build_seconds * 1000, 3)
+            print(f"[DEBUG][OptionsService] Dopasowano powierzchnię zmienności {chain.symbol} - przekrojów: "
+                  f"{len(surface.times)}, czas: {surface.build_seconds * 1000:.1f} ms")
+            return surface
+
+        if self.chain_cache is None:
+            return build()
+        return self.chain_cache.get_or_build(("surface", symbol.upper()), version, build)
+
+    def query_volatility(self, surface: VolatilitySurface, strike: float, time_to_expiry: float) -> float:
+        """Zmienność z powierzchni dla (K, T) - czas zapytań trafia do statystyk."""
+        started = time.perf_counter()
+        volatility = surface.volatility_at(strike, time_to_expiry)
+        self._surface_stats["querySeconds"] += time.perf_counter() - started
+        self._surface_stats["queries"] += 1
+        return volatility
+
+    async def get_surface_async(self, symbol: str) -> Tuple[StockData, Tuple, VolatilitySurface]:
+        """Zwraca szereg instrumentu bazowego, jego wersję i powierzchnię zmienności migawki."""
+        data = await self._underlying(symbol)
+        version = series_version(data)
+        return data, version, await asyncio.to_thread(self._surface, symbol, data, version)
+
+    async def get_expirations_async(self, symbol: str) -> List[str]:
+        """Zwraca terminy wygaśnięcia (YYYY-MM-DD) łańcucha opcji symbolu."""
+        data = await self._underlying(symbol)
+        chain = await asyncio.to_thread(self._chain, symbol, data, series_version(data))
+        return [expiration.isoformat() for expiration in chain.expirations]
+
+    async def describe_surface_async(self, symbol: str, strike: Optional[float] = None,
+                                     days: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Zwraca parametry powierzchni zmienności symbolu i - dla podanych strike i days - zmienność w tym punkcie.
+        """
+        data, _, surface = await self.get_surface_async(symbol)
+        result = {
+            "spot": surface.spot,
+            "rate": surface.rate,
+            "buildMs": round(surface.build_seconds * 1000, 3),
+            "slices": surface.slices()
+        }
+        if strike is not None and days is not None:
+            result["volatility"] = round(self.query_volatility(surface, strike, days / DAYS_PER_YEAR), 6)
+        return result
+
+    async def prepare_option_chain_async(self, symbol: str,
+                                         expiration_date: Optional[str] = None,
+                                         option_type: Optional[str] = None,
+                                         min_strike: Optional[float] = None,
+                                         max_strike: Optional[float] = None) -> PreparedResponse:
+        """
+        Wybiera kontrakty łańcucha opcji; opisy kontraktów budowane są dopiero w build().
+
+        Args:
+            symbol: Symbol instrumentu bazowego
+            expiration_date: Termin wygaśnięcia (YYYY-MM-DD); domyślnie najbliższy
+                             z łańcucha, termin spoza łańcucha wyceniany jest osobno
+            option_type: "call", "put" lub None (oba typy)
+            min_strike: Najniższa cena wykonania
+            max_strike: Najwyższa cena wykonania
+
+        Returns:
+            PreparedResponse z wersją szeregu instrumentu bazowego
+
+        Raises:
+            ValueError: Nieprawidłowy lub miniony termin wygaśnięcia
+        """
+        data = await self._underlying(symbol)
+        version = series_version(data)
+        chain, expiration = await asyncio.to_thread(self._chain_for, symbol, data, version, expiration_date)
+
+        indices = chain.select(expiration, option_type, min_strike, max_strike)
+        print(f"[DEBUG][OptionsService] Łańcuch {chain.symbol} {expiration.isoformat()} - wybrano kontraktów: {len(indices)}")
+        return PreparedResponse(version, data.last_refreshed, lambda: chain.contracts(indices))
+
+    async def prepare_greeks_async(self, symbol: str, strike: float, expiration_date: Optional[str] = None,
+                                   option_type: str = "call", price: Optional[float] = None) -> PreparedResponse:
+        """
+        Zwraca greki i zmienność implikowaną jednego kontraktu z łańcucha migawki.
+
+        Args:
+            symbol: Symbol instrumentu bazowego
+            strike: Cena wykonania
+            expiration_date: Termin wygaśnięcia (YYYY-MM-DD); domyślnie najbliższy z łańcucha
+            option_type: "call" lub "put"
+            price: Cena rynkowa kontraktu - greki liczone są przy zmienności implikowanej z tej ceny
+
+        Returns:
+            PreparedResponse z wersją szeregu instrumentu bazowego
+
+        Raises:
+            ValueError: Nieprawidłowy termin wygaśnięcia lub cena poza granicami arbitrażowymi
+        """
+        data = await self._underlying(symbol)
+        version = series_version(data)
+        is_call = option_type != "put"
+
+        def compute():
+            chain, expiration = self._chain_for(symbol, data, version, expiration_date)
+            volatility = None
+            if price is None and chain.find(expiration, strike, is_call) is None:
+                # Kontrakt spoza siatki - zmienność z powierzchni
+                volatility = self.query_volatility(self._surface(symbol, data, version), strike,
+                                                   float(chain.years_to([expiration])[0]))
+            return chain.greeks(expiration, strike, is_call, price, volatility)
+
+        greeks = await asyncio.to_thread(compute)
+        return PreparedResponse(version, data.last_refreshed, lambda: greeks)
+
+    def _chain_for(self, symbol: str, data: StockData, version: Tuple,
+                   expiration_date: Optional[str]) -> Tuple[OptionChain, date]:
+        """Zwraca łańcuch zawierający termin expiration_date (domyślnie najbliższy) i ten termin."""
+        chain = self._chain(symbol, data, version)
+
+        if expiration_date:
+            try:
+                expiration = datetime.strptime(expiration_date, "%Y-%m-%d").date()
+            except ValueError:
+                raise ValueError(f"Nieprawidłowa data wygaśnięcia: {expiration_date} (oczekiwany format YYYY-MM-DD)")
+        else:
+            expiration = chain.expirations[0]
+
+        if expiration not in chain.expirations:
+            if expiration <= chain.as_of.date():
+                raise ValueError(f"Termin wygaśnięcia {expiration.isoformat()} nie jest późniejszy "
+                                 f"niż ostatnia sesja ({chain.as_of.date().isoformat()})")
+            chain = self._chain(symbol, data, version, expiration)
+        return chain, expiration
+
+    def _record(self, solver_stats: Dict[str, Any]) -> None:
+        self._stats["chainsPriced"] += 1
+        for name, value in solver_stats.items():
+            if name == "maxIterations":
+                self._stats[name] = max(self._stats[name], value)
+            else:
+                self._stats[name] += value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki wyceny łańcuchów, solvera zmienności implikowanej i powierzchni zmienności."""
+        surface = self._surface_stats
+        return {
+            **self._stats,
+            "surface": {
+                "builds": surface["builds"],
+                "avgBuildMs": round(surface["buildSeconds"] * 1000 / surface["builds"], 3) if surface["builds"] else None,
+                "lastBuildMs": surface["lastBuildMs"],
+                "queries": surface["queries"],
+                "avgQueryMicros": round(surface["querySeconds"] * 1e6 / surface["queries"], 2) if surface["queries"] else None
+            }
+        }
+
+    async def get_option_chain_async(self, symbol: str, **filters) -> List[Dict[str, Any]]:
+        """Asynchroniczny odpowiednik prepare_option_chain_async zwracający gotowe kontrakty."""
+        prepared = await self.prepare_option_chain_async(symbol, **filters)
+        return await prepared.build_async()
@@ -0,0 +1,262 @@
+import asyncio
+import math
+import time
+import zlib
+from concurrent.futures import Executor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from application.options_application_service import OptionsApplicationService
+from application.stock_application_service import series_version
+from domain.entities.stock_data import StockData
+from domain.services.black_scholes import DAYS_PER_YEAR
+from domain.services.kernel_density import ReturnDensity
+from domain.services.monte_carlo import (
+    BOOTSTRAP, CHUNK_PATHS, GBM, TRADING_DAYS_PER_YEAR, ReturnModel, chunk_sizes, simulate_log_returns
+)
+from domain.services.option_chain import RISK_FREE_RATE
+from domain.services.price_distribution import (
+    CONFIDENCE_LEVELS, grid_distribution, grid_probability_above, lognormal_distribution, sample_distribution
+)
+from domain.services.stock_service import StockService
+
+
+class PredictionApplicationService:
+    """
+    Usługa aplikacyjna do obsługi predykcji rozkładu ceny instrumentu.
+
+    Modele:
+        gbm - symulacja Monte Carlo geometrycznego ruchu Browna o dryfie
+              i zmienności skalibrowanych z historii cen
+        bootstrap - symulacja Monte Carlo losująca historyczne dzienne stopy zwrotu
+        implied - rozkład logarytmiczno-normalny (wzory zamknięte) przy zmienności
+                  z powierzchni zmienności opcji i mierze neutralnej względem ryzyka
+
+    Niezależnie od modeli symulacyjnych get_return_distribution_async zwraca
+    rozkład z jądrowego estymatora gęstości historycznych stóp zwrotu
+    (ReturnDensity). Estymator budowany jest raz na (symbol, okno) i migawkę
+    szeregu i przechowywany w density_cache, więc zapytania o inne ceny
+    wykonania, horyzonty i poziomy ufności nie powtarzają estymacji.
+    """
+
+    MODEL_IMPLIED = "implied"
+    MODELS = (GBM, BOOTSTRAP, MODEL_IMPLIED)
+
+    # Domyślna liczba ścieżek i okno kalibracji (sesje)
+    DEFAULT_PATHS = 100_000
+    DEFAULT_WINDOW = TRADING_DAYS_PER_YEAR
+
+    def __init__(self, stock_service: StockService, options_service: OptionsApplicationService,
+                 executor: Optional[Executor] = None, density_cache=None,
+                 chunk_paths: int = CHUNK_PATHS):
+        self.stock_service = stock_service
+        self.options_service = options_service
+        # Pula procesów dla symulacji z wieloma zadaniami (None - wątki pętli zdarzeń)
+        self.executor = executor
+        # Opcjonalna pamięć podręczna estymatorów gęstości (get_or_build według wersji szeregu)
+        self.density_cache = density_cache
+        self.chunk_paths = chunk_paths
+        self._stats = {"simulations": 0, "paths": 0, "lastElapsedMs": None}
+        self._density_stats = {"builds": 0, "buildSeconds": 0.0, "queries": 0, "querySeconds": 0.0}
+
+    async def get_distribution_async(self, symbol: str, strike: Optional[float] = None,
+                                     horizon_days: float = 30,
+                                     volatility_multiplier: float = 1.0,
+                                     model: str = GBM,
+                                     paths: int = DEFAULT_PATHS,
+                                     window: int = DEFAULT_WINDOW,
+                                     seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Zwraca rozkład ceny symbolu po horizon_days dniach.
+
+        Args:
+            symbol: Symbol giełdowy
+            strike: Cena wykonania, dla której odczytywana jest zmienność z powierzchni
+                    (model implied; domyślnie bieżąca cena)
+            horizon_days: Horyzont w dniach kalendarzowych
+            volatility_multiplier: Mnożnik zmienności (scenariusze podwyższonej/obniżonej zmienności)
+            model: "gbm", "bootstrap" lub "implied"
+            paths: Liczba ścieżek symulacji
+            window: Liczba ostatnich sesji użytych do kalibracji
+            seed: Ziarno generatora (domyślnie wyprowadzone z symbolu i ostatniej świecy -
+                  ta sama migawka daje ten sam wynik)
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Nieobsługiwany model: {model}. Dostępne: {', '.join(self.MODELS)}")
+        if model == self.MODEL_IMPLIED:
+            return await self._implied_distribution(symbol, strike, horizon_days, volatility_multiplier)
+        return await self._simulated_distribution(symbol, horizon_days, volatility_multiplier,
+                                                  model, paths, window, seed)
+
+    async def _implied_distribution(self, symbol: str, strike: Optional[float], horizon_days: float,
+                                    volatility_multiplier: float) -> Dict[str, Any]:
+        data, _, surface = await self.options_service.get_surface_async(symbol)
+        spot = float(data.series.close[-1])
+        time_to_horizon = horizon_days / DAYS_PER_YEAR
+        strike = spot if strike is None else strike
+        volatility = self.options_service.query_volatility(surface, strike, time_to_horizon) * volatility_multiplier
+
+        print(f"[DEBUG][PredictionService] Rozkład {symbol} - cena: {spot}, horyzont: {horizon_days} dni, "
+              f"zmienność: {volatility:.4f}")
+        distribution = lognormal_distribution(spot, RISK_FREE_RATE, volatility, time_to_horizon)
+        distribution.update(model=self.MODEL_IMPLIED, volatility=round(volatility, 4))
+        return distribution
+
+    async def _simulated_distribution(self, symbol: str, horizon_days: float, volatility_multiplier: float,
+                                      model: str, paths: int, window: int,
+                                      seed: Optional[int]) -> Dict[str, Any]:
+        """
+        Kalibruje model z historii i symuluje ceny końcowe.
+
+        Ścieżki dzielone są na zadania po chunk_paths; każde zadanie ma własne
+        ziarno potomne (SeedSequence.spawn), więc wynik zależy tylko od ziarna,
+        a nie od liczby procesów ani kolejności wykonania. Zadania wysyłane są
+        do puli procesów (executor), a pojedyncze zadanie - do puli wątków.
+        """
+        data = await self._history(symbol, window)
+        series = data.series
+        spot = float(series.close[-1])
+        calibrated = ReturnModel.from_prices(series.close, window).scaled(volatility_multiplier)
+        steps = max(1, round(horizon_days * TRADING_DAYS_PER_YEAR / DAYS_PER_YEAR))
+        if seed is None:
+            seed = zlib.crc32(f"{symbol.upper()}:{int(series.timestamp[-1])}".encode())
+
+        started = time.perf_counter()
+        sizes = chunk_sizes(paths, self.chunk_paths)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        executor = self.executor if len(sizes) > 1 else None
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(executor, simulate_log_returns, model, calibrated.returns,
+                                 calibrated.drift, calibrated.volatility, steps, size, child)
+            for size, child in zip(sizes, seeds)
+        ))
+        log_returns = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        distribution = await asyncio.to_thread(sample_distribution, spot, log_returns)
+        elapsed = time.perf_counter() - started
+
+        self._stats["simulations"] += 1
+        self._stats["paths"] += paths
+        self._stats["lastElapsedMs"] = round(elapsed * 1000, 1)
+        print(f"[DEBUG][PredictionService] Symulacja {model} {symbol} - ścieżek: {paths}, zadań: {len(sizes)}, "
+              f"sesji: {steps}, czas: {elapsed * 1000:.1f} ms")
+
+        distribution.update(
+            model=model,
+            paths=paths,
+            seed=seed,
+            window=len(calibrated.returns),
+            drift=round(calibrated.annual_drift(), 4),
+            volatility=round(calibrated.annual_volatility(), 4),
+            elapsedMs=round(elapsed * 1000, 1)
+        )
+        return distribution
+
+    async def get_return_distribution_async(self, symbol: str, strike: Optional[float] = None,
+                                            horizon_days: float = 30,
+                                            volatility_multiplier: float = 1.0,
+                                            confidence_level: float = 0.95,
+                                            window: int = DEFAULT_WINDOW) -> Dict[str, Any]:
+        """
+        Zwraca empiryczny rozkład ceny symbolu po horizon_days dniach (format PredictionResult).
+
+        Rozkład sumy dziennych stóp zwrotu po n sesjach to n-krotny splot
+        gęstości jądrowej (potęga jej widma). Mnożnik zmienności skaluje
+        odchylenia od średniej dziennej stopy zwrotu.
+
+        Args:
+            symbol: Symbol giełdowy
+            strike: Cena, dla której zwracane jest prawdopodobieństwo jej
+                    przekroczenia (domyślnie bieżąca cena)
+            horizon_days: Horyzont w dniach kalendarzowych
+            volatility_multiplier: Mnożnik zmienności
+            confidence_level: Poziom ufności dodawany do standardowych przedziałów
+            window: Liczba ostatnich sesji użytych do estymacji
+        """
+        data = await self._history(symbol, window)
+        spot = float(data.series.close[-1])
+        strike = spot if strike is None else strike
+        steps = max(1, round(horizon_days * TRADING_DAYS_PER_YEAR / DAYS_PER_YEAR))
+        levels = sorted(set(CONFIDENCE_LEVELS) | {confidence_level})
+
+        def compute():
+            density = self._density(symbol, data, window)
+            started = time.perf_counter()
+            grid, mass = density.horizon(steps)
+            log_returns = steps * density.drift + volatility_multiplier * grid
+            distribution = grid_distribution(spot, log_returns, mass, levels)
+            above = grid_probability_above(spot, log_returns, mass, strike)
+            self._density_stats["querySeconds"] += time.perf_counter() - started
+            self._density_stats["queries"] += 1
+            return density, distribution, above
+
+        # Estymator i rozkład liczone w puli wątków (nie blokują pętli zdarzeń)
+        density, distribution, above = await asyncio.to_thread(compute)
+        return _prediction_result(distribution, {
+            "strikePrice": strike,
+            "probabilityAboveStrike": round(above, 4),
+            "window": density.observations,
+            "drift": round(density.annual_drift(), 4),
+            "volatility": round(density.annual_volatility() * volatility_multiplier, 4)
+        })
+
+    async def _history(self, symbol: str, window: int) -> StockData:
+        """Pobiera szereg dzienny obejmujący co najmniej window sesji."""
+        data = await self.stock_service.get_stock_data_async(
+            symbol,
+            interval="daily",
+            start_date=datetime.now() - timedelta(days=math.ceil(window * DAYS_PER_YEAR / TRADING_DAYS_PER_YEAR) + 14)
+        )
+        if not data or not len(data.series):
+            raise LookupError(f"Brak danych dla symbolu {symbol}")
+        return data
+
+    def _density(self, symbol: str, data: StockData, window: int) -> ReturnDensity:
+        """Zwraca estymator gęstości migawki - budowany ponownie tylko po zmianie szeregu."""
+        def build():
+            close = data.series.close[-(window + 1):]
+            density = ReturnDensity(np.diff(np.log(close)))
+            self._density_stats["builds"] += 1
+            self._density_stats["buildSeconds"] += density.build_seconds
+            print(f"[DEBUG][PredictionService] Estymator gęstości {symbol} - stóp zwrotu: {density.observations}, "
+                  f"węzłów: {density.size}, czas: {density.build_seconds * 1000:.1f} ms")
+            return density
+
+        if self.density_cache is None:
+            return build()
+        return self.density_cache.get_or_build(("density", symbol.upper(), window), series_version(data), build)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki symulacji Monte Carlo i rozkładów empirycznych."""
+        density = self._density_stats
+        return {
+            **self._stats,
+            "processPool": self.executor is not None,
+            "density": {
+                "builds": density["builds"],
+                "avgBuildMs": round(density["buildSeconds"] * 1000 / density["builds"], 3) if density["builds"] else None,
+                "queries": density["queries"],
+                "avgQueryMicros": round(density["querySeconds"] * 1e6 / density["queries"], 2) if density["queries"] else None
+            }
+        }
+
+
+def _prediction_result(distribution: Dict[str, Any], extra: Dict[str, Any]) -> Dict[str, Any]:
+    """Przekształca rozkład w formacie API na PredictionResult oczekiwany przez interfejs."""
+    return {
+        "expectedValue": distribution["expectedValue"],
+        "variance": distribution["variance"],
+        "skewness": distribution["skewness"],
+        "kurtosis": distribution["kurtosis"],
+        "confidenceIntervals": [
+            {"level": interval["confidence"], "min": interval["lowerBound"], "max": interval["upperBound"]}
+            for interval in distribution["confidenceIntervals"]
+        ],
+        "distribution": [
+            {"price": point["value"], "probability": point["probability"]}
+            for point in distribution["discretePoints"]
+        ],
+        **extra
+    }
@@ -1,15 +1,80 @@
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 
-from domain.entities.stock_data import StockData, StockMetadata
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries, StockData, StockMetadata, datetime_to_epoch, epoch_to_datetime
+from domain.services.downsampling import OHLC, downsample_series
+from domain.services.indicator_state import IndicatorStateStore
+from domain.services.market_calendar import MarketCalendar
 from domain.services.stock_service import StockService
+from domain.services.technical_indicators import Indicator, get_indicator, parse_spec, format_result
+
+
+def series_version(data: StockData) -> Tuple:
+    """Zwraca wersję szeregu - zmienia się przy każdym odświeżeniu, dopisaniu lub zmianie zakresu świec."""
+    series = data.series
+    if not len(series):
+        return (data.last_refreshed.isoformat(), 0, None, None)
+    return (data.last_refreshed.isoformat(), len(series), int(series.timestamp[0]), int(series.timestamp[-1]))
+
+
+class PreparedResponse:
+    """
+    Dane odpowiedzi wraz z ich wersją - treść budowana jest dopiero przy odczycie.
+    
+    Wersja i czas odświeżenia danych są znane zaraz po pobraniu szeregu, więc
+    warstwa prezentacji może odpowiedzieć 304 albo użyć zapisanej treści bez
+    formatowania danych.
+    """
+    
+    def __init__(self, version: Tuple, last_refreshed: datetime, build: Callable[[], Any]):
+        self.version = version
+        self.last_refreshed = last_refreshed
+        self._build = build
+    
+    def build(self) -> Any:
+        """Buduje treść odpowiedzi."""
+        return self._build()
+    
+    async def build_async(self) -> Any:
+        """Buduje treść odpowiedzi w puli wątków (obliczenia nie blokują pętli zdarzeń)."""
+        return await asyncio.to_thread(self._build)
 
 
 class StockApplicationService:
     """Usługa aplikacyjna do obsługi operacji związanych z danymi giełdowymi."""
     
-    def __init__(self, stock_service: StockService):
+    # Formaty odpowiedzi z danymi giełdowymi
+    FORMAT_ROWS = "rows"
+    FORMAT_COLUMNAR = "columnar"
+    FORMATS = (FORMAT_ROWS, FORMAT_COLUMNAR)
+    
+    # Rodzaje wyników zapytania o wiele symboli
+    BATCH_QUOTE = "quote"
+    BATCH_SERIES = "series"
+    BATCH_MODES = (BATCH_QUOTE, BATCH_SERIES)
+    
+    # Zakres dni pobieranych dla notowania (obejmuje poprzednią sesję także po długim weekendzie)
+    QUOTE_LOOKBACK_DAYS = 10
+    
+    # Długość okresów (dni) i zapas dni pobierany ponad okres - okres liczony jest
+    # od ostatniej świecy, która po weekendzie, święcie lub przed otwarciem sesji
+    # jest starsza niż bieżąca chwila
+    PERIOD_DAYS = {"1d": 1, "5d": 5, "1m": 30, "3m": 90, "6m": 180, "1y": 365, "2y": 2 * 365, "5y": 5 * 365}
+    PERIOD_LOOKBACK_DAYS = 7
+    
+    def __init__(self, stock_service: StockService,
+                 indicator_states: Optional[IndicatorStateStore] = None,
+                 indicator_cache=None, batch_concurrency: int = 8):
         self.stock_service = stock_service
+        self.indicator_states = indicator_states or IndicatorStateStore()
+        # Opcjonalna pamięć podręczna gotowych wyników (get/put według wersji szeregu)
+        self.indicator_cache = indicator_cache
+        # Wspólny limit równoczesnych pobrań dla wszystkich zapytań o wiele symboli
+        self.batch_concurrency = batch_concurrency
+        self._batch_slots = asyncio.Semaphore(batch_concurrency)
     
     def search_stocks(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -27,7 +92,10 @@ class StockApplicationService:
     def get_stock_data(self, symbol: str, interval: str = "daily", 
                       period: Optional[str] = None, 
                       start_date: Optional[str] = None,
-                      end_date: Optional[str] = None) -> Dict[str, Any]:
+                      end_date: Optional[str] = None,
+                      format: str = "rows",
+                      max_points: Optional[int] = None,
+                      downsample: str = OHLC) -> Dict[str, Any]:
         """
         Pobiera dane giełdowe dla określonego symbolu i interwału.
         
@@ -39,35 +107,372 @@ class StockApplicationService:
             period: Okres danych ("1d", "5d", "1m", "3m", "6m", "1y", "2y", "5y", "max")
             start_date: Data początkowa (format: YYYY-MM-DD)
             end_date: Data końcowa (format: YYYY-MM-DD)
+            format: "rows" - lista świec jako obiekty, "columnar" - równoległe kolumny NumPy
+            max_points: Największa liczba świec w odpowiedzi (None - wszystkie)
+            downsample: Metoda zmniejszania liczby świec - "ohlc" (łączenie świec) lub "lttb"
             
         Returns:
             Dane giełdowe w formacie JSON
         """
-        print(f"[DEBUG][ApplicationService] get_stock_data - symbol: {symbol}, interval: {interval}, period: {period}, start_date: {start_date}, end_date: {end_date}")
+        print(f"[DEBUG][ApplicationService] get_stock_data - symbol: {symbol}, interval: {interval}, period: {period}, start_date: {start_date}, end_date: {end_date}, format: {format}, max_points: {max_points}")
+        
+        start_datetime, end_datetime = self._resolve_dates(period, start_date, end_date)
+        
+        print(f"[DEBUG][ApplicationService] Pobieranie danych z serwisu domenowego - symbol: {symbol}, interval: {interval}, start_date: {start_datetime}, end_date: {end_datetime}")
+        
+        try:
+            # Pobieranie danych
+            stock_data = self.stock_service.get_stock_data(
+                symbol, 
+                interval=interval, 
+                start_date=start_datetime, 
+                end_date=end_datetime
+            )
+            stock_data = self._anchor_period(stock_data, period)
+            
+            result = self._to_response(stock_data, format, max_points, downsample)
+            print(f"[DEBUG][ApplicationService] Pobrano dane dla {symbol} - liczba punktów: {len(stock_data.series)}")
+            return result
+        except Exception as e:
+            import traceback
+            print(f"[ERROR][ApplicationService] Błąd podczas pobierania danych dla {symbol}: {str(e)}")
+            print(f"[ERROR][ApplicationService] Szczegóły: {traceback.format_exc()}")
+            raise
+    
+    async def get_stock_data_async(self, symbol: str, interval: str = "daily", 
+                                   period: Optional[str] = None, 
+                                   start_date: Optional[str] = None,
+                                   end_date: Optional[str] = None,
+                                   format: str = "rows",
+                                   max_points: Optional[int] = None,
+                                   downsample: str = OHLC) -> Dict[str, Any]:
+        """
+        Asynchroniczny odpowiednik get_stock_data (parametry i wynik są takie same).
+        """
+        prepared = await self.prepare_stock_data_async(symbol, interval, period, start_date, end_date,
+                                                       format, max_points, downsample)
+        return await prepared.build_async()
+    
+    async def prepare_stock_data_async(self, symbol: str, interval: str = "daily", 
+                                       period: Optional[str] = None, 
+                                       start_date: Optional[str] = None,
+                                       end_date: Optional[str] = None,
+                                       format: str = "rows",
+                                       max_points: Optional[int] = None,
+                                       downsample: str = OHLC) -> PreparedResponse:
+        """
+        Pobiera dane giełdowe (parametry jak w get_stock_data) bez budowania odpowiedzi.
+        
+        Returns:
+            PreparedResponse z wersją okna danych; build() zwraca dane w formacie JSON
+        """
+        print(f"[DEBUG][ApplicationService] get_stock_data_async - symbol: {symbol}, interval: {interval}, period: {period}, start_date: {start_date}, end_date: {end_date}, format: {format}, max_points: {max_points}")
+        
+        start_datetime, end_datetime = self._resolve_dates(period, start_date, end_date)
+        
+        try:
+            stock_data = await self.stock_service.get_stock_data_async(
+                symbol, 
+                interval=interval, 
+                start_date=start_datetime, 
+                end_date=end_datetime
+            )
+            stock_data = self._anchor_period(stock_data, period)
+            
+            print(f"[DEBUG][ApplicationService] Pobrano dane dla {symbol} - liczba punktów: {len(stock_data.series)}")
+            return PreparedResponse(self._series_version(stock_data), stock_data.last_refreshed,
+                                    lambda: self._to_response(stock_data, format, max_points, downsample))
+        except Exception as e:
+            import traceback
+            print(f"[ERROR][ApplicationService] Błąd podczas pobierania danych dla {symbol}: {str(e)}")
+            print(f"[ERROR][ApplicationService] Szczegóły: {traceback.format_exc()}")
+            raise
+    
+    async def get_quote_async(self, symbol: str) -> Dict[str, Any]:
+        """
+        Zwraca ostatnie notowanie symbolu (ostatnia świeca dzienna i zmiana względem poprzedniej).
+        
+        Pobierany jest tylko ogon szeregu dziennego, więc przy pustym magazynie
+        wystarcza zapytanie outputsize=compact.
+        """
+        stock_data = await self.stock_service.get_stock_data_async(
+            symbol,
+            interval="daily",
+            start_date=datetime.now(MarketCalendar.TIMEZONE).replace(tzinfo=None) - timedelta(days=self.QUOTE_LOOKBACK_DAYS)
+        )
+        if not stock_data or not len(stock_data.series):
+            raise ValueError(f"Brak danych dla symbolu {symbol}")
+        return self._quote_to_dict(stock_data)
+    
+    async def get_batch_async(self, symbols: List[str], mode: str = "quote",
+                              timeout: Optional[float] = None, **series_args) -> Dict[str, Dict[str, Any]]:
+        """
+        Pobiera notowania lub szeregi wielu symboli równocześnie.
+        
+        Liczba równoczesnych pobrań jest ograniczona (batch_concurrency) dla
+        wszystkich zapytań łącznie, a limit zapytań do źródła egzekwuje
+        warstwa infrastruktury. Błąd jednego symbolu nie przerywa pozostałych.
+        Symbole, które nie zdążą w czasie timeout, są zgłaszane jako błąd, ale
+        ich pobieranie trwa dalej - dane trafią do magazynu na kolejne zapytanie.
+        
+        Args:
+            symbols: Symbole giełdowe
+            mode: "quote" - ostatnie notowanie, "series" - szereg jak w get_stock_data
+            timeout: Największy czas oczekiwania na wszystkie symbole (sekundy) lub None
+            series_args: Parametry get_stock_data_async dla mode="series"
+                         (interval, period, start_date, end_date, format, max_points, downsample)
+        
+        Returns:
+            Słownik symbol -> {"status": "success", "data": ...} lub {"status": "error", "message": ...}
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        print(f"[DEBUG][ApplicationService] get_batch_async - symbole: {symbols}, mode: {mode}, timeout: {timeout}")
+        
+        async def fetch(symbol: str) -> Dict[str, Any]:
+            async with self._batch_slots:
+                if mode == self.BATCH_QUOTE:
+                    return await self.get_quote_async(symbol)
+                return await self.get_stock_data_async(symbol, **series_args)
+        
+        tasks = {symbol: asyncio.ensure_future(fetch(symbol)) for symbol in symbols}
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        
+        results = {}
+        for symbol, task in tasks.items():
+            if task in pending:
+                # Wynik (lub błąd) spóźnionego pobrania odbieramy, aby nie był zgłaszany jako nieobsłużony
+                task.add_done_callback(lambda done: done.cancelled() or done.exception())
+                results[symbol] = {"status": "error", "message": f"Przekroczono czas oczekiwania na dane dla {symbol}"}
+            elif task.exception() is not None:
+                error = task.exception()
+                results[symbol] = {"status": "error", "message": str(error)}
+                retry_after = getattr(error, "retry_after", None)
+                if retry_after is not None:
+                    results[symbol]["retryAfter"] = retry_after
+            else:
+                results[symbol] = {"status": "success", "data": task.result()}
+        
+        failed = sum(1 for result in results.values() if result["status"] == "error")
+        print(f"[DEBUG][ApplicationService] get_batch_async - pobrano {len(results) - failed}/{len(results)} symboli")
+        return results
+    
+    def get_indicator(self, symbol: str, indicator: str, params: Dict[str, Any],
+                      interval: str = "daily", period: Optional[str] = None,
+                      start_date: Optional[str] = None,
+                      end_date: Optional[str] = None,
+                      max_points: Optional[int] = None) -> Optional[Any]:
+        """
+        Oblicza wskaźnik techniczny dla określonego symbolu.
+        
+        Args:
+            symbol: Symbol giełdowy
+            indicator: Nazwa wskaźnika z rejestru ("sma", "ema", "macd", "rsi", "bb", "atr")
+            params: Parametry wskaźnika (brakujące uzupełniane są domyślnymi)
+            interval, period, start_date, end_date: Jak w get_stock_data
+            max_points: Największa liczba punktów każdej linii wskaźnika (LTTB; None - wszystkie)
+            
+        Returns:
+            Wskaźnik w formacie JSON lub None, jeśli brak danych dla symbolu
+        """
+        start_datetime, end_datetime = self._resolve_dates(period, start_date, end_date)
+        # Wskaźniki liczone są na całym szeregu, a dopiero wynik przycinany do okna
+        stock_data = self.stock_service.get_stock_data(symbol, interval=interval)
+        start_datetime = self._period_start(stock_data, period) or start_datetime
+        return self._indicator_to_dict(symbol, interval, stock_data, indicator, params,
+                                       start_datetime, end_datetime, max_points)
+    
+    async def get_indicator_async(self, symbol: str, indicator: str, params: Dict[str, Any],
+                                  interval: str = "daily", period: Optional[str] = None,
+                                  start_date: Optional[str] = None,
+                                  end_date: Optional[str] = None,
+                                  max_points: Optional[int] = None) -> Optional[Any]:
+        """Asynchroniczny odpowiednik get_indicator (parametry i wynik są takie same)."""
+        prepared = await self.prepare_indicator_async(symbol, indicator, params, interval,
+                                                      period, start_date, end_date, max_points)
+        return None if prepared is None else await prepared.build_async()
+    
+    async def prepare_indicator_async(self, symbol: str, indicator: str, params: Dict[str, Any],
+                                      interval: str = "daily", period: Optional[str] = None,
+                                      start_date: Optional[str] = None,
+                                      end_date: Optional[str] = None,
+                                      max_points: Optional[int] = None) -> Optional[PreparedResponse]:
+        """
+        Pobiera szereg dla wskaźnika (parametry jak w get_indicator) bez obliczania wskaźnika.
+        
+        Returns:
+            PreparedResponse (build() zwraca wskaźnik w formacie JSON) lub None, jeśli brak danych
+        """
+        requests = self._parse_indicator(indicator, params)
+        start_datetime, end_datetime = self._resolve_dates(period, start_date, end_date)
+        stock_data = await self.stock_service.get_stock_data_async(symbol, interval=interval)
+        start_datetime = self._period_start(stock_data, period) or start_datetime
+        prepared = self._prepare_indicators(symbol, interval, stock_data, requests,
+                                            start_datetime, end_datetime, max_points)
+        if prepared is None:
+            return None
+        return PreparedResponse(prepared.version, prepared.last_refreshed,
+                                lambda: prepared.build()[indicator])
+    
+    def get_indicators(self, symbol: str, specs: List[str], interval: str = "daily",
+                       period: Optional[str] = None, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None,
+                       max_points: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Oblicza kilka wskaźników technicznych z jednego pobrania szeregu.
         
+        Args:
+            symbol: Symbol giełdowy
+            specs: Specyfikacje wskaźników, np. ["sma:20", "macd:12/26/9", "bb:20/2"]
+            interval, period, start_date, end_date: Jak w get_stock_data
+            max_points: Jak w get_indicator
+            
+        Returns:
+            Słownik specyfikacja -> wskaźnik w formacie JSON lub None, jeśli brak danych dla symbolu
+        """
+        # Nieprawidłowe specyfikacje odrzucamy przed pobraniem danych
+        requests = self._parse_specs(specs)
+        start_datetime, end_datetime = self._resolve_dates(period, start_date, end_date)
+        stock_data = self.stock_service.get_stock_data(symbol, interval=interval)
+        start_datetime = self._period_start(stock_data, period) or start_datetime
+        return self._indicators_to_dict(symbol, interval, stock_data, requests,
+                                        start_datetime, end_datetime, max_points)
+    
+    async def get_indicators_async(self, symbol: str, specs: List[str], interval: str = "daily",
+                                   period: Optional[str] = None, start_date: Optional[str] = None,
+                                   end_date: Optional[str] = None,
+                                   max_points: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Asynchroniczny odpowiednik get_indicators (parametry i wynik są takie same)."""
+        prepared = await self.prepare_indicators_async(symbol, specs, interval, period, start_date, end_date,
+                                                       max_points)
+        return None if prepared is None else await prepared.build_async()
+    
+    async def prepare_indicators_async(self, symbol: str, specs: List[str], interval: str = "daily",
+                                       period: Optional[str] = None, start_date: Optional[str] = None,
+                                       end_date: Optional[str] = None,
+                                       max_points: Optional[int] = None) -> Optional[PreparedResponse]:
+        """
+        Pobiera szereg dla wskaźników (parametry jak w get_indicators) bez ich obliczania.
+        
+        Returns:
+            PreparedResponse (build() zwraca słownik specyfikacja -> wskaźnik) lub None, jeśli brak danych
+        """
+        requests = self._parse_specs(specs)
+        start_datetime, end_datetime = self._resolve_dates(period, start_date, end_date)
+        stock_data = await self.stock_service.get_stock_data_async(symbol, interval=interval)
+        start_datetime = self._period_start(stock_data, period) or start_datetime
+        return self._prepare_indicators(symbol, interval, stock_data, requests,
+                                        start_datetime, end_datetime, max_points)
+    
+    def _parse_specs(self, specs: List[str]) -> Dict[str, Tuple[Indicator, Dict[str, Any]]]:
+        """Parsuje specyfikacje wskaźników (klucz wyniku to specyfikacja w postaci z zapytania)."""
+        if not specs:
+            raise ValueError("Nie podano wskaźników")
+        return {spec: parse_spec(spec) for spec in specs}
+    
+    def _indicator_to_dict(self, symbol: str, interval: str, data: StockData, name: str,
+                           params: Dict[str, Any], start: Optional[datetime] = None,
+                           end: Optional[datetime] = None,
+                           max_points: Optional[int] = None) -> Optional[Any]:
+        """Oblicza pojedynczy wskaźnik i formatuje wynik jako punkty {timestamp, value}."""
+        result = self._indicators_to_dict(symbol, interval, data,
+                                          self._parse_indicator(name, params), start, end, max_points)
+        return None if result is None else result[name]
+    
+    def _parse_indicator(self, name: str, params: Dict[str, Any]) -> Dict[str, Tuple[Indicator, Dict[str, Any]]]:
+        """Wyszukuje wskaźnik w rejestrze i uzupełnia parametry (klucz wyniku to nazwa wskaźnika)."""
+        indicator = get_indicator(name)
+        if indicator is None:
+            raise ValueError(f"Nieznany wskaźnik: {name}")
+        return {name: (indicator, indicator.parse_params(params))}
+    
+    def _indicators_to_dict(self, symbol: str, interval: str, data: StockData,
+                            requests: Dict[str, Tuple[Indicator, Dict[str, Any]]],
+                            start: Optional[datetime] = None,
+                            end: Optional[datetime] = None,
+                            max_points: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Oblicza wskaźniki na kolumnach całego szeregu i zwraca punkty z okna [start, end]."""
+        prepared = self._prepare_indicators(symbol, interval, data, requests, start, end, max_points)
+        return None if prepared is None else prepared.build()
+    
+    def _prepare_indicators(self, symbol: str, interval: str, data: StockData,
+                            requests: Dict[str, Tuple[Indicator, Dict[str, Any]]],
+                            start: Optional[datetime] = None,
+                            end: Optional[datetime] = None,
+                            max_points: Optional[int] = None) -> Optional[PreparedResponse]:
+        """
+        Wyznacza okno [start, end] w szeregu; wskaźniki liczone są dopiero w build().
+        
+        Wersją odpowiedzi jest wersja szeregu i zakres indeksów okna.
+        """
+        if not data or not len(data.series):
+            return None
+        
+        series = data.series
+        lo = 0 if start is None else int(np.searchsorted(series.timestamp, datetime_to_epoch(start), side="left"))
+        hi = len(series) if end is None else int(np.searchsorted(series.timestamp, datetime_to_epoch(end), side="right"))
+        if hi <= lo:
+            return None
+        version = self._series_version(data)
+        return PreparedResponse(version + (lo, hi), data.last_refreshed,
+                                lambda: self._compute_indicators(symbol, interval, series, version,
+                                                                 requests, lo, hi, max_points))
+    
+    def _compute_indicators(self, symbol: str, interval: str, series: PriceSeries, version: Tuple,
+                            requests: Dict[str, Tuple[Indicator, Dict[str, Any]]],
+                            lo: int, hi: int, max_points: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Oblicza wskaźniki na kolumnach całego szeregu i zwraca punkty z okna świec [lo, hi).
+        
+        Obliczenia idą rosnąco po czasie, dzięki czemu zapisany stan wskaźnika
+        (indicator_states) wystarczy uzupełnić o nowe świece. Punkty w
+        odpowiedzi są - jak ceny w /api/stocks - od najnowszych.
+        
+        Gotowe wyniki trafiają do indicator_cache pod kluczem okna znormalizowanego
+        do zakresu indeksów świec (okresy liczone od "teraz" dają przy każdym
+        zapytaniu inne daty) i wersji szeregu - zmiana danych unieważnia wpisy.
+        Przy podanym max_points każda linia wskaźnika jest zmniejszana metodą LTTB.
+        """
+        timestamps = None
+        computed = {}
+        results = {}
+        for key, (indicator, params) in requests.items():
+            signature = (indicator.name, tuple(sorted(params.items())))
+            if signature not in computed:
+                result_key = (lo, hi, max_points) + signature
+                cached = None
+                if self.indicator_cache is not None:
+                    cached = self.indicator_cache.get(symbol, interval, version, result_key)
+                if cached is None:
+                    if timestamps is None:
+                        timestamps = self._format_timestamps(series.timestamp[lo:hi][::-1])
+                    values = self.indicator_states.compute(symbol, interval, indicator, params, series)
+                    window = {output: column[lo:hi][::-1] for output, column in values.items()}
+                    cached = format_result(indicator, timestamps, window, max_points)
+                    if self.indicator_cache is not None:
+                        self.indicator_cache.put(symbol, interval, version, result_key, cached)
+                computed[signature] = cached
+            results[key] = computed[signature]
+        
+        print(f"[DEBUG][ApplicationService] Obliczono wskaźniki {list(requests)} dla {symbol} - świec w szeregu: {len(series)}, w oknie: {hi - lo}")
+        return results
+    
+    def _series_version(self, data: StockData) -> Tuple:
+        return series_version(data)
+    
+    def _resolve_dates(self, period: Optional[str], start_date: Optional[str],
+                       end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Przekształca okres lub daty w formacie YYYY-MM-DD na zakres dat."""
         # Mapowanie okresu na daty
         start_datetime = None
         end_datetime = None
         
         if period:
-            end_datetime = datetime.now()
+            # Znaczniki świec są w czasie nowojorskim (naiwne), niezależnie od strefy serwera
+            end_datetime = datetime.now(MarketCalendar.TIMEZONE).replace(tzinfo=None)
             
-            if period == "1d":
-                start_datetime = end_datetime - timedelta(days=1)
-            elif period == "5d":
-                start_datetime = end_datetime - timedelta(days=5)
-            elif period == "1m":
-                start_datetime = end_datetime - timedelta(days=30)
-            elif period == "3m":
-                start_datetime = end_datetime - timedelta(days=90)
-            elif period == "6m":
-                start_datetime = end_datetime - timedelta(days=180)
-            elif period == "1y":
-                start_datetime = end_datetime - timedelta(days=365)
-            elif period == "2y":
-                start_datetime = end_datetime - timedelta(days=2*365)
-            elif period == "5y":
-                start_datetime = end_datetime - timedelta(days=5*365)
+            # Pobierany zakres obejmuje zapas dni - okres przycinany jest do ostatniej świecy (_anchor_period)
+            if period in self.PERIOD_DAYS:
+                start_datetime = end_datetime - timedelta(days=self.PERIOD_DAYS[period] + self.PERIOD_LOOKBACK_DAYS)
             # Dla "max" nie ustawiamy daty początkowej
             
             print(f"[DEBUG][ApplicationService] Okres {period} przekształcony na daty: {start_datetime} - {end_datetime}")
@@ -85,25 +490,26 @@ class StockApplicationService:
             print(f"[ERROR][ApplicationService] Błąd podczas parsowania dat: {str(e)}")
             raise ValueError(f"Nieprawidłowy format daty: {str(e)}")
         
-        print(f"[DEBUG][ApplicationService] Pobieranie danych z serwisu domenowego - symbol: {symbol}, interval: {interval}, start_date: {start_datetime}, end_date: {end_datetime}")
+        return start_datetime, end_datetime
+    
+    def _period_start(self, data: Optional[StockData], period: Optional[str]) -> Optional[datetime]:
+        """
+        Zwraca początek okresu liczony od ostatniej świecy (a nie od bieżącej chwili).
         
-        try:
-            # Pobieranie danych
-            stock_data = self.stock_service.get_stock_data(
-                symbol, 
-                interval=interval, 
-                start_date=start_datetime, 
-                end_date=end_datetime
-            )
-            
-            result = self._stock_data_to_dict(stock_data)
-            print(f"[DEBUG][ApplicationService] Pobrano dane dla {symbol} - liczba punktów: {len(result.get('prices', []))}")
-            return result
-        except Exception as e:
-            import traceback
-            print(f"[ERROR][ApplicationService] Błąd podczas pobierania danych dla {symbol}: {str(e)}")
-            print(f"[ERROR][ApplicationService] Szczegóły: {traceback.format_exc()}")
-            raise
+        Początek jest wyłączny (o sekundę po chwili ostatnia świeca - okres), więc
+        okres "1d" obejmuje świece jednej sesji. None - brak okresu lub danych.
+        """
+        if period not in self.PERIOD_DAYS or not data or not len(data.series):
+            return None
+        last = epoch_to_datetime(int(data.series.timestamp[-1]))
+        return last - timedelta(days=self.PERIOD_DAYS[period]) + timedelta(seconds=1)
+    
+    def _anchor_period(self, data: StockData, period: Optional[str]) -> StockData:
+        """Przycina dane pobrane z zapasem do okresu liczonego od ostatniej świecy."""
+        start = self._period_start(data, period)
+        if start is None:
+            return data
+        return data.model_copy(update={"series": data.series.between(datetime_to_epoch(start))})
     
     def _stock_metadata_to_dict(self, metadata: StockMetadata) -> Dict[str, Any]:
         """Konwertuje obiekt StockMetadata na słownik."""
@@ -116,8 +522,80 @@ class StockApplicationService:
             "matchScore": metadata.match_score
         }
     
+    def _format_timestamps(self, timestamps: np.ndarray) -> List[str]:
+        """Formatuje kolumnę znaczników czasu (sekundy od epoki) jako ISO 8601."""
+        return np.datetime_as_string(timestamps.astype("datetime64[s]"), unit="s").tolist()
+    
+    def _to_response(self, data: StockData, format: str, max_points: Optional[int] = None,
+                     downsample: str = OHLC) -> Dict[str, Any]:
+        """Konwertuje obiekt StockData na słownik w żądanym formacie (po zmniejszeniu liczby świec)."""
+        if max_points is not None and len(data.series) > max_points:
+            data = data.model_copy(update={"series": downsample_series(data.series, max_points, downsample)})
+        if format == self.FORMAT_COLUMNAR:
+            return self._stock_data_to_columns(data)
+        return self._stock_data_to_dict(data)
+    
+    def _stock_data_to_columns(self, data: StockData) -> Dict[str, Any]:
+        """
+        Konwertuje obiekt StockData na słownik kolumn (świece od najnowszych).
+        
+        Kolumny pozostają tablicami NumPy (ciągłymi w pamięci), aby koder JSON
+        mógł je zapisać bezpośrednio, bez obiektu dla każdej świecy. Znaczniki
+        czasu są w milisekundach od epoki UTC (new Date(ms) w przeglądarce) -
+        świece zapisane są w czasie giełdy, więc przeliczane są ze strefy
+        MarketCalendar.TIMEZONE.
+        """
+        series = data.series
+        return {
+            "symbol": data.symbol,
+            "name": data.name,
+            "interval": data.interval,
+            "lastRefreshed": data.last_refreshed.isoformat(),
+            "format": self.FORMAT_COLUMNAR,
+            "prices": {
+                "timestamp": np.ascontiguousarray(MarketCalendar.to_utc_epoch(series.timestamp[::-1]) * 1000),
+                "open": np.ascontiguousarray(series.open[::-1]),
+                "high": np.ascontiguousarray(series.high[::-1]),
+                "low": np.ascontiguousarray(series.low[::-1]),
+                "close": np.ascontiguousarray(series.close[::-1]),
+                "volume": np.ascontiguousarray(series.volume[::-1])
+            }
+        }
+    
+    def _quote_to_dict(self, data: StockData) -> Dict[str, Any]:
+        """Konwertuje ostatnie świece StockData na notowanie."""
+        series = data.series
+        close = float(series.close[-1])
+        previous_close = float(series.close[-2]) if len(series) > 1 else None
+        change = None if previous_close is None else close - previous_close
+        return {
+            "symbol": data.symbol,
+            "name": data.name,
+            "lastRefreshed": data.last_refreshed.isoformat(),
+            "timestamp": self._format_timestamps(series.timestamp[-1:])[0],
+            "open": float(series.open[-1]),
+            "high": float(series.high[-1]),
+            "low": float(series.low[-1]),
+            "close": close,
+            "volume": int(series.volume[-1]),
+            "previousClose": previous_close,
+            "change": change,
+            "changePercent": change / previous_close * 100 if previous_close else None
+        }
+    
     def _stock_data_to_dict(self, data: StockData) -> Dict[str, Any]:
-        """Konwertuje obiekt StockData na słownik."""
+        """Konwertuje obiekt StockData na słownik (świece od najnowszych)."""
+        series = data.series
+        # Konwersja całych kolumn naraz zamiast budowania obiektu dla każdej świecy
+        timestamps = self._format_timestamps(series.timestamp[::-1])
+        rows = zip(
+            timestamps,
+            series.open[::-1].tolist(),
+            series.high[::-1].tolist(),
+            series.low[::-1].tolist(),
+            series.close[::-1].tolist(),
+            series.volume[::-1].tolist()
+        )
         return {
             "symbol": data.symbol,
             "name": data.name,
@@ -125,13 +603,13 @@ class StockApplicationService:
             "lastRefreshed": data.last_refreshed.isoformat(),
             "prices": [
                 {
-                    "timestamp": price.timestamp.isoformat(),
-                    "open": price.open,
-                    "high": price.high,
-                    "low": price.low,
-                    "close": price.close,
-                    "volume": price.volume
+                    "timestamp": timestamp,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": volume
                 }
-                for price in data.prices
+                for timestamp, open_, high, low, close, volume in rows
             ]
-        } 
\ No newline at end of file
+        }
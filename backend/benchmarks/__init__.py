@@ -0,0 +1 @@
+# Inicjalizacja pakietu benchmarks
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Równoczesne, wolne zapytania: klient synchroniczny w puli wątków a klient asynchroniczny.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_async --requests 1000 --latency 0.5 --threads 16
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_alpha_vantage import start_fake_server
+from infrastructure.apis.alpha_vantage_api import AlphaVantageAPI
+from infrastructure.apis.async_alpha_vantage_api import AsyncAlphaVantageAPI
+from infrastructure.apis.http_transport import AiohttpTransport, RequestsTransport
+
+
+def report(label: str, total: int, elapsed: float) -> None:
+    print(f"{label:<36} {total} zapytań: {elapsed:7.2f} s, {total / elapsed:8.1f} zapytań/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.5, help="Opóźnienie odpowiedzi serwera w sekundach")
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    _, url = start_fake_server(latency=args.latency)
+
+    api = AlphaVantageAPI(api_key="bench", base_url=url, transport=RequestsTransport(pool_maxsize=args.threads))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(lambda i: api.search_symbol(f"SYNC{i}"), range(args.requests)))
+    report(f"AlphaVantageAPI ({args.threads} wątków)", args.requests, time.perf_counter() - start)
+
+    async def run_async() -> float:
+        async_api = AsyncAlphaVantageAPI(api_key="bench", base_url=url,
+                                         transport=AiohttpTransport(pool_maxsize=args.requests))
+        start = time.perf_counter()
+        await asyncio.gather(*[async_api.search_symbol(f"ASYNC{i}") for i in range(args.requests)])
+        elapsed = time.perf_counter() - start
+        await async_api.close()
+        return elapsed
+
+    report("AsyncAlphaVantageAPI (1 wątek)", args.requests, asyncio.run(run_async()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Notowania wielu symboli: kolejne zapytania /api/stocks/<symbol> a jedno
+zapytanie /api/stocks/batch pobierające symbole równolegle.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_batch --symbols 20 --latency 0.2
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.fake_alpha_vantage import start_fake_server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="Opóźnienie odpowiedzi źródła w sekundach")
+    args = parser.parse_args()
+
+    _, url = start_fake_server(latency=args.latency)
+    os.environ.update(ALPHA_VANTAGE_BASE_URL=url, ALPHA_VANTAGE_API_KEY="bench",
+                      OHLCV_STORE_DIR=tempfile.mkdtemp(),
+                      ALPHA_VANTAGE_CALLS_PER_MINUTE="10000", ALPHA_VANTAGE_CALLS_PER_DAY="10000")
+    with contextlib.redirect_stdout(io.StringIO()):
+        from presentation.app import app
+    client = app.test_client()
+
+    # Osobne symbole dla obu wariantów - żaden nie korzysta z magazynu drugiego
+    sequential = [f"SEQ{i}" for i in range(args.symbols)]
+    batch = [f"BAT{i}" for i in range(args.symbols)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for symbol in sequential:
+            client.get(f"/api/stocks/{symbol}?interval=daily&period=1m")
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.get(f"/api/stocks/batch?mode=series&interval=daily&period=1m&symbols={','.join(batch)}")
+        batch_time = time.perf_counter() - start
+
+    print(f"{args.symbols} symboli, opóźnienie źródła {args.latency * 1000:.0f} ms")
+    print(f"  kolejne zapytania:    {sequential_time * 1000:8.1f} ms")
+    print(f"  /api/stocks/batch:    {batch_time * 1000:8.1f} ms ({sequential_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Serializacja odpowiedzi /api/stocks: format wierszowy (obiekt na świecę,
+koder json jak w jsonify) a format kolumnowy kodowany przez orjson.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_columnar --repeat 5
+"""
+import argparse
+import json
+from datetime import datetime
+
+import orjson
+
+from application.stock_application_service import StockApplicationService
+from benchmarks.bench_indicator_state import best_of, make_series
+from domain.entities.stock_data import StockData
+
+SIZES = (5_000, 30_000, 100_000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    service = StockApplicationService(stock_service=None)
+    for size in SIZES:
+        data = StockData(symbol="BENCH", series=make_series(size), interval="bench", last_refreshed=datetime.now())
+
+        def rows():
+            return json.dumps(service._to_response(data, service.FORMAT_ROWS), separators=(",", ":"))
+
+        def columnar():
+            return orjson.dumps(service._to_response(data, service.FORMAT_COLUMNAR),
+                                option=orjson.OPT_SERIALIZE_NUMPY)
+
+        rows_time = best_of(rows, args.repeat)
+        columnar_time = best_of(columnar, args.repeat)
+        print(f"{size} świec")
+        print(f"  wiersze + json:     {rows_time * 1000:8.1f} ms, {len(rows().encode()) / 1024:9.1f} KiB")
+        print(f"  kolumny + orjson:   {columnar_time * 1000:8.1f} ms, {len(columnar()) / 1024:9.1f} KiB"
+              f"  ({rows_time / columnar_time:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Powtórne odpytywanie /api/stocks i /api/indicators przy niezmienionych danych:
+pełna odpowiedź, odpowiedź z zapisaną skompresowaną treścią i 304 (If-None-Match).
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_conditional --repeat 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.fake_alpha_vantage import start_fake_server
+
+URLS = [
+    "/api/stocks/IBM?interval=daily",
+    "/api/stocks/IBM?interval=daily&format=columnar",
+    "/api/indicators/IBM?indicators=sma:20,ema:50,rsi:14,macd,bb",
+]
+
+
+def timed(client, url, repeat, headers=None):
+    """Zwraca najlepszy czas zapytania i rozmiar treści odpowiedzi."""
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers or {})
+        best = min(best, time.perf_counter() - start)
+        size = len(response.data)
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    _, url = start_fake_server()
+    os.environ.update(ALPHA_VANTAGE_BASE_URL=url, ALPHA_VANTAGE_API_KEY="bench",
+                      OHLCV_STORE_DIR=tempfile.mkdtemp())
+    with contextlib.redirect_stdout(io.StringIO()):
+        from presentation import app as app_module
+    client = app_module.app.test_client()
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path in URLS:
+            # Bez pamięci treści (limit 0) - każda odpowiedź jest serializowana od nowa
+            app_module.body_cache.max_bytes = 0
+            etag = client.get(path, headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+            full = timed(client, path, args.repeat)
+            app_module.body_cache.max_bytes = 64 * 1024 * 1024
+            cached = timed(client, path, args.repeat, {"Accept-Encoding": "gzip"})
+            not_modified = timed(client, path, args.repeat, {"If-None-Match": etag})
+            results.append((path, full, cached, not_modified))
+
+    for path, full, cached, not_modified in results:
+        print(path)
+        print(f"  pełna odpowiedź:         {full[0] * 1000:7.2f} ms, {full[1] / 1024:8.1f} KiB")
+        print(f"  zapisana treść (gzip):   {cached[0] * 1000:7.2f} ms, {cached[1] / 1024:8.1f} KiB")
+        print(f"  304 (If-None-Match):     {not_modified[0] * 1000:7.2f} ms, {not_modified[1] / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
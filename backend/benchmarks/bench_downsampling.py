@@ -0,0 +1,42 @@
+"""
+Odpowiedź /api/stocks dla długiej historii: wszystkie świece a zmniejszenie
+do maxPoints (łączenie świec OHLC i LTTB) - czas i rozmiar treści.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_downsampling --max-points 2000
+"""
+import argparse
+import json
+from datetime import datetime
+
+from application.stock_application_service import StockApplicationService
+from benchmarks.bench_indicator_state import best_of, make_series
+from domain.entities.stock_data import StockData
+from domain.services.downsampling import LTTB, OHLC
+
+SIZES = (30_000, 100_000, 500_000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-points", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    service = StockApplicationService(stock_service=None)
+    for size in SIZES:
+        data = StockData(symbol="BENCH", series=make_series(size), interval="bench", last_refreshed=datetime.now())
+        print(f"{size} świec")
+        for label, max_points, method in (("wszystkie świece", None, OHLC),
+                                          (f"{OHLC} ({args.max_points})", args.max_points, OHLC),
+                                          (f"{LTTB} ({args.max_points})", args.max_points, LTTB)):
+            def respond():
+                payload = service._to_response(data, service.FORMAT_ROWS, max_points, method)
+                return json.dumps(payload, separators=(",", ":"))
+
+            elapsed = best_of(respond, args.repeat)
+            print(f"  {label:18} {elapsed * 1000:8.1f} ms, {len(respond()) / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Dociągnięcie ogona nieaktualnego szeregu minutowego: zapytanie outputsize=full
+(cały miesiąc świec) a outputsize=compact (100 ostatnich świec), które
+FetchPlanner wybiera, gdy brakujące świece mieszczą się w odpowiedzi compact.
+
+Przed pomiarem sprawdzane jest, że wiek ostatniej świecy liczony jest w czasie
+giełdy (znaczniki świec to czas nowojorski zakodowany jak UTC) - szereg, którego
+ostatnia świeca ma minutę, ma być planowany jako compact.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_fetch_planner --repeat 5
+"""
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import orjson
+import requests
+
+from benchmarks.bench_indicator_state import best_of
+from benchmarks.fake_alpha_vantage import start_fake_server
+from domain.entities.stock_data import datetime_to_epoch
+from domain.services.market_calendar import MarketCalendar
+from infrastructure.repositories.fetch_planner import COMPACT, FULL, FetchPlanner
+from infrastructure.repositories.time_series_ingestion import ingest_time_series
+from infrastructure.storage.ohlcv_store import StoredSeries
+
+# Wiek ostatniej zapisanej świecy (minuty) i oczekiwany plan dociągnięcia ogona
+STALE_CASES = [(1, COMPACT), (60, COMPACT), (3 * 60, FULL)]
+
+
+def stored_minutes(age_minutes: int, bars: int = 1000) -> StoredSeries:
+    """Zapisany szereg minutowy, którego ostatnia świeca ma age_minutes minut (czas giełdy)."""
+    last = datetime.now(MarketCalendar.TIMEZONE).replace(tzinfo=None, second=0, microsecond=0)
+    last_ts = datetime_to_epoch(last - timedelta(minutes=age_minutes))
+    timestamps = last_ts - np.arange(bars)[::-1] * 60
+    return StoredSeries({"timestamp": timestamps}, {})
+
+
+def check_stale_plans(planner: FetchPlanner) -> None:
+    for age, expected in STALE_CASES:
+        stored = stored_minutes(age)
+        plan = planner.plan("intraday_1min", stored, stored.first_timestamp, fresh=False)
+        assert plan == expected, f"ostatnia świeca sprzed {age} min: plan {plan}, oczekiwany {expected}"
+        print(f"ostatnia świeca sprzed {age:>3} min -> {plan}")
+
+
+def fetch(url: str, output_size: str) -> int:
+    params = {"function": "TIME_SERIES_INTRADAY", "symbol": "IBM", "interval": "1min",
+              "outputsize": output_size, "apikey": "bench"}
+    payload = orjson.loads(requests.get(url, params=params, timeout=30).content)
+    series, _ = ingest_time_series(payload["Time Series (1min)"])
+    return len(series)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check_stale_plans(FetchPlanner())
+
+    _, url = start_fake_server()
+    for output_size in (FULL, COMPACT):
+        bars = fetch(url, output_size)
+        elapsed = best_of(lambda: fetch(url, output_size), args.repeat)
+        print(f"outputsize={output_size:<8} {bars:>6} świec: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Odpowiedź z wskaźnikami dla niezmienionego szeregu: obliczenie (stan
+wskaźnika + formatowanie punktów) a odczyt z IndicatorResultCache.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_indicator_cache --repeat 20
+"""
+import argparse
+import contextlib
+import io
+from datetime import datetime
+
+from application.stock_application_service import StockApplicationService
+from benchmarks.bench_indicator_state import best_of, make_series
+from domain.entities.stock_data import StockData
+from infrastructure.cache.indicator_cache import IndicatorResultCache
+
+SIZES = (1_000, 10_000)
+SPECS = ["sma:20", "ema:50", "rsi:14", "macd:12/26/9", "bb:20/2"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in SIZES:
+        data = StockData(symbol="BENCH", series=make_series(size), interval="bench", last_refreshed=datetime.now())
+        uncached = StockApplicationService(stock_service=None)
+        cached = StockApplicationService(stock_service=None, indicator_cache=IndicatorResultCache())
+        requests = uncached._parse_specs(SPECS)
+
+        def run(service):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return service._indicators_to_dict("BENCH", "bench", data, requests)
+
+        # Wypełnienie stanów wskaźników i pamięci podręcznej
+        assert run(uncached) == run(cached)
+        compute_time = best_of(lambda: run(uncached), args.repeat)
+        cache_time = best_of(lambda: run(cached), args.repeat)
+        stats = cached.indicator_cache.get_stats()
+        print(f"{size} świec, {len(SPECS)} wskaźników")
+        print(f"  obliczenie: {compute_time * 1000:8.2f} ms   pamięć podręczna: {cache_time * 1e6:7.1f} µs"
+              f"  ({compute_time / cache_time:6.0f}x, trafień: {stats['hits']}, chybień: {stats['misses']})")
+
+
+if __name__ == "__main__":
+    main()
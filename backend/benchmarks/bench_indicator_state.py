@@ -0,0 +1,73 @@
+"""
+Wskaźniki po dopisaniu świecy: pełne przeliczenie całej historii a
+aktualizacja zapisanego stanu (IndicatorStateStore) - tylko o nowe świece.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_indicator_state --repeat 5
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_indicators import make_prices
+from domain.entities.stock_data import PriceSeries
+from domain.services.indicator_state import IndicatorStateStore
+from domain.services.technical_indicators import INDICATORS
+
+SIZES = (10_000, 30_000, 100_000)
+
+CASES = [
+    ("sma", {"period": 20}),
+    ("ema", {"period": 20}),
+    ("macd", {}),
+    ("rsi", {"period": 14}),
+    ("bb", {"period": 20, "stdDev": 2}),
+    ("atr", {"period": 14}),
+]
+
+
+def make_series(size: int) -> PriceSeries:
+    _, _, columns = make_prices(size)
+    timestamps = np.arange(size, dtype=np.int64) * 60
+    close = np.ascontiguousarray(columns["close"][::-1])
+    return PriceSeries(timestamps, close, columns["high"][::-1].copy(), columns["low"][::-1].copy(),
+                       close, np.zeros(size, dtype=np.int64))
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in SIZES:
+        series = make_series(size)
+        columns = {"close": series.close, "high": series.high, "low": series.low}
+        print(f"{size} świec, +1 świeca")
+        for name, raw_params in CASES:
+            indicator = INDICATORS[name]
+            params = indicator.parse_params(raw_params)
+            store = IndicatorStateStore()
+            # Stan dla historii bez ostatniej świecy
+            store.compute("BENCH", "intraday_1min", indicator, params, series.slice(0, size - 1))
+
+            full_time = best_of(lambda: indicator.compute(columns, **params), args.repeat)
+            state_time = best_of(
+                lambda: store.compute("BENCH", "intraday_1min", indicator, params, series), args.repeat
+            )
+            assert store.get_stats()["recomputed"] == 1
+            print(f"  {name:5} pełne przeliczenie: {full_time * 1000:7.2f} ms"
+                  f"   aktualizacja stanu: {state_time * 1000:6.2f} ms  ({full_time / state_time:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Wskaźniki techniczne: dotychczasowe pętle na listach słowników z
+presentation/app.py (SMA i Wstęgi Bollingera w O(n·okres)) a obliczenia na
+kolumnach NumPy z rejestru domain.services.technical_indicators (O(n)).
+
+Oba warianty liczone są dla tych samych świec w kolejności dotychczasowej
+implementacji (od najnowszych), a wyniki porównywane punkt po punkcie.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_indicators --repeat 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from domain.services.technical_indicators import INDICATORS, format_result
+
+SIZES = (10_000, 30_000, 100_000)
+
+CASES = [
+    ("sma", {"period": 20}, lambda prices: calculate_sma(prices, 20)),
+    ("ema", {"period": 20}, lambda prices: calculate_ema(prices, 20)),
+    ("macd", {}, lambda prices: calculate_macd(prices)),
+    ("rsi", {"period": 14}, lambda prices: calculate_rsi(prices, 14)),
+    ("bb", {"period": 20, "stdDev": 2}, lambda prices: calculate_bollinger_bands(prices, 20, 2)),
+    # Pętle SMA i Wstęg Bollingera rosną z długością okna, sumy prefiksowe - nie
+    ("sma", {"period": 200}, lambda prices: calculate_sma(prices, 200)),
+    ("bb", {"period": 200, "stdDev": 2}, lambda prices: calculate_bollinger_bands(prices, 200, 2)),
+]
+
+
+# Dotychczasowa implementacja (presentation/app.py)
+
+def calculate_sma(prices, period):
+    """Oblicza SMA (Simple Moving Average) dla danych cenowych."""
+    if len(prices) < period:
+        return []
+    
+    result = []
+    for i in range(period - 1, len(prices)):
+        sum_prices = sum(float(prices[j]['close']) for j in range(i - period + 1, i + 1))
+        avg = sum_prices / period
+        timestamp = prices[i]['timestamp']
+        result.append({"timestamp": timestamp, "value": avg})
+    
+    return result
+
+
+def calculate_ema(prices, period):
+    """Oblicza EMA (Exponential Moving Average) dla danych cenowych."""
+    if len(prices) < period:
+        return []
+    
+    # Początek z SMA
+    sma = sum(float(prices[i]['close']) for i in range(period)) / period
+    result = [{"timestamp": prices[period-1]['timestamp'], "value": sma}]
+    
+    # Mnożnik dla EMA
+    multiplier = 2 / (period + 1)
+    
+    # Obliczenie EMA dla pozostałych dni
+    ema = sma
+    for i in range(period, len(prices)):
+        ema = (float(prices[i]['close']) - ema) * multiplier + ema
+        result.append({"timestamp": prices[i]['timestamp'], "value": ema})
+    
+    return result
+
+
+def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
+    """Oblicza MACD (Moving Average Convergence Divergence) dla danych cenowych."""
+    if len(prices) < slow_period + signal_period:
+        return {"macdLine": [], "signalLine": [], "histogram": []}
+    
+    # Oblicz EMA dla szybkiego i wolnego okresu
+    fast_ema = calculate_ema(prices, fast_period)
+    slow_ema = calculate_ema(prices, slow_period)
+    
+    # Wyrównaj długości (EMA wolnego okresu jest krótsza)
+    start_idx = slow_period - fast_period
+    fast_ema = fast_ema[start_idx:]
+    
+    # Oblicz linię MACD (różnica między szybkim i wolnym EMA)
+    macd_line = []
+    for i in range(len(slow_ema)):
+        macd_value = fast_ema[i]['value'] - slow_ema[i]['value']
+        macd_line.append({"timestamp": slow_ema[i]['timestamp'], "value": macd_value})
+    
+    # Oblicz linię sygnału (EMA linii MACD)
+    signal_line = []
+    if len(macd_line) >= signal_period:
+        # Początek z SMA
+        signal_sma = sum(macd_line[i]['value'] for i in range(signal_period)) / signal_period
+        signal_line.append({"timestamp": macd_line[signal_period-1]['timestamp'], "value": signal_sma})
+        
+        # Mnożnik dla EMA
+        multiplier = 2 / (signal_period + 1)
+        
+        # Obliczenie EMA dla pozostałych dni
+        signal_ema = signal_sma
+        for i in range(signal_period, len(macd_line)):
+            signal_ema = (macd_line[i]['value'] - signal_ema) * multiplier + signal_ema
+            signal_line.append({"timestamp": macd_line[i]['timestamp'], "value": signal_ema})
+    
+    # Oblicz histogram (różnica między linią MACD i linią sygnału)
+    histogram = []
+    for i in range(len(signal_line)):
+        # W presentation/app.py było i + signal_period (IndexError dla ostatniego punktu)
+        idx = i + signal_period - 1
+        hist_value = macd_line[idx]['value'] - signal_line[i]['value']
+        histogram.append({"timestamp": macd_line[idx]['timestamp'], "value": hist_value})
+    
+    # Dopasuj długości danych dla frontendu
+    macd_line = macd_line[signal_period - 1:]
+    
+    return {
+        "macdLine": macd_line,
+        "signalLine": signal_line,
+        "histogram": histogram
+    }
+
+
+def calculate_rsi(prices, period=14):
+    """Oblicza RSI (Relative Strength Index) dla danych cenowych."""
+    if len(prices) <= period:
+        return []
+    
+    result = []
+    
+    # Obliczanie zmian cen
+    changes = []
+    for i in range(1, len(prices)):
+        changes.append(float(prices[i]['close']) - float(prices[i-1]['close']))
+    
+    # Obliczanie początkowego RSI
+    gains = [max(0, change) for change in changes[:period]]
+    losses = [max(0, -change) for change in changes[:period]]
+    
+    avg_gain = sum(gains) / period
+    avg_loss = sum(losses) / period
+    
+    if avg_loss == 0:
+        result.append({"timestamp": prices[period]['timestamp'], "value": 100})
+    else:
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+        result.append({"timestamp": prices[period]['timestamp'], "value": rsi})
+    
+    # Obliczanie RSI dla pozostałych dni
+    for i in range(period + 1, len(prices)):
+        change = float(prices[i]['close']) - float(prices[i-1]['close'])
+        gain = max(0, change)
+        loss = max(0, -change)
+        
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        
+        if avg_loss == 0:
+            rsi = 100
+        else:
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
+        
+        result.append({"timestamp": prices[i]['timestamp'], "value": rsi})
+    
+    return result
+
+
+def calculate_bollinger_bands(prices, period=20, std_dev=2):
+    """Oblicza Wstęgi Bollingera dla danych cenowych."""
+    if len(prices) < period:
+        return {"upperBand": [], "middleBand": [], "lowerBand": []}
+    
+    # Obliczanie SMA (środkowa wstęga)
+    middle_band = calculate_sma(prices, period)
+    
+    # Obliczanie górnej i dolnej wstęgi
+    upper_band = []
+    lower_band = []
+    
+    for i in range(len(middle_band)):
+        idx = i + period - 1
+        # Obliczanie odchylenia standardowego
+        variance = sum((float(prices[j]['close']) - middle_band[i]['value'])**2 for j in range(idx - period + 1, idx + 1)) / period
+        std = variance ** 0.5
+        
+        # Obliczanie górnej i dolnej wstęgi
+        upper = middle_band[i]['value'] + (std_dev * std)
+        lower = middle_band[i]['value'] - (std_dev * std)
+        
+        upper_band.append({"timestamp": middle_band[i]['timestamp'], "value": upper})
+        lower_band.append({"timestamp": middle_band[i]['timestamp'], "value": lower})
+    
+    return {
+        "upperBand": upper_band,
+        "middleBand": middle_band,
+        "lowerBand": lower_band
+    }
+
+
+def make_prices(size: int, seed: int = 7):
+    """Błądzenie losowe cen - świece od najnowszych, jak w odpowiedzi /api/stocks."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size)))
+    spread = close * rng.uniform(0, 0.02, size)
+    high, low = close + spread, close - spread
+    timestamps = np.datetime_as_string(
+        np.datetime64("2000-01-01T00:00:00") + np.arange(size)[::-1] * np.timedelta64(1, "m"), unit="s"
+    ).tolist()
+    prices = [
+        {"timestamp": t, "open": c, "high": h, "low": l, "close": c, "volume": 1000}
+        for t, h, l, c in zip(timestamps, high.tolist(), low.tolist(), close.tolist())
+    ]
+    return prices, timestamps, {"close": close, "high": high, "low": low}
+
+
+def compute_columns(name, params, columns):
+    indicator = INDICATORS[name]
+    return indicator.compute(columns, **indicator.parse_params(params))
+
+
+def compute(name, params, timestamps, columns):
+    return format_result(INDICATORS[name], timestamps, compute_columns(name, params, columns))
+
+
+def max_relative_error(expected, actual) -> float:
+    """
+    Porównuje wyniki punkt po punkcie (te same znaczniki czasu, te same wartości).
+
+    Wartości bliskie zera (np. linia MACD - różnica dwóch EMA przy przecięciu)
+    porównywane są względem skali serii, a nie własnej wartości.
+    """
+    if isinstance(expected, dict):
+        return max(max_relative_error(expected[key], actual[key]) for key in expected)
+    assert [p["timestamp"] for p in expected] == [p["timestamp"] for p in actual]
+    if not expected:
+        return 0.0
+    a = np.array([p["value"] for p in expected], dtype=float)
+    b = np.array([p["value"] for p in actual], dtype=float)
+    scale = max(float(np.max(np.abs(a))) * 1e-3, 1e-12)
+    return float(np.max(np.abs(a - b) / np.maximum(np.abs(a), scale)))
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in SIZES:
+        prices, timestamps, columns = make_prices(size)
+        print(f"{size} świec")
+        for name, params, legacy in CASES:
+            error = max_relative_error(legacy(prices), compute(name, params, timestamps, columns))
+            assert error < 1e-9, f"{name}: błąd względny {error}"
+
+            legacy_time = best_of(lambda: legacy(prices), args.repeat)
+            vector_time = best_of(lambda: compute(name, params, timestamps, columns), args.repeat)
+            columns_time = best_of(lambda: compute_columns(name, params, columns), args.repeat)
+            label = f"{name}({','.join(str(v) for v in params.values())})"
+            print(f"  {label:10} pętle: {legacy_time * 1000:8.1f} ms   kolumny: {vector_time * 1000:7.1f} ms"
+                  f"  ({legacy_time / vector_time:5.1f}x; same obliczenia {columns_time * 1000:6.1f} ms,"
+                  f" maks. błąd względny {error:.1e})")
+
+
+if __name__ == "__main__":
+    main()
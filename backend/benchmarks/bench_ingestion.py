@@ -0,0 +1,85 @@
+"""
+Przetwarzanie odpowiedzi Alpha Vantage: dotychczasowa ścieżka wiersz po wierszu
+(json, strptime, walidacja pydantic dla każdej świecy) a hurtowe przetwarzanie
+kolumn (orjson, parsowanie dat w NumPy, walidacja całej partii).
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_ingestion --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+import orjson
+
+from benchmarks.fake_alpha_vantage import make_time_series_payload
+from domain.entities.stock_data import StockPrice, datetime_to_epoch
+from infrastructure.repositories.time_series_ingestion import ingest_time_series
+
+CASES = [
+    ("dzienne, 20 lat", "TIME_SERIES_DAILY", 20 * 252, None),
+    ("1min, pełny miesiąc", "TIME_SERIES_INTRADAY", 30 * 16 * 60, "1min"),
+]
+
+
+def legacy_ingest(raw: bytes):
+    """Ścieżka sprzed zmian: json.loads, strptime i obiekt StockPrice dla każdej świecy."""
+    data = json.loads(raw)
+    time_series = data[next(k for k in data if "Time Series" in k)]
+    prices = []
+    for timestamp_str, price_data in time_series.items():
+        fmt = "%Y-%m-%d" if len(timestamp_str) <= 10 else "%Y-%m-%d %H:%M:%S"
+        prices.append(StockPrice(
+            timestamp=datetime.strptime(timestamp_str, fmt),
+            open=float(price_data.get("1. open", 0)),
+            high=float(price_data.get("2. high", 0)),
+            low=float(price_data.get("3. low", 0)),
+            close=float(price_data.get("4. close", 0)),
+            volume=int(price_data.get("5. volume", 0))
+        ))
+    prices.sort(key=lambda x: x.timestamp, reverse=True)
+    return prices
+
+
+def bulk_ingest(raw: bytes):
+    data = orjson.loads(raw)
+    series, _ = ingest_time_series(data[next(k for k in data if "Time Series" in k)])
+    return series
+
+
+def best_of(fn, raw: bytes, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(raw)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, function, bars, interval in CASES:
+        raw = json.dumps(make_time_series_payload(function, "IBM", bars, interval)).encode("utf-8")
+
+        # Obie ścieżki muszą dawać te same świece
+        legacy = legacy_ingest(raw)
+        series = bulk_ingest(raw)
+        assert len(legacy) == len(series)
+        assert [datetime_to_epoch(p.timestamp) for p in reversed(legacy)] == series.timestamp.tolist()
+        assert np.array_equal([p.close for p in reversed(legacy)], series.close)
+        assert [p.volume for p in reversed(legacy)] == series.volume.tolist()
+
+        legacy_time = best_of(legacy_ingest, raw, args.repeat)
+        bulk_time = best_of(bulk_ingest, raw, args.repeat)
+        print(f"{label} ({bars} świec, {len(raw) / 1024 / 1024:.1f} MiB)")
+        print(f"  wiersz po wierszu: {legacy_time * 1000:8.1f} ms")
+        print(f"  hurtowo:           {bulk_time * 1000:8.1f} ms  ({legacy_time / bulk_time:.1f}x szybciej)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Empiryczny rozkład ceny: jądrowy estymator gęstości liczony wprost (suma
+jąder gaussowskich w każdym węźle siatki, splot horyzontu przez np.convolve)
+a domain.services.kernel_density (rozłożenie na siatkę, FFT i potęga widma).
+
+Dla kilku horyzontów porównywane są masy prawdopodobieństwa obu wariantów.
+Na końcu mierzony jest przegląd suwaków interfejsu predykcji: wiele
+horyzontów, mnożników zmienności i poziomów ufności liczonych z jednego
+estymatora (jak przy kolejnych zapytaniach o /api/prediction/distribution).
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_kernel_density --repeat 3
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from domain.services.kernel_density import ReturnDensity
+from domain.services.price_distribution import grid_distribution
+
+HORIZONS = (1, 5, 21, 63)
+
+
+def make_returns(size: int = 252, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.standard_t(4, size) * 0.01 + 0.0003
+
+
+def direct_horizon(density: ReturnDensity, returns: np.ndarray, steps: int) -> np.ndarray:
+    """Gęstość jądrowa liczona wprost na siatce i steps - 1 splotów liniowych."""
+    grid = density.grid
+    centered = returns - density.drift
+    daily = np.exp(-0.5 * ((grid[:, None] - centered[None, :]) / density.bandwidth) ** 2).sum(axis=1)
+    daily /= daily.sum()
+    center = len(grid) // 2
+    result = daily
+    for _ in range(steps - 1):
+        result = np.convolve(result, daily)[center:center + len(grid)]
+    return result / result.sum()
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    returns = make_returns()
+    build_time = best_of(lambda: ReturnDensity(returns), args.repeat)
+    # Węższa siatka dla wariantu bezpośredniego (najdłuższy porównywany horyzont)
+    density = ReturnDensity(returns, max_steps=max(HORIZONS))
+    print(f"Estymator: {len(returns)} stóp zwrotu, {ReturnDensity(returns).size} węzłów,"
+          f" budowa {build_time * 1000:.2f} ms")
+
+    for steps in HORIZONS:
+        grid, mass = density.horizon(steps)
+        expected = direct_horizon(density, returns, steps)
+        error = float(np.max(np.abs(np.interp(density.grid, grid, mass, left=0.0, right=0.0) - expected)))
+        direct_time = best_of(lambda: direct_horizon(density, returns, steps), 1)
+        fft_time = best_of(lambda: density.horizon(steps), args.repeat)
+        print(f"{steps:3} sesji  wprost: {direct_time * 1000:9.1f} ms   FFT: {fft_time * 1000:6.3f} ms"
+              f"  ({direct_time / fft_time:7.0f}x, maks. różnica masy {error:.1e})")
+
+    density = ReturnDensity(returns)
+    queries = [(days, multiplier, confidence) for days in range(1, 366, 5)
+               for multiplier in (0.5, 1.0, 2.0) for confidence in (0.8, 0.9, 0.95)]
+
+    def sweep():
+        for days, multiplier, confidence in queries:
+            steps = max(1, round(days * 252 / 365))
+            grid, mass = density.horizon(steps)
+            grid_distribution(100.0, steps * density.drift + multiplier * grid, mass,
+                              sorted({0.68, 0.95, 0.99, confidence}))
+
+    sweep_time = best_of(sweep, args.repeat)
+    print(f"Przegląd suwaków: {len(queries)} zapytań, {sweep_time / len(queries) * 1000:.3f} ms na zapytanie"
+          f" (estymator budowany raz, {math.ceil(build_time * 1000)} ms)")
+
+
+if __name__ == "__main__":
+    main()
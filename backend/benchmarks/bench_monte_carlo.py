@@ -0,0 +1,113 @@
+"""
+Symulacja Monte Carlo rozkładu ceny: pętla w Pythonie (ścieżka po ścieżce,
+sesja po sesji, moduł random) a wektorowe domain.services.monte_carlo.
+
+Dla modeli gbm i bootstrap mierzony jest czas symulacji i podsumowania
+(sample_distribution), a wynik GBM porównywany z rozkładem
+logarytmiczno-normalnym ze wzorów zamkniętych. Na końcu ta sama symulacja
+wykonywana jest w bieżącym procesie i w puli procesów - przy tym samym
+ziarnie wyniki muszą być identyczne (stały podział na zadania i ziarna
+potomne SeedSequence.spawn).
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_monte_carlo --paths 1000000 --workers 4
+"""
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from domain.services.monte_carlo import (
+    BOOTSTRAP, GBM, TRADING_DAYS_PER_YEAR, ReturnModel, chunk_sizes, simulate_log_returns
+)
+from domain.services.price_distribution import lognormal_distribution, sample_distribution
+
+SPOT = 100.0
+STEPS = 21
+LOOP_PATHS = 20_000
+
+
+def make_model(size: int = 500, seed: int = 7) -> ReturnModel:
+    rng = np.random.default_rng(seed)
+    close = SPOT * np.exp(np.cumsum(rng.normal(0.0003, 0.015, size)))
+    return ReturnModel.from_prices(close, TRADING_DAYS_PER_YEAR)
+
+
+def simulate_loop(model: ReturnModel, paths: int, seed: int = 7) -> list:
+    """Ścieżka po ścieżce: steps losowań na ścieżkę."""
+    generator = random.Random(seed)
+    prices = []
+    for _ in range(paths):
+        price = SPOT
+        for _ in range(STEPS):
+            price *= math.exp(generator.gauss(model.drift, model.volatility))
+        prices.append(price)
+    return prices
+
+
+def simulate(model: ReturnModel, name: str, paths: int, seed: int, executor=None) -> np.ndarray:
+    sizes = chunk_sizes(paths)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(name, model.returns, model.drift, model.volatility, STEPS, size, child)
+            for size, child in zip(sizes, seeds)]
+    if executor is None:
+        parts = [simulate_log_returns(*arg) for arg in args]
+    else:
+        parts = list(executor.map(simulate_log_returns, *zip(*args)))
+    return np.concatenate(parts)
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    model = make_model()
+    loop_time = best_of(lambda: simulate_loop(model, LOOP_PATHS), 1)
+    print(f"Pętla w Pythonie: {LOOP_PATHS} ścieżek x {STEPS} sesji {loop_time * 1000:.1f} ms"
+          f" ({loop_time / LOOP_PATHS * 1e6:.2f} µs/ścieżkę)")
+
+    for name in (GBM, BOOTSTRAP):
+        simulate_time = best_of(lambda: simulate(model, name, args.paths, 7), args.repeat)
+        log_returns = simulate(model, name, args.paths, 7)
+        summary_time = best_of(lambda: sample_distribution(SPOT, log_returns), args.repeat)
+        speedup = (loop_time / LOOP_PATHS) / (simulate_time / args.paths)
+        print(f"{name:9} {args.paths} ścieżek: symulacja {simulate_time * 1000:7.1f} ms"
+              f" ({simulate_time / args.paths * 1e6:.3f} µs/ścieżkę, {speedup:.0f}x),"
+              f" podsumowanie {summary_time * 1000:.1f} ms")
+
+    # GBM a wzory zamknięte (dryf ln(S) = mu, więc dryf ceny = mu + sigma^2 / 2 na sesję)
+    simulated = sample_distribution(SPOT, simulate(model, GBM, args.paths, 7))
+    exact = lognormal_distribution(SPOT, (model.drift + 0.5 * model.volatility ** 2) * TRADING_DAYS_PER_YEAR,
+                                   model.volatility * math.sqrt(TRADING_DAYS_PER_YEAR),
+                                   STEPS / TRADING_DAYS_PER_YEAR)
+    print(f"GBM a wzory zamknięte: wartość oczekiwana {simulated['expectedValue']} / {exact['expectedValue']}"
+          f" (błąd standardowy {simulated['standardError']}), przedział 95%"
+          f" {simulated['confidenceIntervals'][1]} / {exact['confidenceIntervals'][1]}")
+
+    single = simulate(model, BOOTSTRAP, args.paths, 11)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        pooled = simulate(model, BOOTSTRAP, args.paths, 11, executor)
+        assert np.array_equal(single, pooled), "wynik zależy od liczby procesów"
+        pool_time = best_of(lambda: simulate(model, BOOTSTRAP, args.paths, 11, executor), args.repeat)
+    process_time = best_of(lambda: simulate(model, BOOTSTRAP, args.paths, 11), args.repeat)
+    print(f"Bootstrap {args.paths} ścieżek: jeden proces {process_time * 1000:.1f} ms,"
+          f" pula {args.workers} procesów {pool_time * 1000:.1f} ms (wyniki identyczne)")
+
+
+if __name__ == "__main__":
+    main()
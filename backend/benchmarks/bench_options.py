@@ -0,0 +1,171 @@
+"""
+Wycena opcji: model Blacka-Scholesa liczony w pętli po kontraktach (math,
+jeden kontrakt na wywołanie) a jedno wektorowe wywołanie
+domain.services.black_scholes dla całej siatki kontraktów.
+
+Oba warianty liczą cenę i pięć greków dla tych samych kontraktów, a wyniki
+porównywane są kontrakt po kontrakcie. Tak samo porównywane jest wyznaczanie
+zmienności implikowanej: solver Newtona z bisekcją wywoływany osobno dla
+każdego kontraktu a jeden wsadowy przebieg dla wszystkich kontraktów. Na
+końcu mierzone jest zbudowanie całego łańcucha (OptionChain) i opisów
+kontraktów w formacie API oraz dopasowanie powierzchni zmienności SVI do
+kwotowań łańcucha i czas zapytań o zmienność dla (K, T).
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_options --repeat 3
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries
+from domain.services.black_scholes import black_scholes
+from domain.services.implied_volatility import implied_volatility
+from domain.services.option_chain import OptionChain
+from domain.services.volatility_surface import VolatilitySurface
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def black_scholes_scalar(spot, strike, time_to_expiry, rate, volatility, is_call):
+    """Wycena jednego kontraktu (pętla po kontraktach)."""
+    sqrt_time = math.sqrt(time_to_expiry)
+    d1 = (math.log(spot / strike) + (rate + 0.5 * volatility ** 2) * time_to_expiry) / (volatility * sqrt_time)
+    d2 = d1 - volatility * sqrt_time
+    sign = 1.0 if is_call else -1.0
+    cdf = lambda x: 0.5 * math.erfc(-x / math.sqrt(2.0))
+    pdf_d1 = math.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+    discount = strike * math.exp(-rate * time_to_expiry)
+    nd1, nd2 = cdf(sign * d1), cdf(sign * d2)
+    return {
+        "price": sign * (spot * nd1 - discount * nd2),
+        "delta": sign * nd1,
+        "gamma": pdf_d1 / (spot * volatility * sqrt_time),
+        "theta": (-spot * pdf_d1 * volatility / (2.0 * sqrt_time) - sign * rate * discount * nd2) / 365.0,
+        "vega": spot * pdf_d1 * sqrt_time / 100.0,
+        "rho": sign * discount * time_to_expiry * nd2 / 100.0,
+    }
+
+
+def implied_volatility_scalar(price, spot, strike, time_to_expiry, rate, is_call, tolerance=1e-8):
+    """Zmienność implikowana jednego kontraktu (Newton z bisekcją)."""
+    lo, hi, sigma = 1e-4, 5.0, 0.3
+    for _ in range(100):
+        values = black_scholes_scalar(spot, strike, time_to_expiry, rate, sigma, is_call)
+        diff = values["price"] - price
+        if abs(diff) < tolerance or hi - lo < 1e-10:
+            return sigma
+        if diff > 0:
+            hi = sigma
+        else:
+            lo = sigma
+        vega = values["vega"] * 100.0
+        newton = sigma - diff / vega if vega > 0 else lo - 1.0
+        sigma = newton if lo < newton < hi else 0.5 * (lo + hi)
+    return float("nan")
+
+
+def make_contracts(size: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    strike = rng.uniform(60.0, 140.0, size)
+    time_to_expiry = rng.uniform(7.0, 400.0, size) / 365.0
+    volatility = rng.uniform(0.1, 0.6, size)
+    is_call = rng.random(size) < 0.5
+    return strike, time_to_expiry, volatility, is_call
+
+
+def make_series(size: int = 300, seed: int = 7) -> PriceSeries:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.015, size)))
+    timestamp = 1_700_000_000 + np.arange(size, dtype=np.int64) * 86400
+    return PriceSeries(timestamp, close, close * 1.01, close * 0.99, close, np.full(size, 1e6))
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in SIZES:
+        strike, time_to_expiry, volatility, is_call = make_contracts(size)
+        args_list = list(zip(strike.tolist(), time_to_expiry.tolist(), volatility.tolist(), is_call.tolist()))
+
+        def loop():
+            return [black_scholes_scalar(100.0, k, t, 0.02, v, c) for k, t, v, c in args_list]
+
+        def vector():
+            return black_scholes(100.0, strike, time_to_expiry, 0.02, volatility, is_call)
+
+        looped, vectorized = loop(), vector()
+        error = max(np.max(np.abs(np.array([row[name] for row in looped]) - vectorized[name]))
+                    for name in vectorized)
+        assert error < 1e-9, f"błąd bezwzględny {error}"
+
+        loop_time = best_of(loop, args.repeat)
+        vector_time = best_of(vector, args.repeat)
+        print(f"{size:7} kontraktów  pętla: {loop_time * 1000:8.1f} ms ({loop_time / size * 1e6:5.2f} µs/kontrakt)"
+              f"   wektorowo: {vector_time * 1000:7.2f} ms ({vector_time / size * 1e6:5.3f} µs/kontrakt)"
+              f"  ({loop_time / vector_time:5.1f}x, maks. błąd {error:.1e})")
+
+    print("Zmienność implikowana")
+    for size in SIZES[:2]:
+        strike, time_to_expiry, volatility, is_call = make_contracts(size)
+        price = black_scholes(100.0, strike, time_to_expiry, 0.02, volatility, is_call)["price"]
+        args_list = list(zip(price.tolist(), strike.tolist(), time_to_expiry.tolist(), is_call.tolist()))
+
+        def loop():
+            return [implied_volatility_scalar(p, 100.0, k, t, 0.02, c) for p, k, t, c in args_list]
+
+        def batch():
+            return implied_volatility(price, 100.0, strike, time_to_expiry, 0.02, is_call)
+
+        solved = batch()
+        repriced = black_scholes(100.0, strike, time_to_expiry, 0.02,
+                                 np.where(solved.converged, solved.volatility, volatility), is_call)["price"]
+        error = float(np.max(np.abs(repriced - price)))
+        assert error < 1e-7, f"błąd ceny {error}"
+
+        loop_time = best_of(loop, args.repeat)
+        batch_time = best_of(batch, args.repeat)
+        print(f"{size:7} kontraktów  pętla: {loop_time * 1000:8.1f} ms   wsadowo: {batch_time * 1000:7.2f} ms"
+              f"  ({loop_time / batch_time:5.1f}x, maks. błąd ceny {error:.1e})  {solved.get_stats()}")
+
+    series = make_series()
+    chain = OptionChain("BENCH", series)
+    chain_time = best_of(lambda: OptionChain("BENCH", series), args.repeat)
+    indices = np.arange(len(chain))
+    contracts_time = best_of(lambda: chain.contracts(indices), args.repeat)
+    print(f"Łańcuch {len(chain)} kontraktów: wycena {chain_time * 1000:.2f} ms,"
+          f" opisy kontraktów {contracts_time * 1000:.2f} ms")
+
+    def fit():
+        return VolatilitySurface.fit(chain.spot, chain.rate, chain.strike[chain.solved], chain.time[chain.solved],
+                                     chain.implied_volatility[chain.solved], chain.is_call[chain.solved])
+
+    surface = fit()
+    fit_time = best_of(fit, args.repeat)
+    error = float(np.max(np.abs(surface.volatility(chain.strike, chain.time) - chain.volatility)))
+    rng = np.random.default_rng(7)
+    queries = list(zip(rng.uniform(0.7, 1.3, 10_000) * chain.spot, rng.uniform(0.01, 2.0, 10_000)))
+    single_time = best_of(lambda: [surface.volatility_at(strike, t) for strike, t in queries], args.repeat)
+    strikes, times = (np.array(column) for column in zip(*queries))
+    batch_time = best_of(lambda: surface.volatility(strikes, times), args.repeat)
+    print(f"Powierzchnia zmienności ({len(surface.times)} przekrojów): dopasowanie {fit_time * 1000:.1f} ms,"
+          f" maks. odchylenie od zmienności modelu {error:.4f}")
+    print(f"  zapytanie o (K, T): pojedynczo {single_time / len(queries) * 1e6:.2f} µs,"
+          f" wsadowo {batch_time / len(queries) * 1e6:.3f} µs na punkt")
+
+
+if __name__ == "__main__":
+    main()
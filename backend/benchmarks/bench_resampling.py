@@ -0,0 +1,79 @@
+"""
+Budowa grubszych interwałów z zapisanych świec (domain.services.resampling).
+
+Przed pomiarem sprawdzane jest, że świece zbudowane ze świec minutowych mają
+te same znaczniki czasu co świece pobierane z API (świece Alpha Vantage z
+atrapy serwera - benchmarks.fake_alpha_vantage).
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_resampling --repeat 5
+"""
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.bench_indicator_state import best_of
+from benchmarks.bench_indicators import make_prices
+from benchmarks.fake_alpha_vantage import make_time_series_payload
+from domain.entities.stock_data import PriceSeries
+from domain.services.resampling import resample
+from infrastructure.repositories.time_series_ingestion import ingest_time_series
+
+CASES = [
+    # (opis, liczba świec, krok w sekundach, interwał docelowy)
+    ("1min -> 60min", 1_000_000, 60, "intraday_60min"),
+    ("1min -> 5min", 1_000_000, 60, "intraday_5min"),
+    ("dzienne -> tygodniowe", 10_000, 86400, "weekly"),
+    ("dzienne -> miesięczne", 10_000, 86400, "monthly"),
+]
+
+
+# Świece pobierane z API: (interwał, czas ostatniej świecy w dniu) - godzinowe
+# od pełnej godziny, krótsze od minuty podzielnej przez ich szerokość
+FETCHED = [
+    ("60min", datetime(2026, 10, 16, 19, 0)),
+    ("30min", datetime(2026, 10, 16, 19, 30)),
+    ("15min", datetime(2026, 10, 16, 19, 45)),
+]
+CHECK_DAYS = 5
+
+
+def fetched_series(interval: str, end: datetime) -> PriceSeries:
+    minutes = int(interval.replace("min", ""))
+    payload = make_time_series_payload("TIME_SERIES_INTRADAY", "TEST", CHECK_DAYS * 16 * 60 // minutes,
+                                       interval=interval, end=end)
+    return ingest_time_series(payload[f"Time Series ({interval})"])[0]
+
+
+def check_fetched_alignment() -> None:
+    """Świece zbudowane ze świec minutowych mają te same znaczniki czasu co pobrane z API."""
+    source = fetched_series("1min", datetime(2026, 10, 16, 19, 59))
+    for interval, end in FETCHED:
+        fetched = fetched_series(interval, end)
+        derived = resample(source, f"intraday_{interval}")
+        first = max(int(fetched.timestamp[0]), int(derived.timestamp[0]))
+        fetched_timestamps = fetched.timestamp[fetched.timestamp >= first]
+        derived_timestamps = derived.timestamp[derived.timestamp >= first]
+        assert np.array_equal(fetched_timestamps, derived_timestamps), \
+            f"1min -> {interval}: znaczniki czasu różne od pobranych świec"
+        print(f"1min -> {interval}: {len(derived_timestamps)} świec, znaczniki czasu jak w pobranych")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check_fetched_alignment()
+    for label, size, step, target in CASES:
+        _, _, columns = make_prices(size)
+        timestamps = np.arange(size, dtype=np.int64) * step
+        series = PriceSeries(timestamps, columns["close"], columns["high"], columns["low"],
+                             columns["close"], np.ones(size, dtype=np.int64))
+        elapsed = best_of(lambda: resample(series, target), args.repeat)
+        print(f"{label:24} {size:>9} świec -> {len(resample(series, target)):>7}: {elapsed * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Pamięć i czas budowy odpowiedzi: lista obiektów StockPrice a kolumnowy PriceSeries.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_stock_data
+"""
+import time
+import tracemalloc
+from datetime import datetime
+
+from application.stock_application_service import StockApplicationService
+from benchmarks.fake_alpha_vantage import make_time_series_payload
+from domain.entities.stock_data import StockData, StockPrice, PriceSeries, datetime_to_epoch
+
+CASES = [
+    ("dzienne, 20 lat", "TIME_SERIES_DAILY", 20 * 252, None),
+    ("1min, pełny miesiąc", "TIME_SERIES_INTRADAY", 30 * 16 * 60, "1min"),
+]
+
+
+def legacy_prices(rows):
+    """Dotychczasowa reprezentacja: lista walidowanych obiektów StockPrice (od najnowszych)."""
+    return [StockPrice(timestamp=ts, open=o, high=h, low=l, close=c, volume=v) for ts, o, h, l, c, v in rows]
+
+
+def legacy_to_dict(prices):
+    return [
+        {
+            "timestamp": p.timestamp.isoformat(),
+            "open": p.open,
+            "high": p.high,
+            "low": p.low,
+            "close": p.close,
+            "volume": p.volume
+        }
+        for p in prices
+    ]
+
+
+def measure(fn):
+    """Zwraca wynik, czas wykonania i pamięć zajmowaną przez wynik (pomiar pamięci w osobnym przebiegu)."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main() -> None:
+    service = StockApplicationService(stock_service=None)
+    for label, function, bars, interval in CASES:
+        payload = make_time_series_payload(function, "IBM", bars, interval)
+        series_key = next(k for k in payload if k != "Meta Data")
+        fmt = "%Y-%m-%d" if interval is None else "%Y-%m-%d %H:%M:%S"
+        rows = [
+            (datetime.strptime(ts, fmt), float(v["1. open"]), float(v["2. high"]),
+             float(v["3. low"]), float(v["4. close"]), int(v["5. volume"]))
+            for ts, v in payload[series_key].items()
+        ]
+        epoch_rows = [(datetime_to_epoch(r[0]),) + r[1:] for r in reversed(rows)]
+
+        prices, legacy_build, legacy_mem = measure(lambda: legacy_prices(rows))
+        _, legacy_dict, _ = measure(lambda: legacy_to_dict(prices))
+
+        series, columnar_build, columnar_mem = measure(lambda: PriceSeries(*zip(*epoch_rows)))
+        data = StockData(symbol="IBM", series=series, interval="bench", last_refreshed=datetime.now())
+        _, columnar_dict, _ = measure(lambda: service._stock_data_to_dict(data))
+
+        print(f"{label} ({bars} świec)")
+        print(f"  List[StockPrice]: pamięć {legacy_mem / 1024:9.1f} KiB, budowa {legacy_build * 1000:7.1f} ms, "
+              f"do słownika {legacy_dict * 1000:7.1f} ms")
+        print(f"  PriceSeries:      pamięć {columnar_mem / 1024:9.1f} KiB, budowa {columnar_build * 1000:7.1f} ms, "
+              f"do słownika {columnar_dict * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
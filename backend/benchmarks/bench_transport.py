@@ -0,0 +1,49 @@
+"""
+Porównanie zapytań bez puli połączeń (requests.get) z transportem RequestsTransport.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_transport --requests 200 --threads 8
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.fake_alpha_vantage import start_fake_server
+from infrastructure.apis.http_transport import RequestsTransport
+
+PARAMS = {"function": "TIME_SERIES_DAILY", "symbol": "IBM", "outputsize": "compact", "apikey": "bench"}
+
+
+def run(label: str, fn, total: int, threads: int) -> None:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: fn(), range(total)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {total} zapytań: {elapsed * 1000:8.1f} ms, {elapsed / total * 1000:6.2f} ms/zapytanie")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--url", help="Adres serwera (domyślnie lokalny, sztuczny Alpha Vantage)")
+    args = parser.parse_args()
+
+    url = args.url
+    if not url:
+        _, url = start_fake_server()
+
+    run("requests.get (bez puli)", lambda: requests.get(url, params=PARAMS, timeout=30).content,
+        args.requests, args.threads)
+
+    transport = RequestsTransport(pool_maxsize=args.threads)
+    run("RequestsTransport (pula)", lambda: transport.get(url, PARAMS).content,
+        args.requests, args.threads)
+    print(f"Połączenia nawiązane przez transport: {transport.get_stats()['connectionsOpened']} "
+          f"(bez puli: {args.requests})")
+
+
+if __name__ == "__main__":
+    main()
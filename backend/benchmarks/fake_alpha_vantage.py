@@ -0,0 +1,164 @@
+"""
+Lokalny, sztuczny serwer Alpha Vantage do benchmarków i testów ręcznych.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.fake_alpha_vantage --port 8765
+
+a następnie ustawienie ALPHA_VANTAGE_BASE_URL=http://localhost:8765/query.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+TIME_SERIES_KEYS = {
+    "TIME_SERIES_DAILY": "Time Series (Daily)",
+    "TIME_SERIES_WEEKLY": "Weekly Time Series",
+    "TIME_SERIES_MONTHLY": "Monthly Time Series",
+}
+
+
+def make_time_series_payload(function: str, symbol: str, bars: int,
+                             interval: Optional[str] = None,
+                             end: Optional[datetime] = None, seed: int = 42) -> Dict[str, Any]:
+    """
+    Generuje odpowiedź w formacie Alpha Vantage z losowym błądzeniem cen.
+
+    Args:
+        function: Funkcja API (TIME_SERIES_DAILY, TIME_SERIES_INTRADAY, ...)
+        symbol: Symbol giełdowy
+        bars: Liczba świec
+        interval: Interwał dla danych śróddziennych (np. "1min")
+        end: Czas ostatniej świecy
+        seed: Ziarno generatora liczb losowych
+
+    Returns:
+        Odpowiedź API jako słownik (od najnowszych świec)
+    """
+    rnd = random.Random(seed)
+    intraday = function == "TIME_SERIES_INTRADAY"
+    if intraday:
+        step = timedelta(minutes=int(interval.replace("min", "")))
+        moment = end or datetime(2026, 10, 16, 19, 59)
+        series_key = f"Time Series ({interval})"
+        fmt = "%Y-%m-%d %H:%M:%S"
+    else:
+        step = {"TIME_SERIES_DAILY": timedelta(days=1),
+                "TIME_SERIES_WEEKLY": timedelta(days=7),
+                "TIME_SERIES_MONTHLY": timedelta(days=30)}[function]
+        moment = end or datetime(2026, 10, 16)
+        series_key = TIME_SERIES_KEYS[function]
+        fmt = "%Y-%m-%d"
+
+    series = {}
+    price = 150.0
+    while len(series) < bars:
+        if not intraday and function == "TIME_SERIES_DAILY" and moment.weekday() >= 5:
+            moment -= step
+            continue
+        if intraday and not (4 <= moment.hour < 20):
+            moment -= step
+            continue
+        price *= 1 + rnd.gauss(0, 0.01)
+        series[moment.strftime(fmt)] = {
+            "1. open": f"{price * (1 + rnd.uniform(-0.005, 0.005)):.4f}",
+            "2. high": f"{price * (1 + rnd.uniform(0, 0.01)):.4f}",
+            "3. low": f"{price * (1 - rnd.uniform(0, 0.01)):.4f}",
+            "4. close": f"{price:.4f}",
+            "5. volume": str(rnd.randint(1000, 10_000_000)),
+        }
+        moment -= step
+
+    meta = {
+        "1. Information": f"Fake {function}",
+        "2. Symbol": symbol,
+        "3. Last Refreshed": next(iter(series)),
+    }
+    if intraday:
+        meta["4. Interval"] = interval
+    return {"Meta Data": meta, series_key: series}
+
+
+class FakeAlphaVantageHandler(BaseHTTPRequestHandler):
+    """Obsługuje zapytania /query podobnie jak Alpha Vantage."""
+
+    protocol_version = "HTTP/1.1"
+    # Bez algorytmu Nagle'a utrzymywane połączenia nie czekają na opóźnione ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        body = json.dumps(self.server.payload_for(params)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAlphaVantageServer(ThreadingHTTPServer):
+    """Serwer HTTP z pamięcią wygenerowanych odpowiedzi."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0):
+        super().__init__(address, FakeAlphaVantageHandler)
+        self.latency = latency
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def payload_for(self, params: Dict[str, str]) -> Dict[str, Any]:
+        function = params.get("function", "")
+        if function == "SYMBOL_SEARCH":
+            keywords = params.get("keywords", "").upper()
+            return {"bestMatches": [{
+                "1. symbol": keywords, "2. name": f"{keywords} Inc.", "3. type": "Equity",
+                "4. region": "United States", "8. currency": "USD", "9. matchScore": "1.0000",
+            }]}
+
+        full = params.get("outputsize") == "full"
+        if function == "TIME_SERIES_INTRADAY":
+            bars = 30 * 16 * 60 // int(params.get("interval", "5min").replace("min", "")) if full else 100
+        elif function == "TIME_SERIES_DAILY":
+            bars = 20 * 252 if full else 100
+        elif function in TIME_SERIES_KEYS:
+            bars = 1000 if function == "TIME_SERIES_WEEKLY" else 240
+        else:
+            return {"Error Message": f"Invalid API call: {function}"}
+
+        key = json.dumps(params, sort_keys=True)
+        with self._lock:
+            if key not in self._payloads:
+                self._payloads[key] = make_time_series_payload(
+                    function, params.get("symbol", "IBM").upper(), bars, params.get("interval"))
+            return self._payloads[key]
+
+
+def start_fake_server(port: int = 0, latency: float = 0.0) -> Tuple[FakeAlphaVantageServer, str]:
+    """Uruchamia serwer w wątku tła i zwraca go razem z adresem /query."""
+    server = FakeAlphaVantageServer(("127.0.0.1", port), latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/query"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sztuczny serwer Alpha Vantage")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Opóźnienie odpowiedzi w sekundach")
+    args = parser.parse_args()
+
+    fake_server = FakeAlphaVantageServer(("0.0.0.0", args.port), args.latency)
+    print(f"Sztuczny serwer Alpha Vantage: http://localhost:{args.port}/query")
+    fake_server.serve_forever()
@@ -1,6 +1,32 @@
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+import re
+from calendar import timegm
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, model_validator
+
+
+EPOCH = datetime(1970, 1, 1)
+
+# Dopuszczalny symbol (np. AAPL, BRK-B, AAF.LON) - symbol wyznacza ścieżkę w magazynie świec
+SYMBOL_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9.\-]{0,19}")
+
+
+def is_valid_symbol(symbol: Any) -> bool:
+    """Sprawdza, czy symbol ma dopuszczalną postać (litery, cyfry, kropka, myślnik; do 20 znaków)."""
+    return isinstance(symbol, str) and SYMBOL_PATTERN.fullmatch(symbol) is not None
+
+
+def datetime_to_epoch(value: datetime) -> int:
+    """Konwertuje (naiwny) obiekt datetime na sekundy od epoki."""
+    return timegm(value.timetuple())
+
+
+def epoch_to_datetime(value: int) -> datetime:
+    """Konwertuje sekundy od epoki na naiwny obiekt datetime."""
+    return EPOCH + timedelta(seconds=int(value))
 
 
 class StockPrice(BaseModel):
@@ -13,14 +39,135 @@ class StockPrice(BaseModel):
     volume: int
 
 
+class PriceSeries:
+    """
+    Kolumnowa reprezentacja świec OHLCV (struktura tablic NumPy).
+
+    Świece są posortowane rosnąco po czasie. Znaczniki czasu to sekundy od
+    epoki (int64), ceny - float64, wolumen - int64. Wycinki (slice, between)
+    są widokami na te same tablice, bez kopiowania danych.
+    """
+
+    DTYPES = {
+        "timestamp": np.int64,
+        "open": np.float64,
+        "high": np.float64,
+        "low": np.float64,
+        "close": np.float64,
+        "volume": np.int64,
+    }
+
+    __slots__ = tuple(DTYPES)
+
+    def __init__(self, timestamp, open, high, low, close, volume):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        return cls(*([] for _ in cls.DTYPES))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "PriceSeries":
+        """Tworzy szereg z kolumn posortowanych rosnąco po czasie."""
+        return cls(*(columns[name] for name in cls.DTYPES))
+
+    @classmethod
+    def from_prices(cls, prices: Iterable[StockPrice]) -> "PriceSeries":
+        """Tworzy szereg z obiektów StockPrice (w dowolnej kolejności)."""
+        rows = [(datetime_to_epoch(p.timestamp), p.open, p.high, p.low, p.close, p.volume) for p in prices]
+        if not rows:
+            return cls.empty()
+        series = cls(*zip(*rows))
+        order = np.argsort(series.timestamp, kind="stable")
+        return series.take(order)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Zwraca kolumny jako słownik nazwa -> tablica."""
+        return {name: getattr(self, name) for name in self.DTYPES}
+
+    def take(self, indices) -> "PriceSeries":
+        return PriceSeries(*(getattr(self, name)[indices] for name in self.DTYPES))
+
+    def slice(self, start: int, stop: int) -> "PriceSeries":
+        """Zwraca widok na świece o indeksach [start, stop)."""
+        return PriceSeries(*(getattr(self, name)[start:stop] for name in self.DTYPES))
+
+    def between(self, start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> "PriceSeries":
+        """Zwraca widok na świece z przedziału [start_ts, end_ts] (wyszukiwanie binarne)."""
+        start = 0 if start_ts is None else int(np.searchsorted(self.timestamp, start_ts, side="left"))
+        stop = len(self) if end_ts is None else int(np.searchsorted(self.timestamp, end_ts, side="right"))
+        return self.slice(start, max(start, stop))
+
+    def row(self, index: int) -> StockPrice:
+        """Buduje obiekt StockPrice dla świecy o podanym indeksie (bez ponownej walidacji)."""
+        return StockPrice.model_construct(
+            timestamp=epoch_to_datetime(self.timestamp[index]),
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=int(self.volume[index])
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.DTYPES)
+
+
+class PriceRows(Sequence):
+    """Leniwy widok wierszy szeregu jako obiektów StockPrice - od najnowszych do najstarszych."""
+
+    __slots__ = ("series",)
+
+    def __init__(self, series: PriceSeries):
+        self.series = series
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def __getitem__(self, index):
+        size = len(self.series)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Indeks poza zakresem szeregu")
+        return self.series.row(size - 1 - index)
+
+
 class StockData(BaseModel):
     """Reprezentuje zbiór danych cenowych dla konkretnego symbolu giełdowego."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     symbol: str
     name: Optional[str] = None
-    prices: List[StockPrice]
+    series: PriceSeries
     interval: str  # np. "daily", "weekly", "intraday"
     last_refreshed: datetime
 
+    @model_validator(mode="before")
+    @classmethod
+    def _prices_to_series(cls, values: Any) -> Any:
+        # Zgodność wstecz: lista StockPrice jest zamieniana na kolumny
+        if isinstance(values, dict) and "prices" in values and "series" not in values:
+            values = dict(values)
+            values["series"] = PriceSeries.from_prices(values.pop("prices"))
+        return values
+
+    @property
+    def prices(self) -> PriceRows:
+        """Świece jako obiekty StockPrice (od najnowszych), tworzone dopiero przy odczycie."""
+        return PriceRows(self.series)
+
 
 class StockMetadata(BaseModel):
     """Informacje o instrumencie giełdowym."""
@@ -29,4 +176,4 @@ class StockMetadata(BaseModel):
     type: str  # np. "Equity", "ETF", "Index"
     region: str
     currency: str
-    match_score: Optional[float] = None 
\ No newline at end of file
+    match_score: Optional[float] = None
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from datetime import datetime
+
+from domain.entities.stock_data import StockData, StockMetadata
+
+
+class AsyncStockRepository(ABC):
+    """Asynchroniczny interfejs repozytorium dla danych giełdowych (odpowiednik StockRepository)."""
+    
+    @abstractmethod
+    async def search_stocks(self, query: str) -> List[StockMetadata]:
+        """Wyszukuje instrumenty giełdowe na podstawie zapytania."""
+        pass
+    
+    @abstractmethod
+    async def get_daily_data(self, symbol: str, start_date: Optional[datetime] = None, 
+                            end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dzienne dane historyczne dla danego symbolu."""
+        pass
+    
+    @abstractmethod
+    async def get_intraday_data(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                                end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dane śróddzienne dla danego symbolu z określonym interwałem."""
+        pass
+    
+    @abstractmethod
+    async def get_weekly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera tygodniowe dane dla danego symbolu."""
+        pass
+    
+    @abstractmethod
+    async def get_monthly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera miesięczne dane dla danego symbolu."""
+        pass
@@ -20,16 +20,19 @@ class StockRepository(ABC):
         pass
     
     @abstractmethod
-    def get_intraday_data(self, symbol: str, interval: str) -> StockData:
+    def get_intraday_data(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> StockData:
         """Pobiera dane śróddzienne dla danego symbolu z określonym interwałem."""
         pass
     
     @abstractmethod
-    def get_weekly_data(self, symbol: str) -> StockData:
+    def get_weekly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> StockData:
         """Pobiera tygodniowe dane dla danego symbolu."""
         pass
     
     @abstractmethod
-    def get_monthly_data(self, symbol: str) -> StockData:
+    def get_monthly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None) -> StockData:
         """Pobiera miesięczne dane dla danego symbolu."""
         pass 
\ No newline at end of file
@@ -0,0 +1,101 @@
+import math
+from typing import Dict
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr
+except ImportError:  # scipy jest opcjonalne - dystrybuanta z math.erfc (wolniejsza, ta sama dokładność)
+    _erfc = np.frompyfunc(math.erfc, 1, 1)
+
+    def ndtr(x: np.ndarray) -> np.ndarray:
+        return 0.5 * np.asarray(_erfc(-np.asarray(x, dtype=np.float64) / math.sqrt(2.0)), dtype=np.float64)
+
+# Liczba dni w roku dla thety (zmiana wartości opcji w ciągu jednego dnia kalendarzowego)
+DAYS_PER_YEAR = 365.0
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Dystrybuanta standardowego rozkładu normalnego (wektorowo)."""
+    return ndtr(x)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Gęstość standardowego rozkładu normalnego (wektorowo)."""
+    return _INV_SQRT_2PI * np.exp(-0.5 * np.square(x))
+
+
+def black_scholes(spot, strike, time, rate, volatility, is_call, dividend=0.0) -> Dict[str, np.ndarray]:
+    """
+    Wycenia opcje europejskie modelem Blacka-Scholesa (z ciągłą stopą dywidendy).
+
+    Wszystkie argumenty mogą być tablicami (rozgłaszanymi do wspólnego
+    kształtu), więc cały łańcuch opcji - ceny wykonania x terminy x typy -
+    wyceniany jest w jednym przebiegu, bez pętli po kontraktach.
+
+    Args:
+        spot: Cena instrumentu bazowego
+        strike: Cena wykonania
+        time: Czas do wygaśnięcia (w latach, > 0)
+        rate: Stopa wolna od ryzyka (ciągła, np. 0.02)
+        volatility: Zmienność (np. 0.25 dla 25%, > 0)
+        is_call: True dla opcji kupna, False dla opcji sprzedaży
+        dividend: Ciągła stopa dywidendy
+
+    Returns:
+        Słownik tablic: price, delta, gamma, theta (na dzień), vega i rho
+        (na 1 punkt procentowy zmienności i stopy)
+    """
+    spot, strike, time, rate, volatility, dividend = (
+        np.asarray(value, dtype=np.float64) for value in (spot, strike, time, rate, volatility, dividend)
+    )
+    is_call = np.asarray(is_call, dtype=bool)
+    sign = np.where(is_call, 1.0, -1.0)
+
+    sqrt_time = np.sqrt(time)
+    vol_sqrt_time = volatility * sqrt_time
+    d1 = (np.log(spot / strike) + (rate - dividend + 0.5 * volatility ** 2) * time) / vol_sqrt_time
+    d2 = d1 - vol_sqrt_time
+
+    spot_discount = np.exp(-dividend * time)
+    strike_discount = strike * np.exp(-rate * time)
+    # N(sign * d) - dla kupna N(d), dla sprzedaży N(-d)
+    nd1 = norm_cdf(sign * d1)
+    nd2 = norm_cdf(sign * d2)
+    pdf_d1 = norm_pdf(d1)
+
+    price = sign * (spot * spot_discount * nd1 - strike_discount * nd2)
+    delta = sign * spot_discount * nd1
+    gamma = spot_discount * pdf_d1 / (spot * vol_sqrt_time)
+    vega = spot * spot_discount * pdf_d1 * sqrt_time
+    theta = (-spot * spot_discount * pdf_d1 * volatility / (2.0 * sqrt_time)
+             + sign * (dividend * spot * spot_discount * nd1 - rate * strike_discount * nd2))
+    rho = sign * strike_discount * time * nd2
+
+    return {
+        "price": price,
+        "delta": delta,
+        "gamma": gamma,
+        "theta": theta / DAYS_PER_YEAR,
+        "vega": vega / 100.0,
+        "rho": rho / 100.0,
+    }
+
+
+def price_and_vega(spot, strike, time, rate, volatility, is_call, dividend=0.0):
+    """
+    Zwraca jedynie cenę i vegę (na jednostkę zmienności, bez skalowania).
+
+    Wariant black_scholes dla iteracyjnego odwracania cen (zmienność
+    implikowana) - bez greków, których solver nie potrzebuje.
+    """
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_time = np.sqrt(time)
+    vol_sqrt_time = volatility * sqrt_time
+    d1 = (np.log(spot / strike) + (rate - dividend + 0.5 * volatility ** 2) * time) / vol_sqrt_time
+    d2 = d1 - vol_sqrt_time
+    spot_discount = spot * np.exp(-dividend * time)
+    price = sign * (spot_discount * norm_cdf(sign * d1) - strike * np.exp(-rate * time) * norm_cdf(sign * d2))
+    return price, spot_discount * norm_pdf(d1) * sqrt_time
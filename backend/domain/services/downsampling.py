@@ -0,0 +1,98 @@
+from typing import Optional
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries
+from domain.services.resampling import aggregate
+
+# Metody zmniejszania liczby punktów
+OHLC = "ohlc"
+LTTB = "lttb"
+METHODS = (OHLC, LTTB)
+
+# Najmniejsza sensowna liczba punktów (LTTB zawsze zachowuje pierwszy i ostatni punkt)
+MIN_POINTS = 3
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Wybiera indeksy punktów metodą Largest-Triangle-Three-Buckets.
+
+    Osią X jest numer świecy (jak na wykresie giełdowym - bez przerw między
+    sesjami). Punkty dzielone są na max_points - 2 kubełki; z każdego
+    wybierany jest punkt tworzący największy trójkąt z punktem wybranym
+    w poprzednim kubełku i średnią kolejnego. Pierwszy i ostatni punkt są
+    zachowywane.
+
+    Wybór w kubełku zależy od wyboru w poprzednim, więc kubełki przetwarzane
+    są po kolei; pola trójkątów w kubełku i średnie wszystkich kubełków
+    liczone są wektorowo.
+
+    Args:
+        values: Wartości (oś Y)
+        max_points: Największa liczba zwracanych punktów (co najmniej MIN_POINTS)
+
+    Returns:
+        Rosnące indeksy wybranych punktów
+    """
+    size = len(values)
+    if size <= max_points:
+        return np.arange(size)
+
+    values = np.asarray(values, dtype=np.float64)
+    buckets = max_points - 2
+    # Granice kubełków (bez pierwszego i ostatniego punktu)
+    bounds = (np.arange(buckets + 1) * ((size - 2) / buckets)).astype(np.int64) + 1
+    starts, stops = bounds[:-1], bounds[1:]
+    # Średnie kubełków; dla ostatniego kubełka "następnym" jest ostatni punkt
+    means_y = np.add.reduceat(values[1:size - 1], starts - 1) / (stops - starts)
+    means_x = (starts + stops - 1) / 2
+    next_x = np.append(means_x[1:], size - 1)
+    next_y = np.append(means_y[1:], values[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+    a_x, a_y = 0.0, float(values[0])
+    for bucket in range(buckets):
+        start, stop = int(starts[bucket]), int(stops[bucket])
+        c_x, c_y = next_x[bucket], next_y[bucket]
+        # Podwojone pole trójkąta (a, b, c) dla każdego punktu b kubełka
+        area = np.abs((a_x - c_x) * (values[start:stop] - a_y) - (a_x - np.arange(start, stop)) * (c_y - a_y))
+        chosen = start + int(np.argmax(area))
+        selected[bucket + 1] = chosen
+        a_x, a_y = float(chosen), float(values[chosen])
+    return selected
+
+
+def downsample_ohlc(series: PriceSeries, max_points: int) -> PriceSeries:
+    """
+    Łączy kolejne świece w kubełki o równej liczbie świec (co najwyżej max_points kubełków).
+
+    Świeca kubełka ma czas i otwarcie pierwszej świecy, zamknięcie ostatniej,
+    maksimum/minimum cen i sumę wolumenu - zachowuje kształt wykresu
+    świecowego. Kubełki liczone są od najstarszej świecy, więc nowe świece
+    nie przesuwają granic wcześniejszych kubełków.
+    """
+    size = len(series)
+    if size <= max_points:
+        return series
+    width = -(-size // max_points)
+    starts = np.arange(0, size, width)
+    return aggregate(series, starts, series.timestamp[starts])
+
+
+def downsample_series(series: PriceSeries, max_points: Optional[int], method: str = OHLC) -> PriceSeries:
+    """
+    Zmniejsza liczbę świec do max_points wybraną metodą.
+
+    Args:
+        series: Szereg rosnąco po czasie
+        max_points: Największa liczba świec lub None - bez zmian
+        method: OHLC - łączenie świec w kubełki, LTTB - wybór świec według cen zamknięcia
+    """
+    if max_points is None or len(series) <= max_points:
+        return series
+    if method == LTTB:
+        return series.take(lttb_indices(series.close, max_points))
+    return downsample_ohlc(series, max_points)
@@ -0,0 +1,127 @@
+import math
+from typing import Any, Dict
+
+import numpy as np
+
+from domain.services.black_scholes import price_and_vega
+
+# Przedział poszukiwań zmienności (początkowy przedział bisekcji)
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 5.0
+
+# Zbieżność: różnica ceny modelu i ceny rynkowej albo szerokość przedziału zmienności
+PRICE_TOLERANCE = 1e-8
+VOLATILITY_TOLERANCE = 1e-10
+MAX_ITERATIONS = 100
+
+# Poniżej tej wartości przybliżenie Manastera-Koehlera (zero dla opcji "po cenie") zastępuje Brenner-Subrahmanyam
+_MIN_GUESS = 0.05
+
+
+class ImpliedVolatility:
+    """
+    Wynik odwracania cen opcji - zmienności implikowane i statystyki zbieżności.
+
+    Zmienność kontraktów, których cena leży poza granicami arbitrażowymi
+    (unsolvable) lub dla których solver nie zbiegł (failed), ma wartość NaN.
+    """
+
+    def __init__(self, volatility: np.ndarray, converged: np.ndarray, iterations: np.ndarray,
+                 newton_steps: int, bisection_steps: int, unsolvable: int):
+        self.volatility = volatility
+        self.converged = converged
+        self.iterations = iterations
+        self.newton_steps = newton_steps
+        self.bisection_steps = bisection_steps
+        self.unsolvable = unsolvable
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki zbieżności (liczby kontraktów i kroków)."""
+        converged = int(np.count_nonzero(self.converged))
+        return {
+            "contracts": int(self.converged.size),
+            "converged": converged,
+            "unsolvable": self.unsolvable,
+            "failed": int(self.converged.size) - converged - self.unsolvable,
+            "maxIterations": int(self.iterations.max(initial=0)),
+            "newtonSteps": self.newton_steps,
+            "bisectionSteps": self.bisection_steps
+        }
+
+
+def implied_volatility(price, spot, strike, time, rate, is_call, dividend=0.0,
+                       max_iterations: int = MAX_ITERATIONS) -> ImpliedVolatility:
+    """
+    Wyznacza zmienność implikowaną dla wielu kontraktów naraz.
+
+    Każda iteracja wycenia jednym wektorowym wywołaniem wszystkie kontrakty,
+    które jeszcze nie zbiegły. Krok Newtona (cena / vega) jest przyjmowany,
+    jeśli mieści się w przedziale [lo, hi] zawężanym przy każdej wycenie
+    (cena rośnie ze zmiennością); w przeciwnym razie - np. przy znikomej
+    vedze głęboko w lub poza pieniądzem - wykonywany jest krok bisekcji,
+    więc solver zbiega dla każdej ceny w granicach arbitrażowych.
+
+    Args:
+        price: Ceny opcji (rynkowe)
+        spot, strike, time, rate, is_call, dividend: Jak w black_scholes
+        max_iterations: Największa liczba iteracji
+
+    Returns:
+        ImpliedVolatility z tablicą zmienności w kształcie rozgłoszonych argumentów
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64)
+                                   for value in (price, spot, strike, time, rate, dividend)),
+                                 np.asarray(is_call, dtype=bool))
+    shape = arrays[0].shape
+    price, spot, strike, time, rate, dividend, is_call = (array.ravel() for array in arrays)
+
+    # Granice arbitrażowe: wartość wewnętrzna (zdyskontowana) i cena instrumentu bazowego / wykonania
+    with np.errstate(invalid="ignore", over="ignore"):
+        spot_discount = spot * np.exp(-dividend * time)
+        strike_discount = strike * np.exp(-rate * time)
+        lower = np.maximum(np.where(is_call, spot_discount - strike_discount, strike_discount - spot_discount), 0.0)
+        upper = np.where(is_call, spot_discount, strike_discount)
+        solvable = (time > 0) & (price > lower) & (price < upper)
+
+    volatility = np.full(price.size, np.nan)
+    converged = np.zeros(price.size, dtype=bool)
+    iterations = np.zeros(price.size, dtype=np.int64)
+    newton_steps = bisection_steps = 0
+
+    index = np.flatnonzero(solvable)
+    # Punkt startowy: Manaster-Koehler, a w pobliżu ceny wykonania - Brenner-Subrahmanyam
+    with np.errstate(divide="ignore"):
+        sigma = np.sqrt(2.0 * np.abs(np.log(spot_discount[index] / strike_discount[index])) / time[index])
+    near_money = sigma < _MIN_GUESS
+    sigma[near_money] = (math.sqrt(2.0 * math.pi) * price[index][near_money]
+                         / (spot_discount[index][near_money] * np.sqrt(time[index][near_money])))
+    sigma = np.clip(sigma, MIN_VOLATILITY, MAX_VOLATILITY)
+    lo = np.full(index.size, MIN_VOLATILITY)
+    hi = np.full(index.size, MAX_VOLATILITY)
+
+    for iteration in range(1, max_iterations + 1):
+        if not index.size:
+            break
+        model, vega = price_and_vega(spot[index], strike[index], time[index], rate[index], sigma,
+                                     is_call[index], dividend[index])
+        diff = model - price[index]
+        done = (np.abs(diff) < PRICE_TOLERANCE) | (hi - lo < VOLATILITY_TOLERANCE)
+        volatility[index[done]] = sigma[done]
+        converged[index[done]] = True
+        iterations[index[done]] = iteration
+
+        active = ~done
+        index, sigma, diff, vega, lo, hi = (array[active] for array in (index, sigma, diff, vega, lo, hi))
+        # Przedział zawierający rozwiązanie - cena jest rosnącą funkcją zmienności
+        hi = np.where(diff > 0, sigma, hi)
+        lo = np.where(diff < 0, sigma, lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sigma - diff / vega
+        use_newton = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        sigma = np.where(use_newton, newton, 0.5 * (lo + hi))
+        newton_steps += int(np.count_nonzero(use_newton))
+        bisection_steps += int(use_newton.size - np.count_nonzero(use_newton))
+
+    iterations[index] = max_iterations
+    return ImpliedVolatility(volatility.reshape(shape), converged.reshape(shape), iterations.reshape(shape),
+                             newton_steps, bisection_steps, int(price.size - np.count_nonzero(solvable)))
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries
+from domain.services.technical_indicators import Indicator
+
+
+class IndicatorState:
+    """
+    Stan wskaźnika dla jednego szeregu (symbol, interwał) i zestawu parametrów.
+
+    Przechowuje wynik (wraz ze stanem pośrednim - wartościami EMA, średnimi
+    Wildera, odchyleniem w oknie) dla wszystkich świec poza ostatnią.
+    Ostatnia świeca śróddzienna może się jeszcze zmieniać, więc jest
+    przeliczana przy każdej aktualizacji. Gdy szereg rośnie tylko o nowe
+    świece, obliczenia obejmują wyłącznie je; zmiana historii (dowolna
+    różnica w świecach objętych wynikiem) wymusza pełne przeliczenie.
+    """
+
+    # Kolumny, od których zależą wskaźniki
+    INPUTS = ("timestamp", "close", "high", "low")
+
+    def __init__(self, indicator: Indicator, params: Dict[str, Any]):
+        self.indicator = indicator
+        self.params = params
+        self.lock = threading.Lock()
+        self._result: Optional[Dict[str, np.ndarray]] = None
+        # Świece objęte zapisanym wynikiem
+        self._inputs: Optional[Dict[str, np.ndarray]] = None
+
+    def _extends(self, series: PriceSeries) -> bool:
+        """Sprawdza, czy szereg jest kontynuacją szeregu, dla którego zapisano wynik."""
+        if self._inputs is None:
+            return False
+        done = len(self._inputs["timestamp"])
+        # Porównanie całych kolumn (wektorowo) - wykrywa też korekty w środku historii
+        return len(series) >= done and all(
+            np.array_equal(getattr(series, name)[:done], self._inputs[name]) for name in self.INPUTS
+        )
+
+    def update(self, series: PriceSeries) -> Tuple[Dict[str, np.ndarray], bool]:
+        """
+        Oblicza wskaźnik dla szeregu (rosnąco po czasie), korzystając z zapisanego stanu.
+
+        Returns:
+            Wynik dla wszystkich świec szeregu i informacja, czy obliczenia były przyrostowe
+        """
+        columns = {"close": series.close, "high": series.high, "low": series.low}
+        incremental = self._extends(series)
+        result = self.indicator.compute(
+            columns, previous=self._result if incremental else None, **self.params
+        )
+
+        done = len(series) - 1
+        if done > 0:
+            self._result = {output: values[:done] for output, values in result.items()}
+            self._inputs = {name: getattr(series, name)[:done] for name in self.INPUTS}
+        else:
+            self._result = None
+            self._inputs = None
+        return result, incremental
+
+
+class IndicatorStateStore:
+    """
+    Stany wskaźników według klucza (symbol, interwał, wskaźnik, parametry).
+
+    Liczba stanów jest ograniczona - najdawniej używane są usuwane (LRU).
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._states: "OrderedDict[Tuple, IndicatorState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"incremental": 0, "recomputed": 0, "evictions": 0}
+
+    def _state(self, key: Tuple, indicator: Indicator, params: Dict[str, Any]) -> IndicatorState:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = IndicatorState(indicator, params)
+                self._states[key] = state
+                while len(self._states) > self.max_entries:
+                    self._states.popitem(last=False)
+                    self._stats["evictions"] += 1
+            else:
+                self._states.move_to_end(key)
+            return state
+
+    def compute(self, symbol: str, interval: str, indicator: Indicator,
+                params: Dict[str, Any], series: PriceSeries) -> Dict[str, np.ndarray]:
+        """
+        Oblicza wskaźnik dla szeregu, dokładając do zapisanego stanu tylko nowe świece.
+
+        Args:
+            symbol: Symbol giełdowy
+            interval: Interwał szeregu
+            indicator: Wskaźnik z rejestru
+            params: Parametry wskaźnika (po uzupełnieniu domyślnymi)
+            series: Cały dostępny szereg, rosnąco po czasie
+        """
+        key = (symbol.upper(), interval, indicator.name, tuple(sorted(params.items())))
+        state = self._state(key, indicator, params)
+        with state.lock:
+            result, incremental = state.update(series)
+        with self._lock:
+            self._stats["incremental" if incremental else "recomputed"] += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki stanów wskaźników."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._states)
+            stats["maxEntries"] = self.max_entries
+        return stats
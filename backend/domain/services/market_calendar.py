@@ -0,0 +1,99 @@
+from datetime import datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+_WEEK_HOURS = 7 * 24
+
+
+class MarketCalendar:
+    """
+    Kalendarz sesji giełdy amerykańskiej (NYSE/NASDAQ).
+
+    Sesja trwa od 9:30 do 16:00 czasu nowojorskiego w dni robocze. Święta
+    giełdowe traktujemy jak zwykłe dni sesyjne - w najgorszym razie dane
+    zostaną odświeżone o jeden raz za dużo.
+    """
+
+    TIMEZONE = ZoneInfo("America/New_York")
+    SESSION_OPEN = time(9, 30)
+    SESSION_CLOSE = time(16, 0)
+
+    def now(self) -> datetime:
+        """Zwraca bieżący czas w strefie giełdy."""
+        return datetime.now(self.TIMEZONE)
+
+    @classmethod
+    def _utc_offset(cls, hour: int) -> int:
+        """Przesunięcie strefy (sekundy) dla godziny hour zapisanej w kodowaniu znaczników świec."""
+        return int(cls.TIMEZONE.utcoffset(_EPOCH + timedelta(hours=hour)).total_seconds())
+
+    @classmethod
+    def to_utc_epoch(cls, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Zamienia znaczniki świec (czas giełdy zakodowany jak UTC) na sekundy od epoki UTC.
+
+        Przesunięcie strefy (EST/EDT) zmienia się najwyżej raz w tygodniu -
+        sprawdzane jest co tydzień w zakresie szeregu, a godzina zmiany
+        wyznaczana bisekcją, więc koszt nie zależy od liczby świec.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not len(timestamps):
+            return timestamps.copy()
+        hours = timestamps // 3600
+        samples = list(range(int(hours.min()), int(hours.max()), _WEEK_HOURS)) + [int(hours.max())]
+        offsets = [cls._utc_offset(hour) for hour in samples]
+        changes, values = [], [offsets[0]]
+        for low, high, before, after in zip(samples, samples[1:], offsets, offsets[1:]):
+            if before == after:
+                continue
+            while high - low > 1:
+                middle = (low + high) // 2
+                if cls._utc_offset(middle) == before:
+                    low = middle
+                else:
+                    high = middle
+            changes.append(high)
+            values.append(after)
+        index = np.searchsorted(np.array(changes, dtype=np.int64), hours, side="right")
+        return timestamps - np.array(values, dtype=np.int64)[index]
+
+    def _localize(self, moment: Optional[datetime]) -> datetime:
+        if moment is None:
+            return self.now()
+        if moment.tzinfo is None:
+            return moment.replace(tzinfo=self.TIMEZONE)
+        return moment.astimezone(self.TIMEZONE)
+
+    def is_trading_day(self, moment: Optional[datetime] = None) -> bool:
+        """Sprawdza, czy w danym dniu odbywa się sesja."""
+        return self._localize(moment).weekday() < 5
+
+    def is_session_open(self, moment: Optional[datetime] = None) -> bool:
+        """Sprawdza, czy w danej chwili trwa sesja."""
+        moment = self._localize(moment)
+        return (self.is_trading_day(moment)
+                and self.SESSION_OPEN <= moment.time() < self.SESSION_CLOSE)
+
+    def _next_at(self, moment: datetime, at: time) -> datetime:
+        candidate = datetime.combine(moment.date(), at, tzinfo=self.TIMEZONE)
+        if candidate <= moment:
+            candidate += timedelta(days=1)
+        while not self.is_trading_day(candidate):
+            candidate += timedelta(days=1)
+        return candidate
+
+    def next_open(self, moment: Optional[datetime] = None) -> datetime:
+        """Zwraca początek najbliższej sesji po danej chwili."""
+        return self._next_at(self._localize(moment), self.SESSION_OPEN)
+
+    def next_close(self, moment: Optional[datetime] = None) -> datetime:
+        """Zwraca koniec najbliższej sesji po danej chwili."""
+        return self._next_at(self._localize(moment), self.SESSION_CLOSE)
+
+    def next_publication(self, moment: Optional[datetime] = None, delay: float = 0) -> datetime:
+        """Zwraca chwilę publikacji świec najbliższej sesji (zamknięcie + delay sekund) po danej chwili."""
+        moment = self._localize(moment)
+        return self.next_close(moment - timedelta(seconds=delay)) + timedelta(seconds=delay)
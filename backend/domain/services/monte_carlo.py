@@ -0,0 +1,107 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+
+# Modele symulacji: geometryczny ruch Browna i losowanie historycznych stóp zwrotu
+GBM = "gbm"
+BOOTSTRAP = "bootstrap"
+MODELS = (GBM, BOOTSTRAP)
+
+# Liczba ścieżek w jednym zadaniu - jednostka podziału symulacji między procesy
+CHUNK_PATHS = 250_000
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Najmniejsza liczba dziennych stóp zwrotu potrzebna do kalibracji
+MIN_RETURNS = 20
+
+
+class ReturnModel:
+    """
+    Model dziennych logarytmicznych stóp zwrotu skalibrowany z historii cen.
+
+    Przechowuje posortowane stopy zwrotu (losowanie ze zwracaniem i zmienne
+    antytetyczne przez odbicie indeksu), ich średnią (dryf) i odchylenie
+    standardowe (zmienność) - na sesję.
+    """
+
+    def __init__(self, returns: np.ndarray):
+        if len(returns) < MIN_RETURNS:
+            raise ValueError(f"Za krótka historia do kalibracji modelu (stóp zwrotu: {len(returns)}, "
+                             f"wymagane: {MIN_RETURNS})")
+        self.returns = np.sort(returns)
+        self.drift = float(np.mean(returns))
+        self.volatility = float(np.std(returns, ddof=1))
+
+    @classmethod
+    def from_prices(cls, close: np.ndarray, window: Optional[int] = None) -> "ReturnModel":
+        """Kalibruje model z cen zamknięcia (ostatnie window sesji lub cała historia)."""
+        if window is not None:
+            close = close[-(window + 1):]
+        return cls(np.diff(np.log(close)))
+
+    def scaled(self, volatility_multiplier: float) -> "ReturnModel":
+        """Zwraca model o zmienności pomnożonej przez volatility_multiplier (przy tym samym dryfie)."""
+        if volatility_multiplier == 1:
+            return self
+        return ReturnModel(self.drift + volatility_multiplier * (self.returns - self.drift))
+
+    def annual_drift(self) -> float:
+        return self.drift * TRADING_DAYS_PER_YEAR
+
+    def annual_volatility(self) -> float:
+        return self.volatility * math.sqrt(TRADING_DAYS_PER_YEAR)
+
+
+def simulate_log_returns(model: str, returns: np.ndarray, drift: float, volatility: float,
+                         steps: int, paths: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Symuluje logarytmiczne stopy zwrotu po steps sesjach dla paths ścieżek.
+
+    Funkcja jest niezależna od stanu procesu (może być wykonywana w puli
+    procesów), a jej wynik zależy wyłącznie od argumentów i ziarna.
+    Połowa ścieżek to zmienne antytetyczne: dla GBM -Z zamiast Z, a dla
+    losowania historycznych stóp zwrotu - stopa z odbitej pozycji w
+    posortowanej historii (kwantyl 1 - u zamiast u).
+
+    Args:
+        model: GBM lub BOOTSTRAP
+        returns: Posortowane dzienne stopy zwrotu (BOOTSTRAP)
+        drift: Średnia dzienna logarytmiczna stopa zwrotu (GBM)
+        volatility: Dzienne odchylenie standardowe (GBM)
+        steps: Liczba sesji w horyzoncie
+        paths: Liczba ścieżek
+        seed: Ziarno generatora
+
+    Returns:
+        Tablica paths logarytmicznych stóp zwrotu ln(S_T / S_0)
+    """
+    rng = np.random.default_rng(seed)
+    half = (paths + 1) // 2
+
+    if model == GBM:
+        # Suma steps niezależnych kroków normalnych ma rozkład normalny - wystarcza jeden krok
+        shocks = rng.standard_normal(half)
+        shocks = np.concatenate([shocks, -shocks])
+        result = steps * drift + math.sqrt(steps) * volatility * shocks
+    elif model == BOOTSTRAP:
+        last = len(returns) - 1
+        total = np.zeros(half)
+        antithetic = np.zeros(half)
+        for _ in range(steps):
+            index = rng.integers(0, last + 1, half)
+            total += returns[index]
+            antithetic += returns[last - index]
+        result = np.concatenate([total, antithetic])
+    else:
+        raise ValueError(f"Nieobsługiwany model symulacji: {model}. Dostępne: {', '.join(MODELS)}")
+    return result[:paths]
+
+
+def chunk_sizes(paths: int, chunk_paths: int = CHUNK_PATHS) -> List[int]:
+    """Dzieli liczbę ścieżek na zadania (stały podział - wynik nie zależy od liczby procesów)."""
+    sizes = [chunk_paths] * (paths // chunk_paths)
+    if paths % chunk_paths:
+        sizes.append(paths % chunk_paths)
+    return sizes
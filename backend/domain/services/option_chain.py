@@ -0,0 +1,274 @@
+import math
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries, datetime_to_epoch, epoch_to_datetime
+from domain.services.black_scholes import black_scholes
+from domain.services.implied_volatility import implied_volatility
+from domain.services.market_calendar import MarketCalendar
+
+# Stopa wolna od ryzyka (ciągła) używana do wyceny
+RISK_FREE_RATE = 0.02
+
+# Zmienność, gdy historia jest zbyt krótka do jej oszacowania
+DEFAULT_VOLATILITY = 0.25
+
+# Liczba sesji (dni) używanych do oszacowania zmienności historycznej
+VOLATILITY_WINDOW = 60
+TRADING_DAYS_PER_YEAR = 252
+
+# Wzrost zmienności z oddaleniem ceny wykonania od ceny bazowej (uśmiech zmienności)
+SMILE_SLOPE = 0.15
+
+# Zakres cen wykonania (+-30% ceny bazowej) i docelowa liczba cen wykonania
+STRIKE_WIDTH = 0.3
+STRIKE_COUNT = 24
+
+# Dopuszczalne ("ładne") kroki cen wykonania
+STRIKE_STEPS = (0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0)
+
+# Krok notowania cen opcji
+PRICE_TICK = 0.01
+
+# Wymagana dokładność zmienności implikowanej (0.1 pkt proc.) - kwotowanie wyznacza
+# zmienność z tą dokładnością, gdy zmiana zmienności o IV_RESOLUTION zmienia cenę
+# o co najmniej pół kroku notowania
+IV_RESOLUTION = 0.001
+
+SECONDS_PER_YEAR = 365.0 * 86400
+CALL = "call"
+PUT = "put"
+
+_EXPIRY_CLOSE = MarketCalendar.SESSION_CLOSE
+
+
+def option_expirations(as_of: date, count: int = 6) -> List[date]:
+    """Zwraca kolejne standardowe terminy wygaśnięcia (trzecie piątki miesięcy) po dniu as_of."""
+    expirations = []
+    year, month = as_of.year, as_of.month
+    while len(expirations) < count:
+        first = date(year, month, 1)
+        # Piątek ma numer 4 (poniedziałek - 0)
+        third_friday = first + timedelta(days=(4 - first.weekday()) % 7 + 14)
+        if third_friday > as_of:
+            expirations.append(third_friday)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return expirations
+
+
+def strike_grid(spot: float, width: float = STRIKE_WIDTH, count: int = STRIKE_COUNT) -> np.ndarray:
+    """Zwraca ceny wykonania w zakresie spot +- width o "ładnym" kroku (ok. count cen)."""
+    target = 2 * width * spot / count
+    step = next((step for step in STRIKE_STEPS if step >= target), STRIKE_STEPS[-1])
+    low = math.ceil(spot * (1 - width) / step) * step
+    high = math.floor(spot * (1 + width) / step) * step
+    return np.arange(low, high + step / 2, step)
+
+
+def realized_volatility(close: np.ndarray, window: int = VOLATILITY_WINDOW) -> float:
+    """Zwraca roczną zmienność historyczną z logarytmicznych stóp zwrotu ostatnich window sesji."""
+    close = close[-(window + 1):]
+    if len(close) < 3:
+        return DEFAULT_VOLATILITY
+    returns = np.diff(np.log(close))
+    return float(np.std(returns, ddof=1) * math.sqrt(TRADING_DAYS_PER_YEAR))
+
+
+def smile_volatility(base: float, spot: float, strike: np.ndarray) -> np.ndarray:
+    """Zmienność dla cen wykonania - zmienność bazowa rosnąca z odległością od ceny bazowej."""
+    return base + SMILE_SLOPE * np.abs(spot - strike) / spot
+
+
+class OptionChain:
+    """
+    Łańcuch opcji europejskich dla jednej migawki instrumentu bazowego.
+
+    Kontrakty (ceny wykonania x terminy x typy) przechowywane są kolumnowo,
+    a ceny i greki liczone są jednym wektorowym wywołaniem black_scholes.
+    Migawka to ostatnia świeca dzienna: czas do wygaśnięcia liczony jest od
+    jej zamknięcia, więc ten sam szereg daje zawsze ten sam łańcuch.
+
+    Ceny modelu zaokrąglane są do kroku notowania (jak kwotowania rynkowe),
+    a zmienność implikowana i greki wyznaczane są z tych kwotowań - tak samo
+    jak dla łańcucha z rynku. Kwotowanie kontraktu o małej wedze (daleko poza
+    pieniądzem, krótki termin) nie wyznacza zmienności - zaokrąglenie do kroku
+    notowania odpowiada dużej zmianie zmienności - więc taki kontrakt zachowuje
+    zmienność modelu i nie trafia do dopasowania powierzchni (solved).
+    """
+
+    def __init__(self, symbol: str, series: PriceSeries, expirations: Optional[List[date]] = None,
+                 rate: float = RISK_FREE_RATE,
+                 volatility_model: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None):
+        if len(series) < 1:
+            raise ValueError(f"Brak danych cenowych dla symbolu {symbol}")
+        self.symbol = symbol.upper()
+        self.rate = rate
+        self.spot = float(series.close[-1])
+        self.as_of = datetime.combine(epoch_to_datetime(series.timestamp[-1]).date(), _EXPIRY_CLOSE)
+        self.expirations = expirations or option_expirations(self.as_of.date())
+        self.base_volatility = realized_volatility(series.close)
+
+        self.strikes = strike_grid(self.spot)
+        # Siatka kontraktów: termin x cena wykonania x typ (najpierw kupno)
+        grid = np.meshgrid(np.arange(len(self.expirations)), self.strikes, (True, False), indexing="ij")
+        self.expiry_index, self.strike, self.is_call = (axis.ravel() for axis in grid)
+        self.time = self.years_to(self.expirations)[self.expiry_index]
+        # Zmienność modelu: powierzchnia zmienności (cena wykonania, czas) lub uśmiech wokół zmienności historycznej
+        if volatility_model is not None:
+            self.volatility = np.asarray(volatility_model(self.strike, self.time), dtype=np.float64)
+        else:
+            self.volatility = smile_volatility(self.base_volatility, self.spot, self.strike)
+
+        model = black_scholes(self.spot, self.strike, self.time, rate, self.volatility, self.is_call)
+        self.last_price = np.round(model["price"] / PRICE_TICK) * PRICE_TICK
+
+        # Zmienność implikowana z kwotowań; kwotowania bez rozwiązania (np. 0.00 daleko poza
+        # pieniądzem) i niewyznaczające zmienności (vega w black_scholes - na 1 pkt proc.)
+        # zachowują zmienność modelu
+        solved = implied_volatility(self.last_price, self.spot, self.strike, self.time, rate, self.is_call)
+        self.solver_stats = solved.get_stats()
+        informative = model["vega"] * 100 * IV_RESOLUTION >= PRICE_TICK / 2
+        self.solved = solved.converged & informative
+        self.implied_volatility = np.where(self.solved, solved.volatility, self.volatility)
+        self.values = black_scholes(self.spot, self.strike, self.time, rate, self.implied_volatility, self.is_call)
+
+        # Zmiana kwotowania względem wyceny przy poprzednim zamknięciu (o sesję dłuższy czas do wygaśnięcia)
+        if len(series) > 1:
+            elapsed = (int(series.timestamp[-1]) - int(series.timestamp[-2])) / SECONDS_PER_YEAR
+            previous = black_scholes(float(series.close[-2]), self.strike, self.time + elapsed, rate,
+                                     self.volatility, self.is_call)["price"]
+            previous = np.round(previous / PRICE_TICK) * PRICE_TICK
+        else:
+            previous = self.last_price
+        self.change = self.last_price - previous
+        self.percent_change = np.divide(self.change * 100, previous,
+                                        out=np.zeros_like(previous), where=previous > 0)
+        self._synthetic_activity()
+
+    def years_to(self, expirations: List[date]) -> np.ndarray:
+        """Czas (w latach) od zamknięcia migawki do wygaśnięcia w podanych terminach."""
+        expiry_ts = np.array([datetime_to_epoch(datetime.combine(expiration, _EXPIRY_CLOSE))
+                              for expiration in expirations], dtype=np.int64)
+        return (expiry_ts - datetime_to_epoch(self.as_of)) / SECONDS_PER_YEAR
+
+    def _synthetic_activity(self) -> None:
+        """
+        Wolumen i liczba otwartych pozycji - źródło nie udostępnia danych o obrocie opcjami.
+
+        Wartości maleją z oddaleniem od ceny bazowej i są deterministyczne dla
+        migawki (generator inicjowany symbolem i datą), więc odpowiedzi można
+        zapisywać w pamięci podręcznej.
+        """
+        seed = zlib.crc32(f"{self.symbol}:{self.as_of.date().isoformat()}".encode())
+        rng = np.random.default_rng(seed)
+        closeness = np.exp(-np.square(np.log(self.strike / self.spot) / 0.1))
+        self.open_interest = np.round((500 + 9500 * closeness) * rng.uniform(0.7, 1.3, len(self.strike)))
+        self.volume = np.round(self.open_interest * rng.uniform(0.05, 0.5, len(self.strike)))
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    def select(self, expiration: Optional[date] = None, option_type: Optional[str] = None,
+               min_strike: Optional[float] = None, max_strike: Optional[float] = None) -> np.ndarray:
+        """Zwraca indeksy kontraktów spełniających filtry."""
+        mask = np.ones(len(self), dtype=bool)
+        if expiration is not None:
+            if expiration not in self.expirations:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.expiry_index == self.expirations.index(expiration)
+        if option_type in (CALL, PUT):
+            mask &= self.is_call == (option_type == CALL)
+        if min_strike is not None:
+            mask &= self.strike >= min_strike
+        if max_strike is not None:
+            mask &= self.strike <= max_strike
+        return np.flatnonzero(mask)
+
+    def find(self, expiration: date, strike: float, is_call: bool) -> Optional[int]:
+        """Zwraca indeks kontraktu lub None, gdy termin lub cena wykonania nie należą do łańcucha."""
+        if expiration not in self.expirations:
+            return None
+        # Kontrakty terminu zajmują ciągły blok: ceny wykonania (rosnąco) x typ
+        position = int(np.searchsorted(self.strikes, strike))
+        if position == len(self.strikes) or not math.isclose(self.strikes[position], strike):
+            return None
+        return (self.expirations.index(expiration) * len(self.strikes) + position) * 2 + (0 if is_call else 1)
+
+    def greeks(self, expiration: date, strike: float, is_call: bool,
+               price: Optional[float] = None, volatility: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Zwraca greki, zmienność implikowaną i cenę jednego kontraktu.
+
+        Kontrakt z łańcucha odczytywany jest z gotowych kolumn. Kontrakt spoza
+        siatki wyceniany jest dla tej samej migawki przy podanej zmienności
+        (np. z powierzchni zmienności; domyślnie z uśmiechu zmienności), a przy
+        podanej cenie rynkowej - przy zmienności implikowanej z tej ceny.
+
+        Raises:
+            ValueError: Cena poza granicami arbitrażowymi lub termin nie późniejszy niż migawka
+        """
+        index = self.find(expiration, strike, is_call) if price is None else None
+        if index is not None:
+            values = {name: float(column[index]) for name, column in self.values.items()}
+            volatility = float(self.implied_volatility[index])
+            price = float(self.last_price[index])
+        else:
+            time = float(self.years_to([expiration])[0])
+            if time <= 0:
+                raise ValueError(f"Termin wygaśnięcia {expiration.isoformat()} nie jest późniejszy "
+                                 f"niż ostatnia sesja ({self.as_of.date().isoformat()})")
+            if price is None and volatility is None:
+                volatility = float(smile_volatility(self.base_volatility, self.spot, np.float64(strike)))
+            elif price is not None:
+                solved = implied_volatility(price, self.spot, strike, time, self.rate, is_call)
+                if not solved.converged:
+                    raise ValueError(f"Cena {price} leży poza granicami arbitrażowymi kontraktu")
+                volatility = float(solved.volatility)
+            values = {name: float(value) for name, value in
+                      black_scholes(self.spot, strike, time, self.rate, volatility, is_call).items()}
+            price = round(price if price is not None else values["price"], 2)
+        return {
+            **{name: round(values[name], 4) for name in ("delta", "gamma", "theta", "vega", "rho")},
+            "impliedVolatility": round(volatility * 100, 2),
+            "price": price
+        }
+
+    def contracts(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Buduje opisy kontraktów (format API) dla podanych indeksów."""
+        columns = {name: np.round(values[indices], 4).tolist() for name, values in self.values.items()}
+        price = np.round(self.last_price[indices], 2)
+        strikes = self.strike[indices].tolist()
+        calls = self.is_call[indices].tolist()
+        expirations = [self.expirations[i] for i in self.expiry_index[indices].tolist()]
+        rows = zip(strikes, calls, expirations, price.tolist(),
+                   np.round(price * 0.95, 2).tolist(), np.round(price * 1.05, 2).tolist(),
+                   np.round(self.change[indices], 2).tolist(), np.round(self.percent_change[indices], 2).tolist(),
+                   self.volume[indices].astype(np.int64).tolist(), self.open_interest[indices].astype(np.int64).tolist(),
+                   np.round(self.implied_volatility[indices] * 100, 2).tolist(),
+                   columns["delta"], columns["gamma"], columns["theta"], columns["vega"], columns["rho"])
+        last_trade = self.as_of.strftime("%Y-%m-%d %H:%M:%S")
+        return [
+            {
+                "symbol": f"{self.symbol}{expiration:%y%m%d}{'C' if call else 'P'}{strike:g}",
+                "underlyingSymbol": self.symbol,
+                "expirationDate": expiration.isoformat(),
+                "strikePrice": strike,
+                "optionType": CALL if call else PUT,
+                "lastPrice": last,
+                "bid": bid,
+                "ask": ask,
+                "change": change,
+                "percentChange": percent,
+                "volume": volume,
+                "openInterest": open_interest,
+                "impliedVolatility": iv,
+                "inTheMoney": (self.spot > strike) if call else (self.spot < strike),
+                "lastTradeDate": last_trade,
+                "greeks": {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega, "rho": rho}
+            }
+            for (strike, call, expiration, last, bid, ask, change, percent, volume, open_interest, iv,
+                 delta, gamma, theta, vega, rho) in rows
+        ]
@@ -0,0 +1,180 @@
+import math
+from statistics import NormalDist
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from domain.services.black_scholes import norm_cdf
+
+# Poziomy ufności przedziałów w odpowiedzi
+CONFIDENCE_LEVELS = (0.68, 0.95, 0.99)
+
+# Liczba punktów rozkładu dyskretnego i pomijany ogon po każdej stronie
+DISTRIBUTION_POINTS = 20
+TAIL_PROBABILITY = 0.001
+
+_STANDARD_NORMAL = NormalDist()
+
+
+def lognormal_distribution(spot: float, drift: float, volatility: float, time: float,
+                           confidence_levels: Sequence[float] = CONFIDENCE_LEVELS,
+                           points: int = DISTRIBUTION_POINTS) -> Dict[str, Any]:
+    """
+    Rozkład ceny po czasie time przy geometrycznym ruchu Browna (wzory zamknięte).
+
+    ln(S_T) ma rozkład normalny o średniej ln(S) + (drift - volatility^2 / 2) * time
+    i wariancji volatility^2 * time.
+
+    Args:
+        spot: Bieżąca cena
+        drift: Roczny dryf (dla miary neutralnej względem ryzyka - stopa wolna od ryzyka)
+        volatility: Roczna zmienność (> 0)
+        time: Horyzont (w latach, > 0)
+        confidence_levels: Poziomy ufności przedziałów centralnych
+        points: Liczba punktów rozkładu dyskretnego
+
+    Returns:
+        Rozkład w formacie API (expectedValue, variance, skewness, kurtosis,
+        confidenceIntervals, discretePoints)
+    """
+    mu = math.log(spot) + (drift - 0.5 * volatility ** 2) * time
+    s = volatility * math.sqrt(time)
+    growth = math.exp(s * s)
+
+    # Przedziały centralne z kwantyli rozkładu normalnego ln(S_T)
+    intervals = []
+    for confidence in confidence_levels:
+        z = _STANDARD_NORMAL.inv_cdf(0.5 + confidence / 2)
+        intervals.append({
+            "lowerBound": round(math.exp(mu - z * s), 2),
+            "upperBound": round(math.exp(mu + z * s), 2),
+            "confidence": confidence
+        })
+
+    # Punkty dyskretne: środki równych przedziałów cen i prawdopodobieństwa z dystrybuanty
+    z_tail = _STANDARD_NORMAL.inv_cdf(1 - TAIL_PROBABILITY)
+    edges = np.linspace(math.exp(mu - z_tail * s), math.exp(mu + z_tail * s), points + 1)
+    cdf = norm_cdf((np.log(edges) - mu) / s)
+    probability = np.diff(cdf)
+    probability /= probability.sum()
+    centers = (edges[:-1] + edges[1:]) / 2
+
+    return _format(spot * math.exp(drift * time),
+                   spot ** 2 * math.exp(2 * drift * time) * (growth - 1),
+                   (growth + 2) * math.sqrt(growth - 1),
+                   growth ** 4 + 2 * growth ** 3 + 3 * growth ** 2 - 3,
+                   intervals, centers, probability)
+
+
+def sample_distribution(spot: float, log_returns: np.ndarray,
+                        confidence_levels: Sequence[float] = CONFIDENCE_LEVELS,
+                        points: int = DISTRIBUTION_POINTS) -> Dict[str, Any]:
+    """
+    Rozkład ceny z próby (np. symulacji Monte Carlo) logarytmicznych stóp zwrotu ln(S_T / S).
+
+    Momenty liczone są z cen końcowych, przedziały centralne i granice punktów
+    dyskretnych - z kwantyli próby (jedno wywołanie np.quantile), a
+    prawdopodobieństwa punktów - z histogramu.
+
+    Returns:
+        Rozkład w formacie API (jak lognormal_distribution) uzupełniony o błąd
+        standardowy wartości oczekiwanej (standardError)
+    """
+    prices = spot * np.exp(log_returns)
+    mean = float(prices.mean())
+    deviation = prices - mean
+    squared = deviation * deviation
+    variance = float(squared.mean())
+    skewness = float((squared * deviation).mean()) / variance ** 1.5 if variance > 0 else 0.0
+    kurtosis = float((squared * squared).mean()) / variance ** 2 if variance > 0 else 0.0
+
+    levels = [probability for confidence in confidence_levels
+              for probability in (0.5 - confidence / 2, 0.5 + confidence / 2)]
+    quantiles = spot * np.exp(np.quantile(log_returns, levels + [TAIL_PROBABILITY, 1 - TAIL_PROBABILITY]))
+    intervals = [
+        {
+            "lowerBound": round(float(quantiles[2 * i]), 2),
+            "upperBound": round(float(quantiles[2 * i + 1]), 2),
+            "confidence": confidence
+        }
+        for i, confidence in enumerate(confidence_levels)
+    ]
+
+    edges = np.linspace(quantiles[-2], quantiles[-1], points + 1)
+    counts, _ = np.histogram(prices, edges)
+    probability = counts / max(counts.sum(), 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+
+    distribution = _format(mean, variance, skewness, kurtosis, intervals, centers, probability)
+    distribution["standardError"] = round(math.sqrt(variance / len(prices)), 4)
+    return distribution
+
+
+def grid_distribution(spot: float, log_returns: np.ndarray, mass: np.ndarray,
+                      confidence_levels: Sequence[float] = CONFIDENCE_LEVELS,
+                      points: int = DISTRIBUTION_POINTS) -> Dict[str, Any]:
+    """
+    Rozkład ceny z mas prawdopodobieństwa w węzłach siatki logarytmicznych stóp zwrotu.
+
+    Momenty liczone są jako sumy ważone masami, a kwantyle (przedziały
+    centralne, granice punktów dyskretnych) - z dystrybuanty interpolowanej
+    liniowo między węzłami.
+
+    Args:
+        spot: Bieżąca cena
+        log_returns: Rosnące węzły siatki ln(S_T / S)
+        mass: Masy prawdopodobieństwa węzłów (suma 1)
+
+    Returns:
+        Rozkład w formacie API (jak lognormal_distribution)
+    """
+    prices = spot * np.exp(log_returns)
+    mean = float(mass @ prices)
+    deviation = prices - mean
+    squared = deviation * deviation
+    variance = float(mass @ squared)
+    skewness = float(mass @ (squared * deviation)) / variance ** 1.5 if variance > 0 else 0.0
+    kurtosis = float(mass @ (squared * squared)) / variance ** 2 if variance > 0 else 0.0
+
+    # Dystrybuanta w środkach węzłów (masa węzła rozłożona symetrycznie)
+    cdf = np.cumsum(mass) - 0.5 * mass
+    levels = [probability for confidence in confidence_levels
+              for probability in (0.5 - confidence / 2, 0.5 + confidence / 2)]
+    quantiles = spot * np.exp(np.interp(levels + [TAIL_PROBABILITY, 1 - TAIL_PROBABILITY], cdf, log_returns))
+    intervals = [
+        {
+            "lowerBound": round(float(quantiles[2 * i]), 2),
+            "upperBound": round(float(quantiles[2 * i + 1]), 2),
+            "confidence": confidence
+        }
+        for i, confidence in enumerate(confidence_levels)
+    ]
+
+    edges = np.linspace(quantiles[-2], quantiles[-1], points + 1)
+    probability = np.diff(np.interp(np.log(edges / spot), log_returns, cdf))
+    probability /= probability.sum()
+    centers = (edges[:-1] + edges[1:]) / 2
+
+    return _format(mean, variance, skewness, kurtosis, intervals, centers, probability)
+
+
+def grid_probability_above(spot: float, log_returns: np.ndarray, mass: np.ndarray, price: float) -> float:
+    """Prawdopodobieństwo, że cena końcowa przekroczy price (rozkład jak w grid_distribution)."""
+    cdf = np.cumsum(mass) - 0.5 * mass
+    return float(1.0 - np.interp(math.log(price / spot), log_returns, cdf, left=0.0, right=1.0))
+
+
+def _format(expected: float, variance: float, skewness: float, kurtosis: float,
+            intervals: List[Dict[str, Any]], centers: np.ndarray, probability: np.ndarray) -> Dict[str, Any]:
+    return {
+        "expectedValue": round(expected, 2),
+        "variance": round(variance, 4),
+        "skewness": round(skewness, 4),
+        # Kurtoza (nie nadwyżkowa - dla rozkładu normalnego 3)
+        "kurtosis": round(kurtosis, 4),
+        "confidenceIntervals": intervals,
+        "discretePoints": [
+            {"value": round(value, 2), "probability": round(p, 4)}
+            for value, p in zip(centers.tolist(), probability.tolist())
+        ]
+    }
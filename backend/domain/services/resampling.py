@@ -0,0 +1,103 @@
+import re
+from typing import List, Optional
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries
+from domain.services.market_calendar import MarketCalendar
+
+DAY = 86400
+
+# Interwały śróddzienne dostępne w Alpha Vantage (minuty)
+INTRADAY_MINUTES = (1, 5, 15, 30, 60)
+
+# Początek sesji w minutach od północy czasu giełdy (9:30)
+SESSION_OPEN_MINUTE = MarketCalendar.SESSION_OPEN.hour * 60 + MarketCalendar.SESSION_OPEN.minute
+
+
+def intraday_minutes(interval: str) -> Optional[int]:
+    """Zwraca szerokość świecy śróddziennej w minutach ("intraday_5min" -> 5) lub None."""
+    match = re.fullmatch(r"intraday_(\d+)min", interval)
+    return int(match.group(1)) if match else None
+
+
+def can_resample(source: str, target: str) -> bool:
+    """Sprawdza, czy szereg o interwale target można zbudować ze świec interwału source."""
+    if target in ("weekly", "monthly"):
+        return source == "daily"
+    source_minutes, target_minutes = intraday_minutes(source), intraday_minutes(target)
+    return (source_minutes is not None and target_minutes is not None
+            and source_minutes < target_minutes and target_minutes % source_minutes == 0)
+
+
+def resample_sources(target: str) -> List[str]:
+    """Zwraca interwały, z których można zbudować target - od najgrubszego (najmniej świec do scalenia)."""
+    candidates = ["daily"] + [f"intraday_{minutes}min" for minutes in reversed(INTRADAY_MINUTES)]
+    return [source for source in candidates if can_resample(source, target)]
+
+
+def aggregate(series: PriceSeries, starts: np.ndarray, timestamps: np.ndarray) -> PriceSeries:
+    """
+    Scala kolejne grupy świec (grupa zaczyna się w indeksie z starts) w pojedyncze świece.
+
+    Otwarcie pochodzi z pierwszej świecy grupy, zamknięcie z ostatniej,
+    maksimum i minimum z całej grupy, a wolumen jest sumą. Grupy liczone są
+    wektorowo (ufunc.reduceat), bez pętli po świecach.
+    """
+    stops = np.append(starts[1:], len(series))
+    return PriceSeries(
+        timestamps,
+        series.open[starts],
+        np.maximum.reduceat(series.high, starts),
+        np.minimum.reduceat(series.low, starts),
+        series.close[stops - 1],
+        np.add.reduceat(series.volume, starts)
+    )
+
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """Zwraca indeksy początków grup kolejnych równych kluczy."""
+    return np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+
+
+def resample(series: PriceSeries, target: str) -> PriceSeries:
+    """
+    Buduje szereg o grubszym interwale (rosnąco po czasie).
+
+    Znaczniki czasu są w czasie giełdy, więc granice sesji i dni nie zależą
+    od zmiany czasu. Świece śróddzienne grupowane są w kubełki w obrębie
+    dnia - kubełek nigdy nie łączy dwóch dni, a jego czasem jest początek
+    kubełka. Kubełki o szerokości dzielącej godzinę otwarcia sesji (9:30 -
+    1, 5, 15, 30 min) liczone są od otwarcia sesji, szersze (60 min) - od
+    pełnej godziny, tak jak świece godzinowe pobierane z Alpha Vantage
+    (9:00, 10:00, ..., a nie 9:30, 10:30). Świece
+    tygodniowe (od poniedziałku) i miesięczne mają - również jak w Alpha
+    Vantage - datę ostatniego dnia sesyjnego w okresie.
+
+    Args:
+        series: Szereg źródłowy (dzienny dla weekly/monthly, śróddzienny dla intraday_*)
+        target: Interwał docelowy ("intraday_60min", "weekly", "monthly", ...)
+    """
+    if not len(series):
+        return series
+    timestamps = series.timestamp
+
+    if target in ("weekly", "monthly"):
+        if target == "weekly":
+            # 1970-01-01 był czwartkiem - przesunięcie o 3 dni daje tygodnie od poniedziałku
+            keys = (timestamps // DAY + 3) // 7
+        else:
+            keys = timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+        starts = _group_starts(keys)
+        last = np.append(starts[1:], len(series)) - 1
+        return aggregate(series, starts, timestamps[last])
+
+    minutes = intraday_minutes(target)
+    if minutes is None:
+        raise ValueError(f"Nie można zbudować interwału {target} z mniejszych świec")
+    minute = timestamps // 60
+    day_start = minute - minute % 1440
+    origin = day_start + SESSION_OPEN_MINUTE if SESSION_OPEN_MINUTE % minutes == 0 else day_start
+    labels = (origin + (minute - origin) // minutes * minutes) * 60
+    starts = _group_starts(labels)
+    return aggregate(series, starts, labels[starts])
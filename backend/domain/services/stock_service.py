@@ -1,15 +1,19 @@
+import asyncio
 from typing import List, Optional
 from datetime import datetime
 
 from domain.entities.stock_data import StockData, StockMetadata
+from domain.repositories.async_stock_repository import AsyncStockRepository
 from domain.repositories.stock_repository import StockRepository
 
 
 class StockService:
     """Usługa domenowa do obsługi danych giełdowych."""
     
-    def __init__(self, stock_repository: StockRepository):
+    def __init__(self, stock_repository: StockRepository,
+                 async_repository: Optional[AsyncStockRepository] = None):
         self.repository = stock_repository
+        self.async_repository = async_repository
     
     def search_stocks(self, query: str) -> List[StockMetadata]:
         """Wyszukuje instrumenty giełdowe na podstawie zapytania."""
@@ -33,33 +37,63 @@ class StockService:
         print(f"[DEBUG][DomainService] get_stock_data - symbol: {symbol}, interval: {interval}, start_date: {start_date}, end_date: {end_date}")
         
         try:
-            if interval == "daily":
-                print(f"[DEBUG][DomainService] Pobieranie danych dziennych dla {symbol}")
-                data = self.repository.get_daily_data(symbol, start_date, end_date)
-            elif interval == "weekly":
-                print(f"[DEBUG][DomainService] Pobieranie danych tygodniowych dla {symbol}")
-                data = self.repository.get_weekly_data(symbol)
-            elif interval == "monthly":
-                print(f"[DEBUG][DomainService] Pobieranie danych miesięcznych dla {symbol}")
-                data = self.repository.get_monthly_data(symbol)
-            elif interval.startswith("intraday"):
-                # format: intraday_1min, intraday_5min, intraday_15min, intraday_30min, intraday_60min
-                intraday_interval = interval.split("_")[1] if "_" in interval else "5min"
-                print(f"[DEBUG][DomainService] Pobieranie danych intraday ({intraday_interval}) dla {symbol}")
-                data = self.repository.get_intraday_data(symbol, intraday_interval)
-            else:
-                error_msg = f"Nieobsługiwany interwał: {interval}"
-                print(f"[ERROR][DomainService] {error_msg}")
-                raise ValueError(error_msg)
-            
-            if data:
-                print(f"[DEBUG][DomainService] Pobrano dane dla {symbol} - punktów: {len(data.prices)}, ostatnie odświeżenie: {data.last_refreshed}")
-            else:
-                print(f"[WARNING][DomainService] Nie pobrano danych dla {symbol} - null response")
-            
-            return data
+            data = self._request_data(self.repository, symbol, interval, start_date, end_date)
+            return self._log_result(symbol, data)
         except Exception as e:
-            import traceback
-            print(f"[ERROR][DomainService] Błąd podczas pobierania danych dla {symbol}: {str(e)}")
-            print(f"[ERROR][DomainService] Szczegóły: {traceback.format_exc()}")
-            raise 
\ No newline at end of file
+            self._log_error(symbol, e)
+            raise
+    
+    async def get_stock_data_async(self, symbol: str, interval: str = "daily", 
+                                   start_date: Optional[datetime] = None,
+                                   end_date: Optional[datetime] = None) -> StockData:
+        """
+        Asynchroniczny odpowiednik get_stock_data.
+        
+        Korzysta z repozytorium asynchronicznego, a jeśli go nie skonfigurowano -
+        z synchronicznego, wykonywanego w puli wątków.
+        """
+        print(f"[DEBUG][DomainService] get_stock_data_async - symbol: {symbol}, interval: {interval}, start_date: {start_date}, end_date: {end_date}")
+        
+        if self.async_repository is None:
+            return await asyncio.to_thread(self.get_stock_data, symbol, interval, start_date, end_date)
+        
+        try:
+            data = await self._request_data(self.async_repository, symbol, interval, start_date, end_date)
+            return self._log_result(symbol, data)
+        except Exception as e:
+            self._log_error(symbol, e)
+            raise
+    
+    def _request_data(self, repository, symbol: str, interval: str,
+                      start_date: Optional[datetime], end_date: Optional[datetime]):
+        """Wybiera metodę repozytorium dla interwału (wynik lub korutyna - zależnie od repozytorium)."""
+        if interval == "daily":
+            print(f"[DEBUG][DomainService] Pobieranie danych dziennych dla {symbol}")
+            return repository.get_daily_data(symbol, start_date, end_date)
+        elif interval == "weekly":
+            print(f"[DEBUG][DomainService] Pobieranie danych tygodniowych dla {symbol}")
+            return repository.get_weekly_data(symbol, start_date, end_date)
+        elif interval == "monthly":
+            print(f"[DEBUG][DomainService] Pobieranie danych miesięcznych dla {symbol}")
+            return repository.get_monthly_data(symbol, start_date, end_date)
+        elif interval.startswith("intraday"):
+            # format: intraday_1min, intraday_5min, intraday_15min, intraday_30min, intraday_60min
+            intraday_interval = interval.split("_")[1] if "_" in interval else "5min"
+            print(f"[DEBUG][DomainService] Pobieranie danych intraday ({intraday_interval}) dla {symbol}")
+            return repository.get_intraday_data(symbol, intraday_interval, start_date, end_date)
+        else:
+            error_msg = f"Nieobsługiwany interwał: {interval}"
+            print(f"[ERROR][DomainService] {error_msg}")
+            raise ValueError(error_msg)
+    
+    def _log_result(self, symbol: str, data: StockData) -> StockData:
+        if data:
+            print(f"[DEBUG][DomainService] Pobrano dane dla {symbol} - punktów: {len(data.prices)}, ostatnie odświeżenie: {data.last_refreshed}")
+        else:
+            print(f"[WARNING][DomainService] Nie pobrano danych dla {symbol} - null response")
+        return data
+    
+    def _log_error(self, symbol: str, error: Exception) -> None:
+        import traceback
+        print(f"[ERROR][DomainService] Błąd podczas pobierania danych dla {symbol}: {str(error)}")
+        print(f"[ERROR][DomainService] Szczegóły: {traceback.format_exc()}")
\ No newline at end of file
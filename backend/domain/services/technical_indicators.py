@@ -0,0 +1,396 @@
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from domain.services.downsampling import lttb_indices
+
+
+class Indicator:
+    """
+    Opis wskaźnika w rejestrze.
+
+    Funkcja obliczająca przyjmuje kolumny cen (close, high, low) rosnąco po
+    czasie, parametry i opcjonalnie poprzedni wynik dla początku szeregu,
+    a zwraca słownik nazwa wyjścia -> tablica tej samej długości co dane
+    wejściowe, z NaN tam, gdzie wskaźnik nie jest jeszcze określony.
+    Wskaźniki z jednym wyjściem ("value") zwracane są jako lista punktów,
+    pozostałe - jako słownik list punktów.
+    """
+
+    def __init__(self, name: str, compute: Callable[..., Dict[str, np.ndarray]],
+                 defaults: Dict[str, Any], outputs: Tuple[str, ...] = ("value",)):
+        self.name = name
+        self.compute = compute
+        self.defaults = defaults
+        self.outputs = outputs
+
+    @property
+    def single_output(self) -> bool:
+        return self.outputs == ("value",)
+
+    def parse_params(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Uzupełnia parametry wartościami domyślnymi i rzutuje je na typy wartości domyślnych.
+
+        Raises:
+            ValueError: Gdy parametr nie jest skończoną liczbą lub okres (parametr *period) jest mniejszy niż 1
+        """
+        params = {}
+        for key, default in self.defaults.items():
+            try:
+                value = type(default)(raw[key]) if key in raw else default
+            except (TypeError, OverflowError):
+                raise ValueError(f"Parametr {key} wskaźnika {self.name} musi być liczbą skończoną")
+            if not math.isfinite(value):
+                raise ValueError(f"Parametr {key} wskaźnika {self.name} musi być liczbą skończoną")
+            if key.lower().endswith("period") and value < 1:
+                raise ValueError(f"Parametr {key} wskaźnika {self.name} musi być nie mniejszy niż 1")
+            params[key] = value
+        return params
+
+
+INDICATORS: Dict[str, Indicator] = {}
+
+
+def register(name: str, defaults: Dict[str, Any], outputs: Tuple[str, ...] = ("value",)):
+    """Dekorator dodający funkcję obliczającą do rejestru wskaźników."""
+    def decorator(compute):
+        INDICATORS[name] = Indicator(name, compute, defaults, outputs)
+        return compute
+    return decorator
+
+
+def get_indicator(name: str) -> Optional[Indicator]:
+    return INDICATORS.get(name)
+
+
+def parse_spec(spec: str) -> Tuple[Indicator, Dict[str, Any]]:
+    """
+    Parsuje specyfikację wskaźnika w postaci "nazwa:parametr/parametr/...".
+
+    Parametry podawane są pozycyjnie, w kolejności parametrów domyślnych
+    wskaźnika (np. "macd:12/26/9", "bb:20/2", "rsi"); brakujące uzupełniane
+    są wartościami domyślnymi.
+
+    Raises:
+        ValueError: Gdy wskaźnik nie istnieje lub parametry są nieprawidłowe
+    """
+    name, _, args = spec.strip().partition(":")
+    indicator = get_indicator(name.strip().lower())
+    if indicator is None:
+        raise ValueError(f"Nieznany wskaźnik: {name}")
+
+    values = [value.strip() for value in args.split("/")] if args else []
+    if len(values) > len(indicator.defaults):
+        raise ValueError(f"Za dużo parametrów wskaźnika: {spec}")
+    try:
+        raw = {key: float(value) for key, value in zip(indicator.defaults, values)}
+        return indicator, indicator.parse_params(raw)
+    except ValueError as e:
+        raise ValueError(f"Nieprawidłowe parametry wskaźnika: {spec} ({e})")
+
+
+def compute_indicator(name: str, columns: Dict[str, np.ndarray],
+                      params: Optional[Dict[str, Any]] = None,
+                      previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    Oblicza wskaźnik z rejestru.
+
+    Args:
+        name: Nazwa wskaźnika ("sma", "ema", "macd", "rsi", "bb", "atr")
+        columns: Kolumny cen ("close", "high", "low") rosnąco po czasie
+        params: Parametry wskaźnika (brakujące uzupełniane są domyślnymi)
+        previous: Wynik dla początkowych świec tego samego szeregu - liczone
+            są wtedy tylko świece dopisane na końcu
+
+    Raises:
+        ValueError: Gdy wskaźnik nie istnieje w rejestrze
+    """
+    indicator = get_indicator(name)
+    if indicator is None:
+        raise ValueError(f"Nieznany wskaźnik: {name}")
+    return indicator.compute(columns, previous=previous, **indicator.parse_params(params or {}))
+
+
+def to_points(timestamps: List[str], values: np.ndarray,
+              max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Zamienia kolumnę wartości na punkty {timestamp, value}, pomijając okres rozruchu (NaN).
+
+    Okres rozruchu leży na jednym końcu kolumny (zależnie od kolejności świec).
+    Przy podanym max_points liczba punktów zmniejszana jest metodą LTTB.
+    """
+    defined = np.flatnonzero(~np.isnan(values))
+    if not len(defined):
+        return []
+    start, stop = int(defined[0]), int(defined[-1]) + 1
+    if max_points is not None and stop - start > max_points:
+        indices = lttb_indices(values[start:stop], max_points) + start
+        return [
+            {"timestamp": timestamps[index], "value": value}
+            for index, value in zip(indices.tolist(), values[indices].tolist())
+        ]
+    return [
+        {"timestamp": timestamp, "value": value}
+        for timestamp, value in zip(timestamps[start:stop], values[start:stop].tolist())
+    ]
+
+
+def format_result(indicator: Indicator, timestamps: List[str],
+                  result: Dict[str, np.ndarray], max_points: Optional[int] = None):
+    """Formatuje wynik wskaźnika w postaci oczekiwanej przez frontend."""
+    if indicator.single_output:
+        return to_points(timestamps, result["value"], max_points)
+    return {output: to_points(timestamps, result[output], max_points) for output in indicator.outputs}
+
+
+# Bloki obliczeniowe - O(n), bez odwołań do słowników dla pojedynczych świec.
+#
+# Każdy blok może kontynuować poprzedni wynik (previous - wartości dla
+# początkowych świec tego samego szeregu): przeliczane są wtedy tylko
+# świece dopisane na końcu, a rekurencje startują z ostatniej zapisanej
+# wartości zamiast od początku historii.
+
+def _empty(size: int) -> np.ndarray:
+    return np.full(size, np.nan)
+
+
+def _previous(previous: Optional[Dict[str, np.ndarray]], output: str) -> Optional[np.ndarray]:
+    return previous.get(output) if previous else None
+
+
+def _resume(result: np.ndarray, previous: Optional[np.ndarray]) -> int:
+    """Przepisuje poprzedni wynik do tablicy wynikowej i zwraca liczbę przejętych punktów."""
+    if previous is None:
+        return 0
+    done = min(len(previous), len(result))
+    result[:done] = previous[:done]
+    return done
+
+
+# Długość bloku, w którym liczone są sumy prefiksowe - błąd zaokrągleń sum
+# zależy od wartości w bloku, a nie od całej historii
+PREFIX_BLOCK = 4096
+
+# Największy wykładnik a^-k w bloku rekurencji liniowej - e^RECURRENCE_EXPONENT
+# mieści się w zakresie float64 z dużym zapasem
+RECURRENCE_EXPONENT = 500.0
+
+
+def _window_blocks(values: np.ndarray, period: int, first: int):
+    """
+    Dzieli szereg na bloki okien: (start, stop, sumy, sumy kwadratów).
+
+    Sumy dotyczą okien kończących się na indeksach [start, stop) i liczone
+    są z sum prefiksowych wartości pomniejszonych o pierwszą wartość bloku.
+    Granice bloków nie zależą od długości szeregu, więc wynik dla danej
+    świecy jest identyczny przy pełnym przeliczeniu i przy kontynuacji
+    (od bloku zawierającego indeks first).
+    """
+    origin = period - 1
+    block_start = origin + max(first - origin, 0) // PREFIX_BLOCK * PREFIX_BLOCK
+    for start in range(block_start, len(values), PREFIX_BLOCK):
+        stop = min(start + PREFIX_BLOCK, len(values))
+        chunk = values[start - period + 1:stop]
+        centered = chunk - chunk[0]
+        sums = np.concatenate(([0.0], np.cumsum(centered)))
+        squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        yield start, stop, sums[period:] - sums[:-period], squares[period:] - squares[:-period], chunk[0]
+
+
+def rolling_mean(values: np.ndarray, period: int, previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Średnia krocząca z sum prefiksowych - O(n) niezależnie od długości okna."""
+    result = _empty(len(values))
+    done = _resume(result, previous)
+    if period <= 0 or len(values) < period:
+        return result
+    for start, stop, window_sum, _, shift in _window_blocks(values, period, done):
+        first = max(start, done)
+        result[first:stop] = window_sum[first - start:] / period + shift
+    return result
+
+
+def rolling_std(values: np.ndarray, period: int, previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Odchylenie standardowe populacji w oknie - z sum prefiksowych wartości i ich kwadratów."""
+    result = _empty(len(values))
+    done = _resume(result, previous)
+    if period <= 0 or len(values) < period:
+        return result
+    for start, stop, window_sum, window_squares, _ in _window_blocks(values, period, done):
+        first = max(start, done) - start
+        window_sum, window_squares = window_sum[first:], window_squares[first:]
+        variance = (window_squares - window_sum * window_sum / period) / period
+        result[start + first:stop] = np.sqrt(np.maximum(variance, 0.0))
+    return result
+
+
+def _recurrence_block(decay: float) -> int:
+    """Długość bloku rekurencji o współczynniku decay (nie dłuższa niż PREFIX_BLOCK)."""
+    if decay <= 0.0:
+        return PREFIX_BLOCK
+    return max(1, min(PREFIX_BLOCK, int(RECURRENCE_EXPONENT / -np.log(decay))))
+
+
+def _recurrence(values: np.ndarray, period: int, offset: int, previous: Optional[np.ndarray],
+                decay: float) -> np.ndarray:
+    """
+    Rekurencja y_t = decay * y_(t-1) + (1 - decay) * x_t zainicjowana średnią prostą
+    z `period` wartości od indeksu offset.
+
+    W bloku wartości liczone są wzorem zamkniętym (a = decay, y_s - stan przed blokiem)
+    y_(s+k) = y_s + (1 - a) * a^k * sum_(i<=k) a^-i * (x_(s+i) - y_s),
+    czyli jedną sumą skumulowaną - pętla idzie tylko po blokach. Długość bloku
+    ogranicza zakres a^-k (bez przepełnienia), a granice bloków liczone są od
+    końca inicjalizacji, więc kontynuacja (previous) startuje od początku bloku
+    zawierającego pierwszą nową świecę i daje wynik identyczny z pełnym
+    przeliczeniem.
+    """
+    result = _empty(len(values))
+    if period <= 0 or len(values) - offset < period:
+        return result
+    seed_end = offset + period
+    block = _recurrence_block(decay)
+    if previous is not None and len(previous) >= seed_end:
+        done = _resume(result, previous)
+        done = seed_end + (done - seed_end) // block * block
+    else:
+        done = seed_end
+        result[seed_end - 1] = float(values[offset:seed_end].sum()) / period
+    if decay <= 0.0:
+        result[done:] = values[done:]
+        return result
+
+    exponents = np.arange(1, block + 1)
+    powers = decay ** exponents
+    inverse = decay ** -exponents.astype(np.float64)
+    weight = 1.0 - decay
+    for start in range(done, len(values), block):
+        size = min(block, len(values) - start)
+        # Rekurencja dla odchyleń od stanu początkowego bloku (mniejsze sumy - mniejszy błąd zaokrągleń)
+        state = result[start - 1]
+        weighted = np.cumsum((values[start:start + size] - state) * inverse[:size])
+        result[start:start + size] = state + powers[:size] * weight * weighted
+    return result
+
+
+def exponential_average(values: np.ndarray, period: int, offset: int = 0,
+                        previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """EMA zainicjowana średnią prostą."""
+    return _recurrence(values, period, offset, previous, 1.0 - 2 / (period + 1))
+
+
+def wilder_average(values: np.ndarray, period: int, offset: int = 0,
+                   previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Średnia wygładzona Wildera (RSI, ATR) zainicjowana średnią prostą."""
+    return _recurrence(values, period, offset, previous, (period - 1) / period)
+
+
+def _shifted(previous: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Poprzedni wynik wyrównany do zmian cen (zmiana i-ta dotyczy świecy i+1)."""
+    return None if previous is None else previous[1:]
+
+
+def _aligned_to_bars(values: np.ndarray) -> np.ndarray:
+    return np.concatenate(([np.nan], values))
+
+
+# Wskaźniki. Wyjścia z nazwą zaczynającą się od "_" to stan pośredni
+# potrzebny do kontynuacji obliczeń - nie trafiają do odpowiedzi.
+
+@register("sma", {"period": 14})
+def sma(columns: Dict[str, np.ndarray], period: int,
+        previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """SMA (Simple Moving Average)."""
+    return {"value": rolling_mean(columns["close"], period, _previous(previous, "value"))}
+
+
+@register("ema", {"period": 14})
+def ema(columns: Dict[str, np.ndarray], period: int,
+        previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """EMA (Exponential Moving Average)."""
+    return {"value": exponential_average(columns["close"], period, previous=_previous(previous, "value"))}
+
+
+@register("macd", {"fastPeriod": 12, "slowPeriod": 26, "signalPeriod": 9},
+          outputs=("macdLine", "signalLine", "histogram"))
+def macd(columns: Dict[str, np.ndarray], fastPeriod: int, slowPeriod: int, signalPeriod: int,
+         previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    MACD (Moving Average Convergence Divergence).
+
+    Wszystkie trzy linie zaczynają się od pierwszego punktu linii sygnału.
+    """
+    close = columns["close"]
+    size = len(close)
+    if size < slowPeriod + signalPeriod:
+        return {"macdLine": _empty(size), "signalLine": _empty(size), "histogram": _empty(size)}
+
+    fast_ema = exponential_average(close, fastPeriod, previous=_previous(previous, "_fastEma"))
+    slow_ema = exponential_average(close, slowPeriod, previous=_previous(previous, "_slowEma"))
+    macd_line = fast_ema - slow_ema
+    signal_line = exponential_average(macd_line, signalPeriod, offset=slowPeriod - 1,
+                                      previous=_previous(previous, "signalLine"))
+    histogram = macd_line - signal_line
+    macd_line[:slowPeriod + signalPeriod - 2] = np.nan
+    return {
+        "macdLine": macd_line,
+        "signalLine": signal_line,
+        "histogram": histogram,
+        "_fastEma": fast_ema,
+        "_slowEma": slow_ema
+    }
+
+
+@register("rsi", {"period": 14})
+def rsi(columns: Dict[str, np.ndarray], period: int,
+        previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """RSI (Relative Strength Index) ze średnimi Wildera."""
+    close = columns["close"]
+    result = _empty(len(close))
+    if len(close) <= period:
+        return {"value": result}
+
+    changes = np.diff(close)
+    avg_gain = _aligned_to_bars(wilder_average(
+        np.maximum(changes, 0.0), period, previous=_shifted(_previous(previous, "_avgGain"))
+    ))
+    avg_loss = _aligned_to_bars(wilder_average(
+        np.maximum(-changes, 0.0), period, previous=_shifted(_previous(previous, "_avgLoss"))
+    ))
+
+    # Wartości RSI liczone są tylko dla świec spoza poprzedniego wyniku
+    start = max(_resume(result, _previous(previous, "value")), period)
+    gain, loss = avg_gain[start:], avg_loss[start:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[start:] = np.where(loss == 0, 100.0, 100 - (100 / (1 + gain / loss)))
+    return {"value": result, "_avgGain": avg_gain, "_avgLoss": avg_loss}
+
+
+@register("bb", {"period": 20, "stdDev": 2.0}, outputs=("upperBand", "middleBand", "lowerBand"))
+def bollinger_bands(columns: Dict[str, np.ndarray], period: int, stdDev: float,
+                    previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """Wstęgi Bollingera - średnia krocząca i odchylenie standardowe w tym samym oknie."""
+    close = columns["close"]
+    middle = rolling_mean(close, period, _previous(previous, "middleBand"))
+    std = rolling_std(close, period, _previous(previous, "_std"))
+    width = stdDev * std
+    return {"upperBand": middle + width, "middleBand": middle, "lowerBand": middle - width, "_std": std}
+
+
+@register("atr", {"period": 14})
+def atr(columns: Dict[str, np.ndarray], period: int,
+        previous: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """ATR (Average True Range) ze średnią Wildera."""
+    high, low, close = columns["high"], columns["low"], columns["close"]
+    if len(close) <= period:
+        return {"value": _empty(len(close))}
+
+    previous_close = close[:-1]
+    true_range = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - previous_close),
+        np.abs(low[1:] - previous_close),
+    ])
+    average = wilder_average(true_range, period, previous=_shifted(_previous(previous, "value")))
+    return {"value": _aligned_to_bars(average)}
@@ -0,0 +1,215 @@
+import bisect
+import math
+import time as timer
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Parametry SVI w kolejności kolumn: a, b, rho, m, sigma
+SVI_PARAMETERS = ("a", "b", "rho", "m", "sigma")
+
+# Siatka poszukiwań (m, sigma) i liczba kolejnych zagęszczeń wokół najlepszego punktu
+GRID_SIZE = 15
+REFINEMENTS = 3
+MIN_SVI_SIGMA = 1e-3
+MAX_SVI_SIGMA = 2.0
+
+# Najmniejsza liczba kwotowań potrzebna do dopasowania przekroju (pięć parametrów)
+MIN_SLICE_POINTS = 5
+
+
+def svi_total_variance(params: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """
+    Całkowita wariancja w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2)).
+
+    params ma kształt (..., 5) i jest rozgłaszany z k (log-moneyness względem forwardu).
+    """
+    a, b, rho, m, sigma = (params[..., i] for i in range(5))
+    shifted = k - m
+    return a + b * (rho * shifted + np.sqrt(shifted * shifted + sigma * sigma))
+
+
+def _fit_grid(k: np.ndarray, w: np.ndarray, m: np.ndarray, sigma: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dla każdej pary (m, sigma) dobiera (a, b, rho) metodą najmniejszych kwadratów.
+
+    Przy ustalonych m i sigma model jest liniowy względem (a, b * rho, b)
+    (metoda quasi-jawna), więc wszystkie kandydaty rozwiązywane są jednym
+    wsadowym układem równań normalnych 3x3. Rozwiązania łamiące warunki
+    SVI (b >= 0, |rho| < 1, nieujemna wariancja minimalna) są odrzucane.
+
+    Returns:
+        Parametry kandydatów (C, 5) i ich sumy kwadratów błędów (C,)
+    """
+    shifted = k[None, :] - m[:, None]
+    design = np.stack([np.ones_like(shifted), shifted,
+                       np.sqrt(shifted * shifted + sigma[:, None] ** 2)], axis=-1)
+    normal = np.einsum("cni,cnj->cij", design, design)
+    rhs = np.einsum("cni,n->ci", design, w)
+    # Niewielka regularyzacja - przy bardzo małym sigma kolumny są niemal współliniowe
+    normal += np.eye(3) * 1e-12
+    beta = np.linalg.solve(normal, rhs[..., None])[..., 0]
+
+    a, b = beta[:, 0], beta[:, 2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = np.where(b > 0, beta[:, 1] / b, 0.0)
+    params = np.stack([a, b, rho, m, sigma], axis=-1)
+    valid = (b >= 0) & (np.abs(rho) < 1.0) & (a + b * sigma * np.sqrt(np.clip(1.0 - rho * rho, 0.0, None)) >= 0)
+    residual = np.einsum("cni,ci->cn", design, beta) - w[None, :]
+    sse = np.where(valid, np.sum(residual * residual, axis=1), np.inf)
+    return params, sse
+
+
+def fit_svi_slice(k: np.ndarray, w: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Dopasowuje parametry SVI jednego przekroju (termin wygaśnięcia).
+
+    Args:
+        k: Log-moneyness ln(K / F)
+        w: Całkowita wariancja implikowana (sigma_iv^2 * T)
+
+    Returns:
+        Parametry (a, b, rho, m, sigma) i błąd średniokwadratowy dopasowania w
+    """
+    m_low, m_high = float(k.min()), float(k.max())
+    sigma_low, sigma_high = np.log(MIN_SVI_SIGMA), np.log(MAX_SVI_SIGMA)
+    best, best_sse = None, np.inf
+    for _ in range(REFINEMENTS + 1):
+        m_axis = np.linspace(m_low, m_high, GRID_SIZE)
+        sigma_axis = np.exp(np.linspace(sigma_low, sigma_high, GRID_SIZE))
+        m, sigma = (axis.ravel() for axis in np.meshgrid(m_axis, sigma_axis, indexing="ij"))
+        params, sse = _fit_grid(k, w, m, sigma)
+        index = int(np.argmin(sse))
+        if sse[index] < best_sse:
+            best, best_sse = params[index], float(sse[index])
+        if best is None:
+            break
+        # Zagęszczenie siatki wokół najlepszego punktu
+        m_step = (m_high - m_low) / (GRID_SIZE - 1)
+        sigma_step = (sigma_high - sigma_low) / (GRID_SIZE - 1)
+        m_low, m_high = best[3] - m_step, best[3] + m_step
+        sigma_low, sigma_high = np.log(best[4]) - sigma_step, np.log(best[4]) + sigma_step
+
+    if best is None:
+        # Żaden kandydat nie spełnia warunków - płaski przekrój (stała zmienność)
+        best = np.array([float(np.mean(w)), 0.0, 0.0, 0.0, MIN_SVI_SIGMA])
+        best_sse = float(np.sum((w - best[0]) ** 2))
+    return best, float(np.sqrt(best_sse / len(k)))
+
+
+class VolatilitySurface:
+    """
+    Powierzchnia zmienności implikowanej: przekroje SVI i interpolacja w czasie.
+
+    Każdy termin wygaśnięcia opisany jest pięcioma parametrami SVI całkowitej
+    wariancji w(k, T) w funkcji log-moneyness k = ln(K / F(T)). Pomiędzy
+    terminami w jest interpolowana liniowo w czasie (przy tym samym k), a poza
+    nimi ekstrapolowana przy stałej zmienności skrajnego przekroju. Zapytanie
+    o (K, T) to wyszukiwanie binarne terminu i obliczenie dwóch przekrojów -
+    O(log n) względem liczby terminów.
+    """
+
+    def __init__(self, spot: float, rate: float, times: np.ndarray, params: np.ndarray,
+                 rmse: np.ndarray, points: np.ndarray, build_seconds: float = 0.0):
+        self.spot = spot
+        self.rate = rate
+        self.times = times
+        self.params = params
+        self.rmse = rmse
+        self.points = points
+        self.build_seconds = build_seconds
+        # Kopie w typach Pythona dla pojedynczych zapytań (bez narzutu tablic NumPy)
+        self._time_list = [float(value) for value in times]
+        self._param_list = [tuple(float(value) for value in row) for row in params]
+
+    @classmethod
+    def fit(cls, spot: float, rate: float, strike: np.ndarray, time: np.ndarray,
+            volatility: np.ndarray, is_call: np.ndarray) -> "VolatilitySurface":
+        """
+        Dopasowuje powierzchnię do zmienności implikowanych kontraktów.
+
+        Używane są kontrakty poza pieniądzem (sprzedaży poniżej forwardu,
+        kupna powyżej) - ich kwotowania zawierają najwięcej wartości czasowej.
+
+        Raises:
+            ValueError: Żaden termin nie ma wystarczającej liczby kwotowań
+        """
+        started = timer.perf_counter()
+        forward = spot * np.exp(rate * time)
+        k = np.log(strike / forward)
+        out_of_money = np.where(is_call, k >= 0, k < 0) & np.isfinite(volatility) & (volatility > 0)
+
+        times, params, rmse, points = [], [], [], []
+        for expiry in np.unique(time[time > 0]):
+            mask = out_of_money & (time == expiry)
+            if np.count_nonzero(mask) < MIN_SLICE_POINTS:
+                continue
+            slice_params, slice_rmse = fit_svi_slice(k[mask], volatility[mask] ** 2 * expiry)
+            times.append(expiry)
+            params.append(slice_params)
+            rmse.append(slice_rmse)
+            points.append(np.count_nonzero(mask))
+        if not times:
+            raise ValueError("Za mało kwotowań do dopasowania powierzchni zmienności")
+
+        return cls(spot, rate, np.array(times), np.array(params), np.array(rmse), np.array(points),
+                   timer.perf_counter() - started)
+
+    def total_variance(self, k: np.ndarray, time: np.ndarray) -> np.ndarray:
+        """Całkowita wariancja w(k, T) (tablice rozgłaszane do wspólnego kształtu)."""
+        k, time = np.broadcast_arrays(np.asarray(k, dtype=np.float64), np.asarray(time, dtype=np.float64))
+        right = np.clip(np.searchsorted(self.times, time), 1, len(self.times) - 1) if len(self.times) > 1 \
+            else np.zeros(time.shape, dtype=np.int64)
+        left = np.maximum(right - 1, 0)
+        t_left, t_right = self.times[left], self.times[right]
+        w_left = svi_total_variance(self.params[left], k)
+        w_right = svi_total_variance(self.params[right], k)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(t_right > t_left, (time - t_left) / (t_right - t_left), 0.0)
+        variance = w_left + weight * (w_right - w_left)
+        # Poza zakresem terminów - stała zmienność skrajnego przekroju
+        variance = np.where(time < self.times[0], w_left * time / self.times[0], variance)
+        variance = np.where(time > self.times[-1], w_right * time / self.times[-1], variance)
+        return np.maximum(variance, 0.0)
+
+    def volatility(self, strike, time) -> np.ndarray:
+        """Zmienność implikowana dla ceny wykonania i czasu do wygaśnięcia (w latach)."""
+        strike = np.asarray(strike, dtype=np.float64)
+        time = np.maximum(np.asarray(time, dtype=np.float64), 1e-8)
+        k = np.log(strike / (self.spot * np.exp(self.rate * time)))
+        return np.sqrt(self.total_variance(k, time) / time)
+
+    def volatility_at(self, strike: float, time: float) -> float:
+        """Zmienność implikowana pojedynczego kontraktu (wariant volatility bez tablic)."""
+        time = max(float(time), 1e-8)
+        k = math.log(strike / self.spot) - self.rate * time
+        times = self._time_list
+        right = min(max(bisect.bisect_left(times, time), 1), len(times) - 1) if len(times) > 1 else 0
+        left = max(right - 1, 0)
+
+        def slice_variance(index: int) -> float:
+            a, b, rho, m, sigma = self._param_list[index]
+            return a + b * (rho * (k - m) + math.sqrt((k - m) ** 2 + sigma * sigma))
+
+        if time < times[0]:
+            variance = slice_variance(0) * time / times[0]
+        elif time > times[-1]:
+            variance = slice_variance(len(times) - 1) * time / times[-1]
+        else:
+            w_left, w_right = slice_variance(left), slice_variance(right)
+            span = times[right] - times[left]
+            variance = w_left + (w_right - w_left) * ((time - times[left]) / span if span > 0 else 0.0)
+        return math.sqrt(max(variance, 0.0) / time)
+
+    def slices(self) -> List[Dict[str, Any]]:
+        """Opis przekrojów (parametry SVI, błąd dopasowania i liczba kwotowań)."""
+        return [
+            {
+                "time": round(float(expiry), 6),
+                **{name: float(value) for name, value in zip(SVI_PARAMETERS, params)},
+                "rmse": float(rmse),
+                "points": int(points)
+            }
+            for expiry, params, rmse, points in zip(self.times, self.params, self.rmse, self.points)
+        ]
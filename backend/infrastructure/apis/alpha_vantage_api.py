@@ -1,5 +1,4 @@
 import os
-import requests
 import logging
 import json
 from datetime import datetime
@@ -7,21 +6,107 @@ from typing import Dict, Any, List, Optional
 
 from dotenv import load_dotenv
 
+from infrastructure.apis.http_transport import HttpTransport, RequestsTransport, TransportError, TransportResponse
+from infrastructure.apis.request_scheduler import (
+    RequestScheduler, RequestPriority, RateLimitExceeded, current_priority, request_priority
+)
+from infrastructure.apis.single_flight import SingleFlight
+from infrastructure.cache.response_cache import ResponseCache
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+
+def parse_alpha_vantage_response(response: TransportResponse, log_params: Dict[str, str],
+                                 scheduler: Optional[RequestScheduler] = None) -> Dict[str, Any]:
+    """
+    Dekoduje odpowiedź Alpha Vantage i sprawdza, czy nie zawiera komunikatu o błędzie.
+    
+    Args:
+        response: Odpowiedź HTTP
+        log_params: Parametry zapytania (bez klucza API) do logów
+        scheduler: Harmonogram zapytań, który należy powiadomić o limicie dostawcy
+    
+    Returns:
+        Odpowiedź API jako słownik
+    """
+    logger.debug(f"Otrzymano odpowiedź z kodem: {response.status_code}")
+    
+    if response.status_code != 200:
+        logger.error(f"Błąd Alpha Vantage API: kod {response.status_code}, treść: {response.text}")
+        raise Exception(f"Błąd API: {response.status_code}")
+    
+    data = response.json()
+    
+    # Sprawdzamy różne rodzaje błędów
+    if "Error Message" in data:
+        logger.error(f"Błąd Alpha Vantage API dla {log_params}: {data['Error Message']}")
+        raise Exception(f"Błąd API Alpha Vantage: {data['Error Message']}")
+    
+    if "Information" in data:
+        logger.error(f"Limit zapytań Alpha Vantage API dla {log_params}: {data['Information']}")
+        if scheduler is not None:
+            raise scheduler.on_provider_limit(data["Information"])
+        raise Exception(f"Limit zapytań API: {data['Information']}")
+    
+    if "Note" in data and "API call frequency" in data["Note"]:
+        logger.error(f"Osiągnięto limit Alpha Vantage API dla {log_params}: {data['Note']}")
+        if scheduler is not None:
+            raise scheduler.on_provider_limit(data["Note"])
+        raise Exception(f"Osiągnięto limit API: {data['Note']}")
+    
+    # Logujemy klucze w odpowiedzi aby pomóc w debugowaniu
+    logger.debug(f"Otrzymano odpowiedź z kluczami: {list(data.keys())}")
+    
+    return data
+
+
 class AlphaVantageAPI:
     """Klasa do komunikacji z API Alpha Vantage."""
     
     BASE_URL = "https://www.alphavantage.co/query"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 transport: Optional[HttpTransport] = None,
+                 base_url: Optional[str] = None):
         self.api_key = api_key or os.getenv("ALPHA_VANTAGE_API_KEY")
         if not self.api_key:
             raise ValueError("Nie podano klucza API Alpha Vantage")
+        self.base_url = base_url or os.getenv("ALPHA_VANTAGE_BASE_URL") or self.BASE_URL
+        self.transport = transport or RequestsTransport()
+        self.cache = cache
+        self.single_flight = single_flight or SingleFlight()
+        self.scheduler = scheduler
     
     def _make_request(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Wykonuje zapytanie do API Alpha Vantage, korzystając z pamięci podręcznej (jeśli skonfigurowano).
+        
+        Args:
+            params: Parametry zapytania
+            
+        Returns:
+            Odpowiedź API jako słownik
+        """
+        if self.cache is None:
+            return self._fetch_shared(params)
+        # Odświeżanie w tle czeka na aktualne dane - przeterminowany wpis nic mu nie daje
+        allow_stale = current_priority() != RequestPriority.BACKGROUND
+        return self.cache.get_or_fetch(params, self._fetch_shared, self._fetch_in_background, allow_stale)
+    
+    def _fetch_shared(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Wykonuje zapytanie, łącząc równoczesne identyczne zapytania w jedno."""
+        return self.single_flight.do(ResponseCache.make_key(params), lambda: self._fetch(params))
+    
+    def _fetch_in_background(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Odświeża odpowiedź w tle z najniższym priorytetem w harmonogramie zapytań."""
+        with request_priority(RequestPriority.BACKGROUND):
+            return self._fetch_shared(params)
+    
+    def _fetch(self, params: Dict[str, str]) -> Dict[str, Any]:
         """
         Wykonuje zapytanie do API Alpha Vantage.
         
@@ -41,35 +126,16 @@ class AlphaVantageAPI:
         log_params = params.copy()
         logger.debug(f"Wykonywanie zapytania do Alpha Vantage API: {log_params}")
         
+        # Czekamy na wolny żeton w limicie zapytań (lub od razu odrzucamy zapytanie)
+        if self.scheduler is not None:
+            self.scheduler.acquire()
+        
         try:
-            response = requests.get(self.BASE_URL, params=request_params)
-            
-            logger.debug(f"Otrzymano odpowiedź z kodem: {response.status_code}")
-            
-            if response.status_code != 200:
-                logger.error(f"Błąd Alpha Vantage API: kod {response.status_code}, treść: {response.text}")
-                raise Exception(f"Błąd API: {response.status_code}")
-            
-            data = response.json()
-            
-            # Sprawdzamy różne rodzaje błędów
-            if "Error Message" in data:
-                logger.error(f"Błąd Alpha Vantage API dla {log_params}: {data['Error Message']}")
-                raise Exception(f"Błąd API Alpha Vantage: {data['Error Message']}")
-            
-            if "Information" in data:
-                logger.error(f"Limit zapytań Alpha Vantage API dla {log_params}: {data['Information']}")
-                raise Exception(f"Limit zapytań API: {data['Information']}")
-            
-            if "Note" in data and "API call frequency" in data["Note"]:
-                logger.error(f"Osiągnięto limit Alpha Vantage API dla {log_params}: {data['Note']}")
-                raise Exception(f"Osiągnięto limit API: {data['Note']}")
-            
-            # Logujemy klucze w odpowiedzi aby pomóc w debugowaniu
-            logger.debug(f"Otrzymano odpowiedź z kluczami: {list(data.keys())}")
-            
-            return data
-        except requests.exceptions.RequestException as e:
+            response = self.transport.get(self.base_url, request_params, self.scheduler)
+            return parse_alpha_vantage_response(response, log_params, self.scheduler)
+        except RateLimitExceeded:
+            raise
+        except TransportError as e:
             logger.error(f"Błąd połączenia z Alpha Vantage API: {str(e)}")
             raise Exception(f"Błąd połączenia z API: {str(e)}")
         except json.JSONDecodeError as e:
@@ -96,7 +162,9 @@ class AlphaVantageAPI:
         }
         
         try:
-            data = self._make_request(params)
+            # Wyszukiwanie w trakcie pisania ustępuje ładowaniu wykresów
+            with request_priority(max(current_priority(), RequestPriority.SEARCH)):
+                data = self._make_request(params)
             matches = data.get("bestMatches", [])
             logger.debug(f"Znaleziono {len(matches)} dopasowań dla wyszukiwania: {keywords}")
             return matches
@@ -0,0 +1,178 @@
+import os
+import logging
+import json
+from typing import Dict, Any, List, Optional
+
+from dotenv import load_dotenv
+
+from infrastructure.apis.alpha_vantage_api import AlphaVantageAPI, parse_alpha_vantage_response
+from infrastructure.apis.http_transport import AsyncHttpTransport, AiohttpTransport, TransportError
+from infrastructure.apis.request_scheduler import (
+    RequestScheduler, RequestPriority, RateLimitExceeded, current_priority, request_priority
+)
+from infrastructure.apis.single_flight import AsyncSingleFlight
+from infrastructure.cache.response_cache import ResponseCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAlphaVantageAPI:
+    """
+    Asynchroniczna wersja klienta API Alpha Vantage.
+
+    Udostępnia te same metody co AlphaVantageAPI, ale oczekiwanie na odpowiedź
+    nie blokuje wątku - jedna pętla zdarzeń może obsługiwać tysiące
+    równoczesnych, wolnych zapytań. Pamięć podręczna i harmonogram zapytań
+    mogą być współdzielone z klientem synchronicznym.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 single_flight: Optional[AsyncSingleFlight] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 transport: Optional[AsyncHttpTransport] = None,
+                 base_url: Optional[str] = None):
+        self.api_key = api_key or os.getenv("ALPHA_VANTAGE_API_KEY")
+        if not self.api_key:
+            raise ValueError("Nie podano klucza API Alpha Vantage")
+        self.base_url = base_url or os.getenv("ALPHA_VANTAGE_BASE_URL") or AlphaVantageAPI.BASE_URL
+        self.transport = transport or AiohttpTransport()
+        self.cache = cache
+        self.single_flight = single_flight or AsyncSingleFlight()
+        self.scheduler = scheduler
+
+    async def _make_request(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Wykonuje zapytanie do API Alpha Vantage, korzystając z pamięci podręcznej (jeśli skonfigurowano).
+
+        Args:
+            params: Parametry zapytania
+
+        Returns:
+            Odpowiedź API jako słownik
+        """
+        if self.cache is None:
+            return await self._fetch_shared(params)
+        # Odświeżanie w tle czeka na aktualne dane - przeterminowany wpis nic mu nie daje
+        allow_stale = current_priority() != RequestPriority.BACKGROUND
+        return await self.cache.get_or_fetch_async(params, self._fetch_shared, self._fetch_in_background, allow_stale)
+
+    async def _fetch_shared(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Wykonuje zapytanie, łącząc równoczesne identyczne zapytania w jedno."""
+        return await self.single_flight.do(ResponseCache.make_key(params), lambda: self._fetch(params))
+
+    async def _fetch_in_background(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Odświeża odpowiedź w tle z najniższym priorytetem w harmonogramie zapytań."""
+        with request_priority(RequestPriority.BACKGROUND):
+            return await self._fetch_shared(params)
+
+    async def _fetch(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Wykonuje zapytanie do API Alpha Vantage.
+
+        Args:
+            params: Parametry zapytania
+
+        Returns:
+            Odpowiedź API jako słownik
+
+        Raises:
+            Exception: Gdy wystąpi błąd podczas zapytania
+        """
+        request_params = params.copy()
+        request_params["apikey"] = self.api_key
+
+        # Zapisujemy kopię parametrów bez API key do logów
+        log_params = params.copy()
+        logger.debug(f"Wykonywanie asynchronicznego zapytania do Alpha Vantage API: {log_params}")
+
+        # Czekamy na wolny żeton w limicie zapytań (lub od razu odrzucamy zapytanie)
+        if self.scheduler is not None:
+            await self.scheduler.acquire_async()
+
+        try:
+            response = await self.transport.get(self.base_url, request_params, self.scheduler)
+            return parse_alpha_vantage_response(response, log_params, self.scheduler)
+        except RateLimitExceeded:
+            raise
+        except TransportError as e:
+            logger.error(f"Błąd połączenia z Alpha Vantage API: {str(e)}")
+            raise Exception(f"Błąd połączenia z API: {str(e)}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Nie można zdekodować odpowiedzi JSON: {str(e)}")
+            raise Exception(f"Nieprawidłowa odpowiedź API: {str(e)}")
+        except Exception as e:
+            logger.error(f"Nieznany błąd podczas zapytania do Alpha Vantage API: {str(e)}")
+            raise
+
+    async def search_symbol(self, keywords: str) -> List[Dict[str, Any]]:
+        """Wyszukuje symbole giełdowe na podstawie słów kluczowych."""
+        logger.debug(f"Wyszukiwanie symbolu dla słów kluczowych: {keywords}")
+        params = {
+            "function": "SYMBOL_SEARCH",
+            "keywords": keywords
+        }
+
+        try:
+            # Wyszukiwanie w trakcie pisania ustępuje ładowaniu wykresów
+            with request_priority(max(current_priority(), RequestPriority.SEARCH)):
+                data = await self._make_request(params)
+            matches = data.get("bestMatches", [])
+            logger.debug(f"Znaleziono {len(matches)} dopasowań dla wyszukiwania: {keywords}")
+            return matches
+        except Exception as e:
+            logger.error(f"Błąd podczas wyszukiwania symbolu dla {keywords}: {str(e)}")
+            raise
+
+    async def get_daily_data(self, symbol: str, output_size: str = "compact") -> Dict[str, Any]:
+        """Pobiera dzienne dane dla danego symbolu."""
+        logger.debug(f"Pobieranie dziennych danych dla symbolu: {symbol}, output_size: {output_size}")
+        params = {
+            "function": "TIME_SERIES_DAILY",
+            "symbol": symbol,
+            "outputsize": output_size
+        }
+        return await self._request_series(params, symbol, "dziennych")
+
+    async def get_intraday_data(self, symbol: str, interval: str = "5min", output_size: str = "compact") -> Dict[str, Any]:
+        """Pobiera dane wewnątrzdzienne dla danego symbolu."""
+        logger.debug(f"Pobieranie danych wewnątrzdziennych dla symbolu: {symbol}, interval: {interval}, output_size: {output_size}")
+        params = {
+            "function": "TIME_SERIES_INTRADAY",
+            "symbol": symbol,
+            "interval": interval,
+            "outputsize": output_size
+        }
+        return await self._request_series(params, symbol, "wewnątrzdziennych")
+
+    async def get_weekly_data(self, symbol: str) -> Dict[str, Any]:
+        """Pobiera tygodniowe dane dla danego symbolu."""
+        logger.debug(f"Pobieranie tygodniowych danych dla symbolu: {symbol}")
+        params = {
+            "function": "TIME_SERIES_WEEKLY",
+            "symbol": symbol
+        }
+        return await self._request_series(params, symbol, "tygodniowych")
+
+    async def get_monthly_data(self, symbol: str) -> Dict[str, Any]:
+        """Pobiera miesięczne dane dla danego symbolu."""
+        logger.debug(f"Pobieranie miesięcznych danych dla symbolu: {symbol}")
+        params = {
+            "function": "TIME_SERIES_MONTHLY",
+            "symbol": symbol
+        }
+        return await self._request_series(params, symbol, "miesięcznych")
+
+    async def _request_series(self, params: Dict[str, str], symbol: str, label: str) -> Dict[str, Any]:
+        try:
+            data = await self._make_request(params)
+            logger.debug(f"Pobrano dane {label} dla {symbol}, klucze w odpowiedzi: {list(data.keys())}")
+            return data
+        except Exception as e:
+            logger.error(f"Błąd podczas pobierania danych {label} dla {symbol}: {str(e)}")
+            raise
+
+    async def close(self) -> None:
+        """Zamyka połączenia transportu."""
+        await self.transport.close()
@@ -0,0 +1,66 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+from typing import Any, Awaitable, Optional
+
+
+class EventLoopThread:
+    """
+    Pętla zdarzeń asyncio działająca w osobnym wątku tła.
+
+    Jedna współdzielona pętla obsługuje wszystkie asynchroniczne zapytania do
+    źródła danych. Kod synchroniczny (widoki Flask, adapter repozytorium)
+    zleca w niej korutyny metodą run i czeka na wynik.
+    """
+
+    def __init__(self, name: str = "asyncio-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable[Any],
+               context: Optional[contextvars.Context] = None) -> concurrent.futures.Future:
+        """
+        Zleca korutynę w pętli i zwraca Future, na którym można czekać z innego wątku.
+
+        Korutyna działa w kopii kontekstu wywołującego, dzięki czemu widzi
+        m.in. kontekst żądania Flask i priorytet zapytań do API.
+        """
+        context = context or contextvars.copy_context()
+        result: concurrent.futures.Future = concurrent.futures.Future()
+
+        def start():
+            if not result.set_running_or_notify_cancel():
+                coro.close()
+                return
+            task = self.loop.create_task(coro, context=context)
+
+            def done(finished: asyncio.Task):
+                if finished.cancelled():
+                    result.set_exception(concurrent.futures.CancelledError())
+                elif finished.exception() is not None:
+                    result.set_exception(finished.exception())
+                else:
+                    result.set_result(finished.result())
+
+            task.add_done_callback(done)
+
+        self.loop.call_soon_threadsafe(start)
+        return result
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Wykonuje korutynę w pętli i blokuje bieżący wątek do jej zakończenia."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Nie można synchronicznie czekać na korutynę z wątku pętli zdarzeń")
+        return self.submit(coro).result(timeout)
+
+    def stop(self) -> None:
+        """Zatrzymuje pętlę zdarzeń."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
@@ -0,0 +1,310 @@
+import asyncio
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+from infrastructure.apis.request_scheduler import RateLimitExceeded, RequestScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class TransportError(Exception):
+    """Błąd połączenia z serwerem (po wyczerpaniu ponowień)."""
+    pass
+
+
+class TransportResponse:
+    """Odpowiedź HTTP niezależna od użytego klienta."""
+
+    def __init__(self, status_code: int, content: bytes, encoding: str = "utf-8"):
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        # orjson.JSONDecodeError dziedziczy po json.JSONDecodeError
+        return orjson.loads(self.content)
+
+
+class HttpTransport(ABC):
+    """Interfejs warstwy transportowej używanej przez klienty API."""
+
+    @abstractmethod
+    def get(self, url: str, params: Dict[str, str], scheduler: Optional[RequestScheduler] = None) -> TransportResponse:
+        """
+        Wykonuje zapytanie GET i zwraca odpowiedź.
+
+        Args:
+            scheduler: Harmonogram zapytań (RequestScheduler), w którym każde
+                       ponowienie pobiera własny żeton limitu
+        """
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki transportu."""
+        return {}
+
+    def close(self) -> None:
+        """Zamyka otwarte połączenia."""
+        pass
+
+
+class RetryPolicy:
+    """
+    Polityka ponawiania zapytań: wykładnicze opóźnienie z pełnym losowym rozrzutem.
+
+    Ponawiane są wyłącznie przejściowe błędy zapytań idempotentnych (GET):
+    zerwane połączenia, przekroczone limity czasu i odpowiedzi 502/503/504.
+    Każde ponowienie to osobne zapytanie do dostawcy, więc przy podanym
+    harmonogramie zapytań zużywa żeton limitu - gdy żetonu nie ma w budżecie
+    opóźnienia, ponawianie jest przerywane.
+    """
+
+    RETRY_STATUSES = frozenset({502, 503, 504})
+
+    def __init__(self, max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def delay(self, attempt: int) -> float:
+        """Zwraca opóźnienie przed ponowieniem numer attempt (od 0)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class RequestsTransport(HttpTransport):
+    """
+    Transport oparty na requests.Session z pulą utrzymywanych połączeń.
+
+    Połączenia (wraz z uzgodnionym TLS) są ponownie wykorzystywane między
+    zapytaniami, każde zapytanie ma osobny limit czasu na połączenie i odczyt,
+    a błędy przejściowe są ponawiane zgodnie z RetryPolicy.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 30.0,
+                 pool_maxsize: int = 16, retry_policy: Optional[RetryPolicy] = None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, url: str, params: Dict[str, str], scheduler: Optional[RequestScheduler] = None) -> TransportResponse:
+        """Wykonuje zapytanie GET z ponawianiem błędów przejściowych."""
+        attempt = 0
+        while True:
+            self._count("requests")
+            last_response, error = None, None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                last_response = TransportResponse(response.status_code, response.content,
+                                                  response.encoding or "utf-8")
+                if (response.status_code not in self.retry_policy.RETRY_STATUSES
+                        or attempt >= self.retry_policy.max_retries):
+                    return last_response
+                reason = f"kod {response.status_code}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.retry_policy.max_retries:
+                    self._count("failures")
+                    raise TransportError(str(e)) from e
+                reason, error = str(e), e
+            except requests.exceptions.RequestException as e:
+                self._count("failures")
+                raise TransportError(str(e)) from e
+
+            delay = self.retry_policy.delay(attempt)
+            logger.warning(f"Błąd przejściowy ({reason}) - ponowienie {attempt + 1} za {delay:.2f} s")
+            time.sleep(delay)
+            if scheduler is not None:
+                try:
+                    scheduler.acquire()
+                except RateLimitExceeded:
+                    logger.warning(f"Brak żetonu limitu na ponowienie ({reason}) - rezygnacja z ponowień")
+                    if last_response is not None:
+                        return last_response
+                    self._count("failures")
+                    raise TransportError(str(error)) from error
+            self._count("retries")
+            attempt += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki transportu, w tym liczbę nawiązanych połączeń."""
+        with self._lock:
+            stats = dict(self._stats)
+        pools = self.adapter.poolmanager.pools
+        stats["connectionsOpened"] = sum(
+            pools[key].num_connections for key in list(pools.keys())
+        )
+        return stats
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncHttpTransport(ABC):
+    """Interfejs asynchronicznej warstwy transportowej."""
+
+    @abstractmethod
+    async def get(self, url: str, params: Dict[str, str], scheduler: Optional[RequestScheduler] = None) -> TransportResponse:
+        """
+        Wykonuje zapytanie GET i zwraca odpowiedź.
+
+        Args:
+            scheduler: Harmonogram zapytań (RequestScheduler), w którym każde
+                       ponowienie pobiera własny żeton limitu
+        """
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki transportu."""
+        return {}
+
+    async def close(self) -> None:
+        """Zamyka otwarte połączenia."""
+        pass
+
+
+# Maksymalny czas oczekiwania (s) na migawkę statystyk zbieraną w pętli zdarzeń
+STATS_TIMEOUT = 1.0
+
+
+class AiohttpTransport(AsyncHttpTransport):
+    """
+    Asynchroniczny transport oparty na aiohttp z pulą utrzymywanych połączeń.
+
+    Sesja jest tworzona leniwie w pętli zdarzeń, w której wykonano pierwsze
+    zapytanie, i może obsługiwać tysiące równoczesnych, wolnych odpowiedzi.
+    Limity czasu i polityka ponowień są takie same jak w RequestsTransport.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 30.0,
+                 pool_maxsize: int = 100, retry_policy: Optional[RetryPolicy] = None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_maxsize = pool_maxsize
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session = None
+        self._loop = None
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+
+    def _get_session(self):
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                              sock_read=self.read_timeout)
+            )
+            self._loop = asyncio.get_running_loop()
+        return self._session
+
+    async def get(self, url: str, params: Dict[str, str], scheduler: Optional[RequestScheduler] = None) -> TransportResponse:
+        """Wykonuje zapytanie GET z ponawianiem błędów przejściowych."""
+        import asyncio
+        import aiohttp
+
+        session = self._get_session()
+        attempt = 0
+        while True:
+            self._stats["requests"] += 1
+            last_response, error = None, None
+            try:
+                async with session.get(url, params=params) as response:
+                    content = await response.read()
+                    last_response = TransportResponse(response.status, content, response.charset or "utf-8")
+                    if (response.status not in self.retry_policy.RETRY_STATUSES
+                            or attempt >= self.retry_policy.max_retries):
+                        return last_response
+                    reason = f"kod {response.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.retry_policy.max_retries:
+                    self._stats["failures"] += 1
+                    raise TransportError(str(e) or type(e).__name__) from e
+                reason, error = str(e) or type(e).__name__, e
+            except aiohttp.ClientError as e:
+                self._stats["failures"] += 1
+                raise TransportError(str(e)) from e
+
+            delay = self.retry_policy.delay(attempt)
+            logger.warning(f"Błąd przejściowy ({reason}) - ponowienie {attempt + 1} za {delay:.2f} s")
+            await asyncio.sleep(delay)
+            if scheduler is not None:
+                try:
+                    await scheduler.acquire_async()
+                except RateLimitExceeded:
+                    logger.warning(f"Brak żetonu limitu na ponowienie ({reason}) - rezygnacja z ponowień")
+                    if last_response is not None:
+                        return last_response
+                    self._stats["failures"] += 1
+                    raise TransportError(reason) from error
+            self._stats["retries"] += 1
+            attempt += 1
+
+    def _collect_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        connector = self._session.connector if self._session is not None else None
+        stats["openConnections"] = (
+            sum(len(c) for c in connector._conns.values()) if connector is not None else 0
+        )
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Zwraca statystyki transportu.
+
+        Pula połączeń sesji zmienia się w wątku pętli zdarzeń, więc wywołanie z
+        innego wątku (np. widoku Flask) zleca zebranie migawki w tej pętli.
+        """
+        loop = self._loop
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if loop is None or on_loop or not loop.is_running():
+            return self._collect_stats()
+
+        snapshot: concurrent.futures.Future = concurrent.futures.Future()
+
+        def collect():
+            try:
+                snapshot.set_result(self._collect_stats())
+            except Exception as e:
+                snapshot.set_exception(e)
+
+        loop.call_soon_threadsafe(collect)
+        try:
+            return snapshot.result(STATS_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            return dict(self._stats, openConnections=None)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
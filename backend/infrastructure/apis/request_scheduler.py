@@ -0,0 +1,229 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Any, Optional
+
+
+class RequestPriority(IntEnum):
+    """Priorytet zapytania do API (mniejsza wartość - wyższy priorytet)."""
+    INTERACTIVE = 0  # ładowanie wykresów i danych oglądanych przez użytkownika
+    SEARCH = 1       # wyszukiwanie w trakcie pisania
+    BACKGROUND = 2   # wstępne pobieranie i odświeżanie w tle
+
+
+_current_priority: ContextVar[RequestPriority] = ContextVar(
+    "upstream_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+def current_priority() -> RequestPriority:
+    """Zwraca priorytet zapytań wykonywanych w bieżącym kontekście."""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: RequestPriority):
+    """Ustawia priorytet zapytań do API wykonywanych wewnątrz bloku."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RateLimitExceeded(Exception):
+    """Zapytanie odrzucone z powodu limitu zapytań - można je ponowić po retry_after sekundach."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Wiadro żetonów uzupełniane w stałym tempie."""
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, tokens: float, now: float) -> float:
+        """Zwraca czas (w sekundach) do momentu, gdy w wiadrze będzie podana liczba żetonów."""
+        self._refill(now)
+        missing = tokens - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def available(self, now: float) -> float:
+        """Zwraca liczbę dostępnych żetonów."""
+        self._refill(now)
+        return self.tokens
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RequestScheduler:
+    """
+    Harmonogram zapytań do Alpha Vantage pilnujący limitów minutowego i dziennego.
+
+    Zapytania ponad limit czekają w kolejce uporządkowanej według priorytetu
+    (a w obrębie priorytetu - według kolejności zgłoszenia). Jeśli szacowany
+    czas oczekiwania przekracza budżet opóźnienia dla danego priorytetu,
+    zapytanie jest od razu odrzucane wyjątkiem RateLimitExceeded z informacją,
+    po jakim czasie warto je ponowić.
+    """
+
+    DEFAULT_BUDGETS = {
+        RequestPriority.INTERACTIVE: 15.0,
+        RequestPriority.SEARCH: 3.0,
+        RequestPriority.BACKGROUND: 120.0,
+    }
+
+    # Maksymalny odstęp między ponownymi sprawdzeniami stanu kolejki
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, calls_per_minute: int = 5, calls_per_day: int = 25,
+                 latency_budgets: Optional[Dict[RequestPriority, float]] = None):
+        self.minute_bucket = TokenBucket(calls_per_minute, 60.0)
+        self.day_bucket = TokenBucket(calls_per_day, 24 * 60 * 60.0)
+        self.latency_budgets = dict(self.DEFAULT_BUDGETS)
+        if latency_budgets:
+            self.latency_budgets.update(latency_budgets)
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stats = {
+            "granted": {p.name.lower(): 0 for p in RequestPriority},
+            "rejected": {p.name.lower(): 0 for p in RequestPriority},
+            "providerLimitHits": 0,
+        }
+
+    def _estimated_wait(self, position: int, now: float) -> float:
+        """Szacuje czas oczekiwania zapytania, przed którym w kolejce stoi position zapytań."""
+        needed = position + 1
+        return max(self.minute_bucket.time_until(needed, now), self.day_bucket.time_until(needed, now))
+
+    def _try_acquire(self, ticket, priority: RequestPriority, deadline: float) -> Optional[float]:
+        """
+        Próbuje przydzielić żeton zapytaniu z kolejki (wywoływane pod blokadą).
+
+        Returns:
+            None, gdy żeton został przydzielony, w przeciwnym razie szacowany czas oczekiwania
+
+        Raises:
+            RateLimitExceeded: Gdy czas oczekiwania przekroczyłby budżet opóźnienia
+        """
+        now = time.monotonic()
+        position = sum(1 for queued in self._queue if queued < ticket)
+        wait = self._estimated_wait(position, now)
+
+        if position == 0 and wait == 0:
+            self.minute_bucket.take(now)
+            self.day_bucket.take(now)
+            self._stats["granted"][priority.name.lower()] += 1
+            return None
+
+        if now + wait > deadline:
+            self._stats["rejected"][priority.name.lower()] += 1
+            raise RateLimitExceeded(
+                f"Przekroczono limit zapytań do Alpha Vantage - spróbuj ponownie za {wait:.0f} s",
+                retry_after=wait
+            )
+        return wait
+
+    def _enqueue(self, priority: Optional[RequestPriority]):
+        priority = current_priority() if priority is None else priority
+        deadline = time.monotonic() + self.latency_budgets[priority]
+        ticket = (int(priority), next(self._sequence))
+        heapq.heappush(self._queue, ticket)
+        return priority, deadline, ticket
+
+    def _dequeue(self, ticket) -> None:
+        self._queue.remove(ticket)
+        heapq.heapify(self._queue)
+        self._condition.notify_all()
+
+    def acquire(self, priority: Optional[RequestPriority] = None) -> None:
+        """
+        Czeka na możliwość wykonania zapytania do API.
+
+        Args:
+            priority: Priorytet zapytania (domyślnie priorytet bieżącego kontekstu)
+
+        Raises:
+            RateLimitExceeded: Gdy czas oczekiwania przekroczyłby budżet opóźnienia
+        """
+        with self._condition:
+            priority, deadline, ticket = self._enqueue(priority)
+            try:
+                while True:
+                    wait = self._try_acquire(ticket, priority, deadline)
+                    if wait is None:
+                        return
+                    self._condition.wait(timeout=min(max(wait, 0.01), self.POLL_INTERVAL))
+            finally:
+                self._dequeue(ticket)
+
+    async def acquire_async(self, priority: Optional[RequestPriority] = None) -> None:
+        """
+        Asynchroniczny odpowiednik acquire - czekając, nie blokuje pętli zdarzeń.
+
+        Raises:
+            RateLimitExceeded: Gdy czas oczekiwania przekroczyłby budżet opóźnienia
+        """
+        with self._condition:
+            priority, deadline, ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_acquire(ticket, priority, deadline)
+                if wait is None:
+                    return
+                await asyncio.sleep(min(max(wait, 0.01), self.POLL_INTERVAL))
+        finally:
+            with self._condition:
+                self._dequeue(ticket)
+
+    def on_provider_limit(self, message: str) -> RateLimitExceeded:
+        """
+        Rejestruje odpowiedź Alpha Vantage o przekroczeniu limitu.
+
+        Opróżnia odpowiednie wiadro żetonów, aby kolejne zapytania nie trafiały
+        w limit dostawcy, i zwraca wyjątek do zgłoszenia wywołującemu.
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._stats["providerLimitHits"] += 1
+            bucket = self.day_bucket if "per day" in message.lower() else self.minute_bucket
+            bucket.drain(now)
+            retry_after = bucket.time_until(1, now)
+            self._condition.notify_all()
+        return RateLimitExceeded(f"Osiągnięto limit API: {message}", retry_after=retry_after)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki harmonogramu."""
+        with self._condition:
+            now = time.monotonic()
+            return {
+                "granted": dict(self._stats["granted"]),
+                "rejected": dict(self._stats["rejected"]),
+                "providerLimitHits": self._stats["providerLimitHits"],
+                "queued": len(self._queue),
+                "minuteTokens": round(self.minute_bucket.available(now), 2),
+                "dayTokens": round(self.day_bucket.available(now), 2),
+            }
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    """Wywołanie będące w toku, na którego wynik mogą czekać kolejni wywołujący."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Łączy równoczesne, identyczne wywołania w jedno.
+
+    Pierwszy wywołujący dla danego klucza wykonuje funkcję, a pozostali,
+    którzy trafią na to samo wywołanie w toku, czekają na jego zakończenie
+    i otrzymują ten sam wynik (lub ten sam wyjątek).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+        }
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Wykonuje fn lub dołącza do trwającego wywołania o tym samym kluczu.
+
+        Args:
+            key: Klucz identyfikujący wywołanie
+            fn: Funkcja do wykonania
+
+        Returns:
+            Wynik funkcji współdzielony przez wszystkich wywołujących
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Zwraca statystyki łączenia wywołań."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["inFlight"] = len(self._calls)
+        return stats
+
+
+class AsyncSingleFlight:
+    """
+    Odpowiednik SingleFlight dla korutyn działających w jednej pętli zdarzeń.
+
+    Czekający wywołujący nie zajmują wątków - oczekują na wspólny Future.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Wykonuje korutynę zwracaną przez fn lub dołącza do trwającego wywołania o tym samym kluczu.
+
+        Args:
+            key: Klucz identyfikujący wywołanie
+            fn: Funkcja zwracająca korutynę do wykonania
+
+        Returns:
+            Wynik korutyny współdzielony przez wszystkich wywołujących
+        """
+        self._stats["calls"] += 1
+        call = self._calls.get(key)
+        if call is not None:
+            self._stats["coalesced"] += 1
+            # shield - anulowanie jednego z czekających nie przerywa wspólnego wywołania
+            return await asyncio.shield(call)
+
+        self._stats["executions"] += 1
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await fn()
+            call.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            # Wyjątek zostaje odebrany przez lidera - bez ostrzeżeń o nieodebranym wyjątku
+            call.exception()
+            raise
+        finally:
+            del self._calls[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Zwraca statystyki łączenia wywołań."""
+        stats = dict(self._stats)
+        stats["inFlight"] = len(self._calls)
+        return stats
@@ -0,0 +1 @@
+# Inicjalizacja pakietu cache
\ No newline at end of file
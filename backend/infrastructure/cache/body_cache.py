@@ -0,0 +1,81 @@
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli jest opcjonalny - bez niego odpowiedzi kompresowane są gzipem
+    brotli = None
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+# Kodowania w kolejności preferencji (najlepsza kompresja pierwsza)
+ENCODINGS = ((BROTLI,) if brotli is not None else ()) + (GZIP,)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Kompresuje treść odpowiedzi wybranym kodowaniem (IDENTITY - bez zmian)."""
+    if encoding == BROTLI:
+        # Średni poziom - kompresja bliska maksymalnej przy czasie porównywalnym z gzip
+        return brotli.compress(body, quality=5)
+    if encoding == GZIP:
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+
+class EncodedBodyCache:
+    """
+    Pamięć podręczna zakodowanych (zserializowanych i skompresowanych) treści odpowiedzi.
+
+    Wpisy identyfikowane są parą (ETag, kodowanie). ETag wyprowadzany jest
+    z wersji danych, więc zmiana danych daje nowy klucz, a nieużywane wpisy
+    są usuwane po przekroczeniu limitu rozmiaru (LRU).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        """Zwraca zapisaną treść lub None."""
+        key = (etag, encoding)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        """Zapisuje treść; treści większe niż cały limit nie są zapisywane."""
+        if len(body) > self.max_bytes:
+            return
+        key = (etag, encoding)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki pamięci podręcznej treści."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._size
+            stats["maxBytes"] = self.max_bytes
+            stats["encodings"] = list(ENCODINGS)
+        return stats
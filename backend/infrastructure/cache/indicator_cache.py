@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Przybliżony rozmiar jednego punktu {timestamp, value} w pamięci
+POINT_BYTES = 240
+
+
+def estimate_size(result: Any) -> int:
+    """Szacuje rozmiar wyniku wskaźnika (lista punktów lub słownik list punktów) w bajtach."""
+    if isinstance(result, dict):
+        return sum(estimate_size(value) for value in result.values())
+    if isinstance(result, list):
+        return len(result) * POINT_BYTES
+    return POINT_BYTES
+
+
+class IndicatorResultCache:
+    """
+    Pamięć podręczna obliczonych wskaźników (LRU z limitem rozmiaru).
+
+    Klucz wpisu składa się z identyfikatora szeregu (symbol, interwał),
+    wersji szeregu oraz klucza wyniku (okno, wskaźnik, parametry). Wersja
+    wyprowadzana jest z czasu ostatniego odświeżenia danych - gdy szereg
+    się zmieni, wpisy poprzedniej wersji są usuwane przy pierwszym
+    odwołaniu do nowej.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        # Bieżąca wersja każdego szeregu i klucze jej wpisów
+        self._versions: Dict[Tuple[str, str], Tuple[Hashable, set]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _series_keys(self, series_key: Tuple[str, str], version: Hashable) -> set:
+        """Zwraca zbiór kluczy bieżącej wersji szeregu, usuwając wpisy wersji nieaktualnej."""
+        current = self._versions.get(series_key)
+        if current is not None and current[0] == version:
+            return current[1]
+        if current is not None:
+            for key in current[1]:
+                _, size = self._entries.pop(key)
+                self._size -= size
+                self._stats["invalidations"] += 1
+        keys = set()
+        self._versions[series_key] = (version, keys)
+        return keys
+
+    def get(self, symbol: str, interval: str, version: Hashable, result_key: Hashable) -> Optional[Any]:
+        """Zwraca zapisany wynik lub None."""
+        series_key = (symbol.upper(), interval)
+        key = (series_key, version, result_key)
+        with self._lock:
+            self._series_keys(series_key, version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, symbol: str, interval: str, version: Hashable, result_key: Hashable, result: Any) -> None:
+        """Zapisuje wynik; wyniki większe niż cały limit nie są zapisywane."""
+        size = estimate_size(result)
+        if size > self.max_bytes:
+            return
+        series_key = (symbol.upper(), interval)
+        key = (series_key, version, result_key)
+        with self._lock:
+            keys = self._series_keys(series_key, version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (result, size)
+            keys.add(key)
+            self._size += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            self._stats["evictions"] += 1
+            series_key = key[0]
+            current = self._versions.get(series_key)
+            if current is not None:
+                current[1].discard(key)
+                if not current[1]:
+                    del self._versions[series_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki pamięci podręcznej wskaźników."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._size
+            stats["maxBytes"] = self.max_bytes
+        return stats
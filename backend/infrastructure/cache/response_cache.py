@@ -0,0 +1,334 @@
+import asyncio
+import os
+import json
+import zlib
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+
+import orjson
+
+from domain.services.market_calendar import MarketCalendar
+
+logger = logging.getLogger(__name__)
+
+# Opóźnienie, z jakim Alpha Vantage publikuje świece po zamknięciu sesji
+CLOSE_PUBLICATION_DELAY = 20 * 60
+
+
+class CacheEntry:
+    """Pojedynczy wpis pamięci podręcznej odpowiedzi."""
+
+    __slots__ = ("data", "size", "expires_at", "stale_until")
+
+    def __init__(self, data: Dict[str, Any], size: int, expires_at: float, stale_until: float):
+        self.data = data
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class CachePolicy:
+    """
+    Wyznacza czas ważności odpowiedzi w zależności od funkcji API i sesji.
+
+    Świece śróddzienne w trakcie sesji szybko się dezaktualizują, natomiast
+    dane dzienne, tygodniowe i miesięczne zmieniają się dopiero po kolejnym
+    zamknięciu sesji.
+    """
+
+    INTRADAY_TTL = 60
+    INTRADAY_MAX_STALE = 5 * 60
+    SEARCH_TTL = 24 * 60 * 60
+    DEFAULT_TTL = 5 * 60
+    MAX_STALE = 24 * 60 * 60
+
+    def __init__(self, calendar: Optional[MarketCalendar] = None):
+        self.calendar = calendar or MarketCalendar()
+
+    def lifetime(self, params: Dict[str, str], now: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Zwraca (czas ważności, dodatkowy czas serwowania nieaktualnego wpisu) w sekundach.
+        """
+        now = time.time() if now is None else now
+        function = params.get("function", "")
+        moment = datetime.fromtimestamp(now, self.calendar.TIMEZONE)
+
+        if function == "TIME_SERIES_INTRADAY":
+            if self.calendar.is_session_open(moment):
+                return self.INTRADAY_TTL, self.INTRADAY_MAX_STALE
+            until_open = self.calendar.next_open(moment).timestamp() - now
+            return max(self.INTRADAY_TTL, until_open), self.INTRADAY_MAX_STALE
+
+        if function.startswith("TIME_SERIES_"):
+            # Ważne do publikacji świec po najbliższym zamknięciu sesji
+            publication = self.calendar.next_publication(moment, CLOSE_PUBLICATION_DELAY)
+            return publication.timestamp() - now, self.MAX_STALE
+
+        if function == "SYMBOL_SEARCH":
+            return self.SEARCH_TTL, self.MAX_STALE
+
+        return self.DEFAULT_TTL, self.DEFAULT_TTL
+
+
+class DiskTier:
+    """Opcjonalna, dyskowa warstwa pamięci podręcznej (skompresowany JSON)."""
+
+    def __init__(self, directory: str, compression_level: int = 6):
+        self.directory = directory
+        self.compression_level = compression_level
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json.z")
+
+    def load(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                payload = orjson.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error) as e:
+            logger.error(f"Nie można odczytać wpisu pamięci podręcznej {path}: {str(e)}")
+            return None
+        if payload.get("key") != key:
+            return None
+        return CacheEntry(payload["data"], payload["size"], payload["expires_at"], payload["stale_until"])
+
+    def store(self, key: str, entry: CacheEntry, raw: bytes) -> None:
+        path = self._path(key)
+        header = json.dumps({
+            "key": key,
+            "size": entry.size,
+            "expires_at": entry.expires_at,
+            "stale_until": entry.stale_until,
+        }).encode("utf-8")
+        # Sklejamy nagłówek z już zserializowanymi danymi, aby nie kodować ich ponownie
+        body = header[:-1] + b', "data": ' + raw + b"}"
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(body, self.compression_level))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Nie można zapisać wpisu pamięci podręcznej {path}: {str(e)}")
+
+
+class ResponseCache:
+    """
+    Dwuwarstwowa pamięć podręczna odpowiedzi Alpha Vantage.
+
+    Pierwszą warstwą jest LRU w pamięci procesu ograniczone rozmiarem, drugą -
+    opcjonalny katalog ze skompresowanymi odpowiedziami. Przeterminowane wpisy
+    są jeszcze przez pewien czas zwracane od razu, a ich odświeżenie odbywa się
+    w tle (stale-while-revalidate).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 policy: Optional[CachePolicy] = None):
+        self.max_bytes = max_bytes
+        self.policy = policy or CachePolicy()
+        self.disk = DiskTier(disk_dir) if disk_dir else None
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._tasks = set()
+        self._stats = {
+            "hits": 0,
+            "staleHits": 0,
+            "diskHits": 0,
+            "misses": 0,
+            "backgroundRefreshes": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(params: Dict[str, str]) -> str:
+        """Buduje znormalizowany klucz z parametrów zapytania (bez apikey)."""
+        normalized = {
+            k.lower(): str(v).strip().upper() if k.lower() == "symbol" else str(v).strip()
+            for k, v in params.items()
+            if k.lower() != "apikey"
+        }
+        return "&".join(f"{k}={normalized[k]}" for k in sorted(normalized))
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self._lookup_memory(key)
+        if entry is None and self.disk is not None:
+            entry = self._load_disk(key)
+        return entry
+
+    def _lookup_memory(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _load_disk(self, key: str) -> Optional[CacheEntry]:
+        entry = self.disk.load(key)
+        if entry is not None:
+            with self._lock:
+                self._stats["diskHits"] += 1
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self._stats["evictions"] += 1
+
+    def put(self, params: Dict[str, str], data: Dict[str, Any]) -> None:
+        """Zapisuje odpowiedź w obu warstwach."""
+        key = self.make_key(params)
+        now = time.time()
+        ttl, max_stale = self.policy.lifetime(params, now)
+        raw = orjson.dumps(data)
+        entry = CacheEntry(data, len(raw), now + ttl, now + ttl + max_stale)
+        self._remember(key, entry)
+        if self.disk is not None:
+            self.disk.store(key, entry, raw)
+
+    def _refresh_in_background(self, key: str, params: Dict[str, str],
+                               fetch: Callable[[Dict[str, str]], Dict[str, Any]]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self._stats["backgroundRefreshes"] += 1
+
+        def refresh():
+            try:
+                self.put(params, fetch(params))
+            except Exception as e:
+                logger.error(f"Odświeżenie w tle nie powiodło się dla {key}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"cache-refresh:{key}", daemon=True).start()
+
+    def get_or_fetch(self, params: Dict[str, str],
+                     fetch: Callable[[Dict[str, str]], Dict[str, Any]],
+                     background_fetch: Optional[Callable[[Dict[str, str]], Dict[str, Any]]] = None,
+                     allow_stale: bool = True) -> Dict[str, Any]:
+        """
+        Zwraca odpowiedź z pamięci podręcznej lub pobiera ją funkcją fetch.
+
+        Args:
+            params: Parametry zapytania
+            fetch: Funkcja wykonująca rzeczywiste zapytanie do API
+            background_fetch: Funkcja używana do odświeżania w tle (domyślnie fetch)
+            allow_stale: Czy można zwrócić przeterminowany wpis (odświeżany wtedy w tle)
+
+        Returns:
+            Odpowiedź API jako słownik
+        """
+        key = self.make_key(params)
+        entry, stale = self._cached(key, allow_stale)
+        if entry is not None:
+            if stale:
+                self._refresh_in_background(key, params, background_fetch or fetch)
+            return entry.data
+
+        data = fetch(params)
+        self.put(params, data)
+        return data
+
+    async def put_async(self, params: Dict[str, str], data: Dict[str, Any]) -> None:
+        """Odpowiednik put wykonywany poza pętlą zdarzeń (serializacja, kompresja i zapis na dysk)."""
+        await asyncio.to_thread(self.put, params, data)
+
+    async def get_or_fetch_async(self, params: Dict[str, str],
+                                 fetch: Callable[[Dict[str, str]], Awaitable[Dict[str, Any]]],
+                                 background_fetch: Optional[Callable[[Dict[str, str]], Awaitable[Dict[str, Any]]]] = None,
+                                 allow_stale: bool = True) -> Dict[str, Any]:
+        """
+        Asynchroniczny odpowiednik get_or_fetch - fetch zwraca korutynę,
+        a odświeżenie w tle jest zadaniem w bieżącej pętli zdarzeń.
+
+        Odczyt i zapis warstwy dyskowej oraz serializacja odpowiedzi odbywają
+        się w wątku roboczym, aby nie blokować współdzielonej pętli.
+        """
+        key = self.make_key(params)
+        entry = self._lookup_memory(key)
+        if entry is None and self.disk is not None:
+            entry = await asyncio.to_thread(self._load_disk, key)
+        entry, stale = self._classify(entry, allow_stale)
+        if entry is not None:
+            if stale:
+                self._refresh_in_background_async(key, params, background_fetch or fetch)
+            return entry.data
+
+        data = await fetch(params)
+        await self.put_async(params, data)
+        return data
+
+    def _cached(self, key: str, allow_stale: bool = True) -> Tuple[Optional[CacheEntry], bool]:
+        """Zwraca wpis, który można od razu zwrócić, i informację, czy jest przeterminowany."""
+        return self._classify(self._lookup(key), allow_stale)
+
+    def _classify(self, entry: Optional[CacheEntry], allow_stale: bool = True) -> Tuple[Optional[CacheEntry], bool]:
+        now = time.time()
+
+        if entry is not None and now < entry.expires_at:
+            with self._lock:
+                self._stats["hits"] += 1
+            return entry, False
+
+        if entry is not None and allow_stale and now < entry.stale_until:
+            with self._lock:
+                self._stats["staleHits"] += 1
+            return entry, True
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None, False
+
+    def _refresh_in_background_async(self, key: str, params: Dict[str, str],
+                                     fetch: Callable[[Dict[str, str]], Awaitable[Dict[str, Any]]]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self._stats["backgroundRefreshes"] += 1
+
+        async def refresh():
+            try:
+                await self.put_async(params, await fetch(params))
+            except Exception as e:
+                logger.error(f"Odświeżenie w tle nie powiodło się dla {key}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        # Pętla przechowuje jedynie słabe referencje do zadań
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki pamięci podręcznej."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._size
+            stats["maxBytes"] = self.max_bytes
+            stats["diskEnabled"] = self.disk is not None
+        return stats
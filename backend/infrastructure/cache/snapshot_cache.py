@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SnapshotCache:
+    """
+    Pamięć podręczna obiektów wyliczanych z migawki szeregu (LRU z limitem liczby wpisów).
+
+    Każdy klucz (np. łańcuch opcji symbolu) przechowuje jeden obiekt razem
+    z wersją migawki, z której powstał. Obiekt zapisany dla innej wersji
+    jest budowany od nowa przy pierwszym odwołaniu do nowej wersji.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "rebuilds": 0, "evictions": 0}
+
+    def get_or_build(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> Any:
+        """Zwraca obiekt dla wersji lub buduje go (poza blokadą) i zapisuje."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+            if entry is not None:
+                self._stats["rebuilds"] += 1
+
+        value = build()
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki pamięci podręcznej migawek."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["maxEntries"] = self.max_entries
+        return stats
@@ -0,0 +1,166 @@
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+
+from domain.entities.stock_data import StockData, StockMetadata, PriceSeries, datetime_to_epoch
+from infrastructure.repositories.time_series_ingestion import ingest_time_series
+
+
+class AlphaVantagePayloadMapper:
+    """Mapowanie odpowiedzi API Alpha Vantage na encje domenowe (wspólne dla repozytoriów synchronicznych i asynchronicznych)."""
+    
+    def _map_search_results(self, results: List[Dict[str, Any]]) -> List[StockMetadata]:
+        """Mapuje wyniki wyszukiwania symboli na metadane instrumentów."""
+        return [
+            StockMetadata(
+                symbol=item.get("1. symbol", ""),
+                name=item.get("2. name", ""),
+                type=item.get("3. type", ""),
+                region=item.get("4. region", ""),
+                currency=item.get("8. currency", ""),
+                match_score=float(item.get("9. matchScore", 0))
+            )
+            for item in results
+        ]
+    
+    def _parse_timestamp(self, timestamp_str: str) -> datetime:
+        """Parsuje string czasowy z API na obiekt datetime."""
+        if len(timestamp_str) <= 10:  # Format daty: YYYY-MM-DD
+            return datetime.strptime(timestamp_str, "%Y-%m-%d")
+        else:  # Format daty i czasu: YYYY-MM-DD HH:MM:SS
+            return datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+    
+    def _ingest(self, time_series: Dict[str, Dict[str, Any]]) -> PriceSeries:
+        """Zamienia szereg czasowy z API na kolumny (hurtowo, z walidacją całej partii)."""
+        series, rejected = ingest_time_series(time_series)
+        if rejected:
+            print(f"[WARNING][Repository] Odrzucono {rejected} nieprawidłowych świec")
+        print(f"[DEBUG][Repository] Zmapowano {len(series)} punktów cenowych")
+        return series
+    
+    def _slice(self, series: PriceSeries, start_date: Optional[datetime],
+               end_date: Optional[datetime]) -> PriceSeries:
+        """Filtruje świece po datach - wyszukiwanie binarne w posortowanych kolumnach."""
+        if not (start_date or end_date):
+            return series
+        window = series.between(
+            datetime_to_epoch(start_date) if start_date else None,
+            datetime_to_epoch(end_date) if end_date else None
+        )
+        print(f"[DEBUG][Repository] Po filtrowaniu zostało {len(window)} punktów danych")
+        return window
+    
+    def _extract_metadata(self, data: Dict[str, Any], interval: str) -> Dict[str, Any]:
+        """Wyciąga metadane z odpowiedzi API."""
+        print(f"[DEBUG][Repository] Ekstrakcja metadanych dla interwału {interval}")
+        print(f"[DEBUG][Repository] Klucze w odpowiedzi API: {list(data.keys())}")
+        
+        metadata_key = next((k for k in data.keys() if "Meta Data" in k or k.startswith("Meta")), None)
+        if not metadata_key:
+            error_msg = "Brak metadanych w odpowiedzi API"
+            print(f"[ERROR][Repository] {error_msg}. Dostępne klucze: {list(data.keys())}")
+            raise ValueError(error_msg)
+            
+        metadata = data[metadata_key]
+        print(f"[DEBUG][Repository] Klucze metadanych: {list(metadata.keys())}")
+        
+        # Klucze metadanych mogą się różnić w zależności od API
+        symbol_key = next((k for k in metadata.keys() if "Symbol" in k or "symbol" in k), "1. Symbol")
+        last_refreshed_key = next((k for k in metadata.keys() if "Last Refreshed" in k), "3. Last Refreshed")
+        
+        symbol = metadata.get(symbol_key, "")
+        last_refreshed_str = metadata.get(last_refreshed_key, "")
+        
+        print(f"[DEBUG][Repository] Metadane - symbol: {symbol}, last_refreshed: {last_refreshed_str}")
+        
+        try:
+            last_refreshed = self._parse_timestamp(last_refreshed_str)
+        except Exception as e:
+            print(f"[ERROR][Repository] Błąd parsowania daty '{last_refreshed_str}': {str(e)}")
+            # Fallback do aktualnej daty jeśli nie można sparsować
+            last_refreshed = datetime.now()
+        
+        return {
+            "symbol": symbol,
+            "last_refreshed": last_refreshed
+        }
+    
+    def _extract_time_series(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Wyciąga szereg czasowy z odpowiedzi API."""
+        print(f"[DEBUG][Repository] Ekstrakcja szeregu czasowego")
+        print(f"[DEBUG][Repository] Klucze w odpowiedzi API: {list(data.keys())}")
+        
+        time_series_key = next((k for k in data.keys() if "Time Series" in k), None)
+        if not time_series_key:
+            error_msg = "Brak szeregu czasowego w odpowiedzi API"
+            print(f"[ERROR][Repository] {error_msg}. Dostępne klucze: {list(data.keys())}")
+            if 'Error Message' in data:
+                print(f"[ERROR][Repository] Alpha Vantage Error: {data['Error Message']}")
+            if 'Information' in data:
+                print(f"[ERROR][Repository] Alpha Vantage Information: {data['Information']}")
+            raise ValueError(error_msg)
+            
+        return data[time_series_key]
+    
+    def _build_daily_data(self, symbol: str, data: Dict[str, Any],
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> StockData:
+        """Buduje dzienne dane (opcjonalnie przefiltrowane po datach) z odpowiedzi API."""
+        if not data:
+            print(f"[ERROR][Repository] Pusta odpowiedź z API dla {symbol}")
+            raise ValueError(f"Pusta odpowiedź z API dla symbolu {symbol}")
+        
+        # Sprawdź, czy mamy komunikat o błędzie od Alpha Vantage
+        if 'Error Message' in data:
+            error_msg = data['Error Message']
+            print(f"[ERROR][Repository] Alpha Vantage zwrócił błąd: {error_msg}")
+            raise ValueError(f"Alpha Vantage error: {error_msg}")
+        
+        if 'Information' in data:
+            info_msg = data['Information']
+            print(f"[WARNING][Repository] Alpha Vantage zwrócił informację: {info_msg}")
+            if 'API call frequency' in info_msg:
+                raise ValueError(f"Przekroczono limit zapytań do Alpha Vantage: {info_msg}")
+        
+        try:
+            metadata = self._extract_metadata(data, "daily")
+        except Exception as e:
+            print(f"[ERROR][Repository] Błąd podczas ekstakcji metadanych: {str(e)}")
+            import traceback
+            print(f"[ERROR][Repository] Traceback: {traceback.format_exc()}")
+            raise
+        
+        try:
+            time_series = self._extract_time_series(data)
+            print(f"[DEBUG][Repository] Liczba punktów w szeregu czasowym: {len(time_series)}")
+        except Exception as e:
+            print(f"[ERROR][Repository] Błąd podczas ekstakcji szeregu czasowego: {str(e)}")
+            print(f"[DEBUG][Repository] Zawartość odpowiedzi API: {data}")
+            import traceback
+            print(f"[ERROR][Repository] Traceback: {traceback.format_exc()}")
+            raise
+        
+        series = self._slice(self._ingest(time_series), start_date, end_date)
+        
+        result = StockData(
+            symbol=metadata["symbol"],
+            series=series,
+            interval="daily",
+            last_refreshed=metadata["last_refreshed"]
+        )
+        
+        print(f"[DEBUG][Repository] Zwracam dane dla {symbol} - liczba punktów: {len(result.series)}")
+        return result
+    
+    def _build_stock_data(self, data: Dict[str, Any], interval: str,
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> StockData:
+        """Buduje dane tygodniowe, miesięczne lub śróddzienne (opcjonalnie przefiltrowane po datach) z odpowiedzi API."""
+        metadata = self._extract_metadata(data, interval)
+        time_series = self._extract_time_series(data)
+        
+        return StockData(
+            symbol=metadata["symbol"],
+            series=self._slice(self._ingest(time_series), start_date, end_date),
+            interval=interval,
+            last_refreshed=metadata["last_refreshed"]
+        )
\ No newline at end of file
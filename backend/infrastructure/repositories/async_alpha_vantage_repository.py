@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import List, Optional
+import re
+
+from domain.entities.stock_data import StockData, StockMetadata
+from domain.repositories.async_stock_repository import AsyncStockRepository
+from infrastructure.apis.async_alpha_vantage_api import AsyncAlphaVantageAPI
+from infrastructure.repositories.alpha_vantage_mapper import AlphaVantagePayloadMapper
+from infrastructure.repositories.fetch_planner import FetchPlanner
+
+
+class AsyncAlphaVantageRepository(AsyncStockRepository, AlphaVantagePayloadMapper):
+    """Asynchroniczna implementacja repozytorium danych giełdowych korzystająca z API Alpha Vantage."""
+    
+    def __init__(self, api: AsyncAlphaVantageAPI, planner: Optional[FetchPlanner] = None):
+        self.api = api
+        self.planner = planner or FetchPlanner()
+    
+    async def search_stocks(self, query: str) -> List[StockMetadata]:
+        """Wyszukuje instrumenty giełdowe na podstawie zapytania."""
+        results = await self.api.search_symbol(query)
+        return self._map_search_results(results)
+    
+    async def get_daily_data(self, symbol: str, start_date: Optional[datetime] = None, 
+                            end_date: Optional[datetime] = None,
+                            output_size: Optional[str] = None) -> StockData:
+        """Pobiera dzienne dane historyczne dla danego symbolu."""
+        print(f"[DEBUG][AsyncRepository] Pobieranie danych dziennych - symbol: {symbol}, start_date: {start_date}, end_date: {end_date}")
+        
+        # Rozmiar zapytania dobierany do okna (chyba że wywołujący wskazał go wprost)
+        if not output_size:
+            output_size = self.planner.output_size_for_dates("daily", start_date, end_date)
+        
+        try:
+            data = await self.api.get_daily_data(symbol, output_size)
+            return self._build_daily_data(symbol, data, start_date, end_date)
+        except Exception as e:
+            print(f"[ERROR][AsyncRepository] Błąd podczas pobierania danych dziennych dla {symbol}: {str(e)}")
+            raise
+    
+    async def get_intraday_data(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                                end_date: Optional[datetime] = None,
+                                output_size: Optional[str] = None) -> StockData:
+        """Pobiera dane śróddzienne dla danego symbolu z określonym interwałem."""
+        # Sprawdzenie poprawności interwału
+        if not re.match(r"^\d+min$", interval):
+            raise ValueError(f"Nieprawidłowy interwał: {interval}")
+        
+        if not output_size:
+            output_size = self.planner.output_size_for_dates(f"intraday_{interval}", start_date, end_date)
+        data = await self.api.get_intraday_data(symbol, interval, output_size)
+        return self._build_stock_data(data, f"intraday_{interval}", start_date, end_date)
+    
+    async def get_weekly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera tygodniowe dane dla danego symbolu."""
+        # Alpha Vantage zwraca zawsze pełną historię tygodniową
+        data = await self.api.get_weekly_data(symbol)
+        return self._build_stock_data(data, "weekly", start_date, end_date)
+    
+    async def get_monthly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera miesięczne dane dla danego symbolu."""
+        # Alpha Vantage zwraca zawsze pełną historię miesięczną
+        data = await self.api.get_monthly_data(symbol)
+        return self._build_stock_data(data, "monthly", start_date, end_date)
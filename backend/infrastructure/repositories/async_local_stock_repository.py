@@ -0,0 +1,123 @@
+import asyncio
+import re
+from datetime import datetime
+from typing import List, Optional, Dict
+
+from domain.entities.stock_data import StockData, StockMetadata
+from domain.repositories.async_stock_repository import AsyncStockRepository
+from domain.services.market_calendar import MarketCalendar
+from domain.services.resampling import resample_sources
+from infrastructure.apis.single_flight import AsyncSingleFlight
+from infrastructure.repositories.fetch_planner import FetchPlanner, FULL
+from infrastructure.repositories.local_stock_repository import LocalSeriesMixin
+from infrastructure.storage.ohlcv_store import OhlcvStore, StoredSeries
+
+
+class AsyncLocalStockRepository(LocalSeriesMixin, AsyncStockRepository):
+    """
+    Asynchroniczne repozytorium z lokalnym magazynem świec.
+
+    Działa tak samo jak LocalStockRepository, ale oczekiwanie na źródło nie
+    blokuje wątku, a operacje na plikach magazynu wykonywane są w puli wątków,
+    aby nie wstrzymywać pętli zdarzeń.
+    """
+
+    def __init__(self, upstream: AsyncStockRepository, store: OhlcvStore,
+                 max_age: Optional[Dict[str, int]] = None,
+                 planner: Optional[FetchPlanner] = None,
+                 calendar: Optional[MarketCalendar] = None):
+        super().__init__(upstream, store, max_age, planner, calendar)
+        self.single_flight = AsyncSingleFlight()
+
+    async def _fetch_upstream(self, symbol: str, interval: str, output_size: str) -> StockData:
+        if interval == "daily":
+            return await self.upstream.get_daily_data(symbol, output_size=output_size)
+        if interval == "weekly":
+            return await self.upstream.get_weekly_data(symbol)
+        if interval == "monthly":
+            return await self.upstream.get_monthly_data(symbol)
+        return await self.upstream.get_intraday_data(symbol, interval.split("_")[1], output_size=output_size)
+
+    async def _sync(self, symbol: str, interval: str, stored: Optional[StoredSeries],
+                    output_size: str) -> StoredSeries:
+        """Dociąga brakujące świece ze źródła i scala je z magazynem."""
+        print(f"[DEBUG][AsyncLocalRepository] Synchronizacja {symbol}/{interval} - output_size: {output_size}")
+
+        data = await self._fetch_upstream(symbol, interval, output_size)
+
+        # Compact nie sięga do końca zapisanego szeregu - potrzebna pełna historia
+        if self._leaves_gap(data, stored, output_size):
+            print(f"[DEBUG][AsyncLocalRepository] Luka w danych {symbol}/{interval} - pobieram pełną historię")
+            output_size = FULL
+            data = await self._fetch_upstream(symbol, interval, output_size)
+
+        complete = output_size == FULL or bool(stored is not None and stored.meta.get("complete"))
+        return await asyncio.to_thread(self._merge, symbol, interval, data, complete)
+
+    async def _get_series(self, symbol: str, interval: str,
+                          start_date: Optional[datetime] = None, refresh: bool = False) -> StoredSeries:
+        stored = await asyncio.to_thread(self.store.read, symbol, interval)
+
+        output_size = self._plan(stored, interval, start_date, refresh)
+        if output_size is None:
+            print(f"[DEBUG][AsyncLocalRepository] {symbol}/{interval} z magazynu lokalnego - świec: {len(stored)}")
+            return stored
+
+        # Drobniejsze świece są już w magazynie - interwał budujemy lokalnie zamiast osobnego zapytania
+        candidates = {}
+        for source in resample_sources(interval):
+            candidates[source] = await asyncio.to_thread(self.store.read, symbol, source)
+        source = self._pick_source(candidates, start_date)
+        if source is not None:
+            print(f"[DEBUG][AsyncLocalRepository] {symbol}/{interval} budowany lokalnie ze świec {source}")
+            source_series = await self._get_series(symbol, source, start_date, refresh)
+            return await asyncio.to_thread(self._resampled, source_series, interval)
+
+        try:
+            # Równoczesne żądania tego samego szeregu czekają na jedną synchronizację
+            return await self.single_flight.do(
+                f"{symbol.upper()}/{interval}/{output_size}",
+                lambda: self._sync(symbol, interval, stored, output_size)
+            )
+        except Exception as e:
+            # Wymuszone odświeżenie zgłasza błąd - wywołujący zdecyduje, kiedy ponowić próbę
+            if stored is None or refresh:
+                raise
+            # Źródło niedostępne - lepiej zwrócić nieco starsze dane niż błąd
+            print(f"[WARNING][AsyncLocalRepository] Nie udało się odświeżyć {symbol}/{interval}, zwracam dane z magazynu: {str(e)}")
+            return stored
+
+    async def refresh(self, symbol: str, interval: str, start_date: Optional[datetime] = None) -> StoredSeries:
+        """Synchronizuje szereg od start_date (domyślnie całą historię) ze źródłem niezależnie od jego świeżości."""
+        return await self._get_series(symbol, interval, start_date, refresh=True)
+
+    async def search_stocks(self, query: str) -> List[StockMetadata]:
+        """Wyszukuje instrumenty giełdowe na podstawie zapytania."""
+        return await self.upstream.search_stocks(query)
+
+    async def get_daily_data(self, symbol: str, start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dzienne dane historyczne dla danego symbolu."""
+        series = await self._get_series(symbol, "daily", start_date)
+        return self._to_stock_data(series, "daily", start_date, end_date)
+
+    async def get_intraday_data(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                                end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dane śróddzienne dla danego symbolu z określonym interwałem."""
+        if not re.match(r"^\d+min$", interval):
+            raise ValueError(f"Nieprawidłowy interwał: {interval}")
+
+        series = await self._get_series(symbol, f"intraday_{interval}", start_date)
+        return self._to_stock_data(series, f"intraday_{interval}", start_date, end_date)
+
+    async def get_weekly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera tygodniowe dane dla danego symbolu."""
+        series = await self._get_series(symbol, "weekly", start_date)
+        return self._to_stock_data(series, "weekly", start_date, end_date)
+
+    async def get_monthly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera miesięczne dane dla danego symbolu."""
+        series = await self._get_series(symbol, "monthly", start_date)
+        return self._to_stock_data(series, "monthly", start_date, end_date)
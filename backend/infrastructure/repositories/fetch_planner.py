@@ -0,0 +1,114 @@
+import re
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.stock_data import datetime_to_epoch
+from domain.services.market_calendar import MarketCalendar
+from infrastructure.storage.ohlcv_store import StoredSeries
+
+
+# Liczba świec zwracanych przez Alpha Vantage dla outputsize=compact
+COMPACT_BARS = 100
+
+# Zapytania, które można wykonać przez Alpha Vantage
+COMPACT = "compact"
+FULL = "full"
+
+
+def market_clock() -> int:
+    """
+    Bieżący czas w kodowaniu znaczników świec (sekundy od epoki).
+
+    Znaczniki świec to czas giełdy (nowojorski) zakodowany jak UTC (timegm),
+    więc time.time() zawyżałby wiek świec o 4-5 godzin.
+    """
+    return datetime_to_epoch(datetime.now(MarketCalendar.TIMEZONE).replace(tzinfo=None))
+
+
+class FetchPlanner:
+    """
+    Planuje najtańsze pobranie danych dla żądanego okna czasowego.
+
+    Okno obsługiwane jest kolejno: z lokalnego magazynu (jeśli zawiera
+    świeże dane sięgające początku okna), zapytaniem outputsize=compact
+    (jeśli 100 ostatnich świec na pewno wystarczy) albo pełną historią.
+    Liczba świec w oknie szacowana jest z czasu kalendarzowego, który
+    przeszacowuje liczbę świec sesyjnych - "compact" wybierany jest więc
+    tylko wtedy, gdy na pewno pokryje okno.
+    """
+
+    # Interwały, dla których Alpha Vantage nie udostępnia outputsize=compact
+    FULL_ONLY = ("weekly", "monthly")
+
+    def __init__(self, compact_bars: int = COMPACT_BARS):
+        self.compact_bars = compact_bars
+
+    @staticmethod
+    def interval_seconds(interval: str) -> int:
+        """Zwraca przybliżoną szerokość świecy w sekundach."""
+        if interval.startswith("intraday"):
+            return int(re.sub(r"\D", "", interval)) * 60
+        return {"daily": 86400, "weekly": 7 * 86400, "monthly": 30 * 86400}[interval]
+
+    def _fits_compact(self, interval: str, since_ts: float, now: float) -> bool:
+        if interval in self.FULL_ONLY:
+            return False
+        return (now - since_ts) / self.interval_seconds(interval) < self.compact_bars
+
+    def output_size_for_window(self, interval: str, start_ts: Optional[int],
+                               now: Optional[float] = None) -> str:
+        """
+        Wybiera rozmiar zapytania do źródła pokrywający okno od start_ts do teraz.
+
+        Args:
+            interval: Interwał ("daily", "weekly", "monthly", "intraday_5min", ...)
+            start_ts: Początek okna (sekundy od epoki) lub None - cała historia
+            now: Bieżący czas w kodowaniu znaczników świec (domyślnie market_clock())
+        """
+        if start_ts is None:
+            return FULL
+        now = market_clock() if now is None else now
+        return COMPACT if self._fits_compact(interval, start_ts, now) else FULL
+
+    def output_size_for_dates(self, interval: str, start_date: Optional[datetime],
+                              end_date: Optional[datetime] = None) -> str:
+        """
+        Wybiera rozmiar zapytania dla okna podanego datami (bez lokalnego magazynu).
+
+        Bez dat zachowywane jest dotychczasowe zachowanie - "compact".
+        """
+        if start_date:
+            return self.output_size_for_window(interval, datetime_to_epoch(start_date))
+        return FULL if end_date else COMPACT
+
+    def covers(self, stored: Optional[StoredSeries], start_ts: Optional[int]) -> bool:
+        """Sprawdza, czy zapisany szereg obejmuje początek okna."""
+        if stored is None or not len(stored):
+            return False
+        if stored.meta.get("complete"):
+            return True
+        return start_ts is not None and stored.first_timestamp <= start_ts
+
+    def plan(self, interval: str, stored: Optional[StoredSeries], start_ts: Optional[int],
+             fresh: bool, now: Optional[float] = None) -> Optional[str]:
+        """
+        Wybiera źródło danych dla okna.
+
+        Args:
+            interval: Interwał danych
+            stored: Szereg z lokalnego magazynu (lub None)
+            start_ts: Początek okna (sekundy od epoki) lub None - cała historia
+            fresh: Czy zapisany szereg jest wystarczająco aktualny
+            now: Bieżący czas w kodowaniu znaczników świec (domyślnie market_clock())
+
+        Returns:
+            None, jeśli okno można obsłużyć z magazynu, w przeciwnym razie
+            outputsize zapytania do źródła ("compact" lub "full")
+        """
+        now = market_clock() if now is None else now
+        if self.covers(stored, start_ts):
+            if fresh:
+                return None
+            # Brakuje jedynie ogona szeregu
+            return COMPACT if self._fits_compact(interval, stored.last_timestamp, now) else FULL
+        return self.output_size_for_window(interval, start_ts, now)
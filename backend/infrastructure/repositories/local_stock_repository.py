@@ -0,0 +1,227 @@
+import re
+import time
+from datetime import datetime
+from typing import List, Optional, Dict
+
+from domain.entities.stock_data import StockData, StockMetadata
+from domain.repositories.stock_repository import StockRepository
+from domain.services.market_calendar import MarketCalendar
+from domain.services.resampling import resample, resample_sources
+from infrastructure.apis.single_flight import SingleFlight
+from infrastructure.cache.response_cache import CLOSE_PUBLICATION_DELAY
+from infrastructure.repositories.fetch_planner import FetchPlanner, FULL
+from infrastructure.storage.ohlcv_store import OhlcvStore, StoredSeries, datetime_to_epoch
+
+# Domyślny czas (w sekundach), przez jaki zapisany szereg uznajemy za aktualny
+DEFAULT_MAX_AGE = {
+    "intraday": 5 * 60,
+    "daily": 6 * 60 * 60,
+    "weekly": 12 * 60 * 60,
+    "monthly": 12 * 60 * 60,
+}
+
+
+class LocalSeriesMixin:
+    """
+    Wspólna logika repozytoriów z lokalnym magazynem świec (synchronicznego
+    i asynchronicznego): ocena świeżości, planowanie pobrania okna, scalanie
+    pobranych danych z magazynem i wycinanie okna z encji StockData.
+    """
+
+    def __init__(self, upstream, store: OhlcvStore, max_age: Optional[Dict[str, int]] = None,
+                 planner: Optional[FetchPlanner] = None, calendar: Optional[MarketCalendar] = None):
+        self.upstream = upstream
+        self.store = store
+        self.max_age = dict(DEFAULT_MAX_AGE)
+        if max_age:
+            self.max_age.update(max_age)
+        self.planner = planner or FetchPlanner()
+        self.calendar = calendar or MarketCalendar()
+
+    def _max_age_for(self, interval: str) -> int:
+        kind = "intraday" if interval.startswith("intraday") else interval
+        return self.max_age.get(kind, DEFAULT_MAX_AGE["daily"])
+
+    def fresh_until(self, stored: StoredSeries, interval: str) -> float:
+        """
+        Zwraca chwilę (sekundy od epoki), do której zapisany szereg uznajemy za aktualny.
+
+        Szereg zsynchronizowany po publikacji świec ostatniej sesji nie zmieni
+        się przed otwarciem kolejnej - jego wiek liczymy więc od tego otwarcia.
+        """
+        synced = datetime.fromtimestamp(stored.synced_at, self.calendar.TIMEZONE)
+        next_open = self.calendar.next_open(synced)
+        synced_at = stored.synced_at
+        if next_open < self.calendar.next_publication(synced, CLOSE_PUBLICATION_DELAY):
+            synced_at = next_open.timestamp()
+        return synced_at + self._max_age_for(interval)
+
+    def _is_fresh(self, stored: Optional[StoredSeries], interval: str) -> bool:
+        return stored is not None and time.time() < self.fresh_until(stored, interval)
+
+    def _plan(self, stored: Optional[StoredSeries], interval: str,
+              start_date: Optional[datetime], refresh: bool = False) -> Optional[str]:
+        """Zwraca outputsize zapytania do źródła lub None, jeśli okno jest w magazynie."""
+        start_ts = datetime_to_epoch(start_date) if start_date else None
+        fresh = not refresh and self._is_fresh(stored, interval)
+        return self.planner.plan(interval, stored, start_ts, fresh)
+
+    def _pick_source(self, candidates: Dict[str, Optional[StoredSeries]],
+                     start_date: Optional[datetime]) -> Optional[str]:
+        """
+        Wybiera zapisany szereg drobniejszego interwału, który obejmuje okno.
+
+        Pierwszeństwo mają szeregi świeże (bez zapytania do źródła), a wśród
+        nich - zgodnie z kolejnością kandydatów - najgrubsze.
+        """
+        start_ts = datetime_to_epoch(start_date) if start_date else None
+        covering = [source for source, stored in candidates.items() if self.planner.covers(stored, start_ts)]
+        for source in covering:
+            if self._is_fresh(candidates[source], source):
+                return source
+        return covering[0] if covering else None
+
+    def _resampled(self, source: StoredSeries, interval: str) -> StoredSeries:
+        """Buduje szereg o grubszym interwale ze świec zapisanego szeregu (bez zapisu do magazynu)."""
+        series = resample(source.to_price_series(), interval)
+        return StoredSeries(series.columns(), dict(source.meta))
+
+    def _leaves_gap(self, data: StockData, stored: Optional[StoredSeries], output_size: str) -> bool:
+        """Sprawdza, czy odpowiedź compact nie sięga do końca zapisanego szeregu."""
+        return (output_size == "compact" and len(data.series) > 0 and stored is not None
+                and int(data.series.timestamp[0]) > stored.last_timestamp)
+
+    def _merge(self, symbol: str, interval: str, data: StockData, complete: bool) -> StoredSeries:
+        """Scala pobrane świece z magazynem."""
+        columns = data.series.columns()
+        meta = {
+            "symbol": data.symbol,
+            "name": data.name,
+            "last_refreshed": data.last_refreshed.isoformat(),
+            # Szereg zawiera całą historię dostępną w źródle
+            "complete": complete,
+        }
+        return self.store.merge(symbol, interval, columns, meta)
+
+    def _to_stock_data(self, series: StoredSeries, interval: str,
+                       start_date: Optional[datetime] = None,
+                       end_date: Optional[datetime] = None) -> StockData:
+        """Buduje encję StockData z zapisanych kolumn (bez kopiowania danych)."""
+        start_ts = datetime_to_epoch(start_date) if start_date else None
+        end_ts = datetime_to_epoch(end_date) if end_date else None
+        window = series.to_price_series().between(start_ts, end_ts)
+
+        return StockData(
+            symbol=series.meta.get("symbol", ""),
+            name=series.meta.get("name"),
+            series=window,
+            interval=interval,
+            last_refreshed=datetime.fromisoformat(series.meta["last_refreshed"])
+        )
+
+
+class LocalStockRepository(LocalSeriesMixin, StockRepository):
+    """
+    Repozytorium danych giełdowych z trwałym, lokalnym magazynem świec.
+
+    Opakowuje repozytorium Alpha Vantage: świeże dane są serwowane z dysku
+    bez zużywania limitu zapytań, a po ich przedawnieniu ze źródła pobierany
+    jest jedynie brakujący ogon szeregu (outputsize=compact), który zostaje
+    scalony z magazynem.
+    """
+
+    def __init__(self, upstream: StockRepository, store: OhlcvStore,
+                 max_age: Optional[Dict[str, int]] = None,
+                 calendar: Optional[MarketCalendar] = None):
+        super().__init__(upstream, store, max_age, calendar=calendar)
+        self.single_flight = SingleFlight()
+
+    def _fetch_upstream(self, symbol: str, interval: str, output_size: str) -> StockData:
+        if interval == "daily":
+            return self.upstream.get_daily_data(symbol, output_size=output_size)
+        if interval == "weekly":
+            return self.upstream.get_weekly_data(symbol)
+        if interval == "monthly":
+            return self.upstream.get_monthly_data(symbol)
+        return self.upstream.get_intraday_data(symbol, interval.split("_")[1], output_size=output_size)
+
+    def _sync(self, symbol: str, interval: str, stored: Optional[StoredSeries],
+              output_size: str) -> StoredSeries:
+        """Dociąga brakujące świece ze źródła i scala je z magazynem."""
+        print(f"[DEBUG][LocalRepository] Synchronizacja {symbol}/{interval} - output_size: {output_size}")
+
+        data = self._fetch_upstream(symbol, interval, output_size)
+
+        # Compact nie sięga do końca zapisanego szeregu - potrzebna pełna historia
+        if self._leaves_gap(data, stored, output_size):
+            print(f"[DEBUG][LocalRepository] Luka w danych {symbol}/{interval} - pobieram pełną historię")
+            output_size = FULL
+            data = self._fetch_upstream(symbol, interval, output_size)
+
+        complete = output_size == FULL or bool(stored is not None and stored.meta.get("complete"))
+        return self._merge(symbol, interval, data, complete)
+
+    def _get_series(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                    refresh: bool = False) -> StoredSeries:
+        stored = self.store.read(symbol, interval)
+
+        output_size = self._plan(stored, interval, start_date, refresh)
+        if output_size is None:
+            print(f"[DEBUG][LocalRepository] {symbol}/{interval} z magazynu lokalnego - świec: {len(stored)}")
+            return stored
+
+        # Drobniejsze świece są już w magazynie - interwał budujemy lokalnie zamiast osobnego zapytania
+        candidates = {source: self.store.read(symbol, source) for source in resample_sources(interval)}
+        source = self._pick_source(candidates, start_date)
+        if source is not None:
+            print(f"[DEBUG][LocalRepository] {symbol}/{interval} budowany lokalnie ze świec {source}")
+            return self._resampled(self._get_series(symbol, source, start_date, refresh), interval)
+
+        try:
+            # Równoczesne żądania tego samego szeregu czekają na jedną synchronizację
+            return self.single_flight.do(
+                f"{symbol.upper()}/{interval}/{output_size}",
+                lambda: self._sync(symbol, interval, stored, output_size)
+            )
+        except Exception as e:
+            # Wymuszone odświeżenie zgłasza błąd - wywołujący zdecyduje, kiedy ponowić próbę
+            if stored is None or refresh:
+                raise
+            # Źródło niedostępne - lepiej zwrócić nieco starsze dane niż błąd
+            print(f"[WARNING][LocalRepository] Nie udało się odświeżyć {symbol}/{interval}, zwracam dane z magazynu: {str(e)}")
+            return stored
+
+    def refresh(self, symbol: str, interval: str, start_date: Optional[datetime] = None) -> StoredSeries:
+        """Synchronizuje szereg od start_date (domyślnie całą historię) ze źródłem niezależnie od jego świeżości."""
+        return self._get_series(symbol, interval, start_date, refresh=True)
+
+    def search_stocks(self, query: str) -> List[StockMetadata]:
+        """Wyszukuje instrumenty giełdowe na podstawie zapytania."""
+        return self.upstream.search_stocks(query)
+
+    def get_daily_data(self, symbol: str, start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dzienne dane historyczne dla danego symbolu."""
+        series = self._get_series(symbol, "daily", start_date)
+        return self._to_stock_data(series, "daily", start_date, end_date)
+
+    def get_intraday_data(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dane śróddzienne dla danego symbolu z określonym interwałem."""
+        if not re.match(r"^\d+min$", interval):
+            raise ValueError(f"Nieprawidłowy interwał: {interval}")
+
+        series = self._get_series(symbol, f"intraday_{interval}", start_date)
+        return self._to_stock_data(series, f"intraday_{interval}", start_date, end_date)
+
+    def get_weekly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera tygodniowe dane dla danego symbolu."""
+        series = self._get_series(symbol, "weekly", start_date)
+        return self._to_stock_data(series, "weekly", start_date, end_date)
+
+    def get_monthly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera miesięczne dane dla danego symbolu."""
+        series = self._get_series(symbol, "monthly", start_date)
+        return self._to_stock_data(series, "monthly", start_date, end_date)
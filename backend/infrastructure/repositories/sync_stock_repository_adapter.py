@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import List, Optional
+
+from domain.entities.stock_data import StockData, StockMetadata
+from domain.repositories.async_stock_repository import AsyncStockRepository
+from domain.repositories.stock_repository import StockRepository
+from infrastructure.apis.event_loop_thread import EventLoopThread
+
+
+class SyncStockRepositoryAdapter(StockRepository):
+    """
+    Adapter udostępniający repozytorium asynchroniczne przez synchroniczny interfejs StockRepository.
+
+    Korutyny repozytorium wykonywane są we współdzielonej pętli zdarzeń,
+    dzięki czemu kod synchroniczny korzysta z tych samych połączeń, pamięci
+    podręcznej i łączenia zapytań co ścieżka asynchroniczna.
+    """
+    
+    def __init__(self, repository: AsyncStockRepository, loop_thread: EventLoopThread):
+        self.repository = repository
+        self.loop_thread = loop_thread
+    
+    def search_stocks(self, query: str) -> List[StockMetadata]:
+        """Wyszukuje instrumenty giełdowe na podstawie zapytania."""
+        return self.loop_thread.run(self.repository.search_stocks(query))
+    
+    def get_daily_data(self, symbol: str, start_date: Optional[datetime] = None, 
+                      end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dzienne dane historyczne dla danego symbolu."""
+        return self.loop_thread.run(self.repository.get_daily_data(symbol, start_date, end_date))
+    
+    def get_intraday_data(self, symbol: str, interval: str, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera dane śróddzienne dla danego symbolu z określonym interwałem."""
+        return self.loop_thread.run(self.repository.get_intraday_data(symbol, interval, start_date, end_date))
+    
+    def get_weekly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera tygodniowe dane dla danego symbolu."""
+        return self.loop_thread.run(self.repository.get_weekly_data(symbol, start_date, end_date))
+    
+    def get_monthly_data(self, symbol: str, start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None) -> StockData:
+        """Pobiera miesięczne dane dla danego symbolu."""
+        return self.loop_thread.run(self.repository.get_monthly_data(symbol, start_date, end_date))
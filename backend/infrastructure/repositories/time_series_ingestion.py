@@ -0,0 +1,97 @@
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries, datetime_to_epoch
+
+
+# Pola świecy w odpowiedzi Alpha Vantage, w kolejności kolumn PriceSeries
+PRICE_FIELDS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+
+_get_fields = itemgetter(*PRICE_FIELDS)
+
+
+def parse_timestamps(keys: List[str]) -> np.ndarray:
+    """
+    Parsuje znaczniki czasu Alpha Vantage ("YYYY-MM-DD" lub "YYYY-MM-DD HH:MM:SS")
+    na sekundy od epoki - jednym wywołaniem NumPy dla całej kolumny.
+    """
+    return np.array(keys, dtype="datetime64[s]").astype(np.int64)
+
+
+def ingest_time_series(time_series: Dict[str, Dict[str, Any]]) -> Tuple[PriceSeries, int]:
+    """
+    Zamienia słownik "Time Series (...)" na kolumny posortowane rosnąco po czasie.
+
+    Daty i liczby są parsowane dla całych kolumn naraz, a poprawność danych
+    sprawdzana jest raz dla całej partii. Jeśli partii nie da się
+    przetworzyć hurtowo (brakujące pola, nieprawidłowe wartości), dane są
+    przetwarzane wiersz po wierszu z pominięciem błędnych świec.
+
+    Args:
+        time_series: Słownik znacznik czasu -> pola świecy
+
+    Returns:
+        Szereg kolumnowy i liczba odrzuconych świec
+    """
+    if not time_series:
+        return PriceSeries.empty(), 0
+
+    rejected = 0
+    try:
+        timestamps = parse_timestamps(list(time_series.keys()))
+        values = np.array(
+            [field for bar in time_series.values() for field in _get_fields(bar)], dtype=np.float64
+        ).reshape(-1, len(PRICE_FIELDS))
+    except (KeyError, ValueError, TypeError):
+        timestamps, values, rejected = _parse_rows(time_series)
+
+    # Walidacja całej partii: ceny i wolumen muszą być skończone i nieujemne
+    valid = np.isfinite(values).all(axis=1) & (values >= 0).all(axis=1)
+    invalid = int(len(valid) - np.count_nonzero(valid))
+    if invalid:
+        rejected += invalid
+        timestamps = timestamps[valid]
+        values = values[valid]
+
+    # Alpha Vantage zwraca świece od najnowszych - wystarczy odwrócić kolejność
+    if len(timestamps) > 1 and (np.diff(timestamps) < 0).all():
+        order = slice(None, None, -1)
+    else:
+        order = np.argsort(timestamps, kind="stable")
+
+    series = PriceSeries(
+        np.ascontiguousarray(timestamps[order]),
+        np.ascontiguousarray(values[order, 0]),
+        np.ascontiguousarray(values[order, 1]),
+        np.ascontiguousarray(values[order, 2]),
+        np.ascontiguousarray(values[order, 3]),
+        values[order, 4].astype(np.int64)
+    )
+    return series, rejected
+
+
+def _parse_row_timestamp(timestamp_str: str) -> datetime:
+    if len(timestamp_str) <= 10:  # Format daty: YYYY-MM-DD
+        return datetime.strptime(timestamp_str, "%Y-%m-%d")
+    return datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+
+
+def _parse_rows(time_series: Dict[str, Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Wolniejsza ścieżka wiersz po wierszu - pomija świece, których nie da się sparsować."""
+    timestamps = []
+    rows = []
+    rejected = 0
+    for timestamp_str, price_data in time_series.items():
+        try:
+            timestamp = datetime_to_epoch(_parse_row_timestamp(timestamp_str))
+            rows.append([float(price_data.get(field, 0)) for field in PRICE_FIELDS])
+            timestamps.append(timestamp)
+        except Exception as e:
+            print(f"[WARNING][Ingestion] Błąd mapowania ceny dla '{timestamp_str}': {str(e)}")
+            rejected += 1
+
+    values = np.array(rows, dtype=np.float64).reshape(-1, len(PRICE_FIELDS))
+    return np.array(timestamps, dtype=np.int64), values, rejected
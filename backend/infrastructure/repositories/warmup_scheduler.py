@@ -0,0 +1,224 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from domain.services.market_calendar import MarketCalendar
+from domain.services.resampling import INTRADAY_MINUTES, intraday_minutes
+from infrastructure.apis.event_loop_thread import EventLoopThread
+from infrastructure.apis.request_scheduler import RateLimitExceeded, RequestPriority, request_priority
+from infrastructure.cache.response_cache import CLOSE_PUBLICATION_DELAY
+from infrastructure.repositories.async_local_stock_repository import AsyncLocalStockRepository
+
+# Symbole z listy popularnych instrumentów we frontendzie
+POPULAR_SYMBOLS = ("AAPL", "MSFT", "GOOGL", "AMZN", "AAF.LON", "AAFRF")
+
+WatchKey = Tuple[str, str]
+
+
+def is_supported_interval(interval: str) -> bool:
+    """Sprawdza, czy interwał może być przechowywany w magazynie (daily, weekly, monthly, intraday_*min)."""
+    if interval in ("daily", "weekly", "monthly"):
+        return True
+    return intraday_minutes(interval) in INTRADAY_MINUTES
+
+
+def parse_watchlist(value: str, default_interval: str = "daily") -> List[WatchKey]:
+    """
+    Odczytuje listę obserwowanych szeregów w postaci "AAPL,MSFT:intraday_5min,IBM:weekly".
+
+    Pozycje bez interwału dotyczą default_interval; nieobsługiwane interwały są pomijane.
+    """
+    watchlist = []
+    for item in value.split(","):
+        symbol, _, interval = item.strip().partition(":")
+        interval = interval.strip() or default_interval
+        if symbol.strip() and is_supported_interval(interval):
+            watchlist.append((symbol.strip().upper(), interval))
+    return watchlist
+
+
+class RequestTracker:
+    """
+    Licznik zapytań o pary (symbol, interwał) z wygasaniem.
+
+    Co half_life sekund wszystkie liczniki są dzielone na pół, więc ranking
+    odzwierciedla bieżący ruch, a nie całą historię. Liczba śledzonych par
+    jest ograniczona - po przekroczeniu limitu usuwane są najrzadsze.
+    """
+
+    def __init__(self, half_life: float = 60 * 60, max_entries: int = 1000):
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self._counts: Counter = Counter()
+        self._decayed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decay(self, now: float) -> None:
+        while now - self._decayed_at >= self.half_life:
+            self._decayed_at += self.half_life
+            self._counts = Counter({key: count / 2 for key, count in self._counts.items() if count >= 1})
+
+    def record(self, symbol: str, interval: str) -> None:
+        """Odnotowuje zapytanie o szereg."""
+        if not symbol or not is_supported_interval(interval):
+            return
+        with self._lock:
+            self._decay(time.monotonic())
+            self._counts[(symbol.upper(), interval)] += 1
+            if len(self._counts) > self.max_entries:
+                for key, _ in self._counts.most_common()[self.max_entries:]:
+                    del self._counts[key]
+
+    def most_requested(self, limit: int) -> List[WatchKey]:
+        """Zwraca najczęściej odpytywane pary (symbol, interwał)."""
+        with self._lock:
+            self._decay(time.monotonic())
+            return [key for key, _ in self._counts.most_common(limit)]
+
+
+class WarmupScheduler:
+    """
+    Odświeżanie w tle szeregów z listy obserwowanych.
+
+    Lista obejmuje stałe pozycje (np. popularne instrumenty) oraz najczęściej
+    odpytywane szeregi z RequestTracker. Każdy szereg jest synchronizowany
+    z najniższym priorytetem w harmonogramie zapytań, zanim przestanie być
+    świeży w magazynie, a dodatkowo tuż po publikacji świec zamkniętej sesji
+    i - dla interwałów śróddziennych - co intraday_every sekund w trakcie
+    sesji. Zapytania użytkowników o obserwowane szeregi są więc obsługiwane
+    z magazynu, bez oczekiwania na źródło.
+    """
+
+    # Najdłuższa przerwa między przeglądami listy (nowe pozycje z ruchu)
+    TICK = 30.0
+    # Odstęp kolejnej próby po błędzie innym niż limit zapytań
+    RETRY_DELAY = 5 * 60.0
+
+    def __init__(self, repository: AsyncLocalStockRepository,
+                 watchlist: Iterable[WatchKey] = (),
+                 tracker: Optional[RequestTracker] = None,
+                 top_requested: int = 10,
+                 intraday_every: float = 4 * 60,
+                 lead: float = 60.0,
+                 calendar: Optional[MarketCalendar] = None):
+        self.repository = repository
+        self.watchlist = [(symbol.upper(), interval) for symbol, interval in watchlist
+                          if is_supported_interval(interval)]
+        self.tracker = tracker or RequestTracker()
+        self.top_requested = top_requested
+        self.intraday_every = intraday_every
+        # Wyprzedzenie odświeżenia względem utraty świeżości (czas na kolejkę i odpowiedź źródła)
+        self.lead = lead
+        self.calendar = calendar or repository.calendar
+        self._due: Dict[WatchKey, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread: Optional[EventLoopThread] = None
+        self._stats = {"refreshes": 0, "failures": 0, "rateLimited": 0}
+
+    def watched(self) -> List[WatchKey]:
+        """Zwraca bieżącą listę obserwowanych szeregów (bez powtórzeń)."""
+        keys = self.watchlist + self.tracker.most_requested(self.top_requested)
+        return list(dict.fromkeys(keys))
+
+    def next_refresh(self, interval: str, series) -> float:
+        """Wyznacza chwilę (sekundy od epoki) kolejnego odświeżenia zapisanego szeregu."""
+        synced_at = series.synced_at
+        synced = datetime.fromtimestamp(synced_at, self.calendar.TIMEZONE)
+        due = min(
+            self.repository.fresh_until(series, interval) - self.lead,
+            self.calendar.next_publication(synced, CLOSE_PUBLICATION_DELAY).timestamp()
+        )
+        if intraday_minutes(interval) is not None and self.calendar.is_session_open(synced):
+            due = min(due, synced_at + self.intraday_every)
+        # Nie częściej niż co TICK, nawet przy bardzo krótkiej świeżości
+        return max(due, synced_at + self.TICK)
+
+    async def _initial_due(self, symbol: str, interval: str) -> float:
+        """Termin pierwszego odświeżenia: od razu, chyba że magazyn ma już świeży szereg."""
+        stored = await asyncio.to_thread(self.repository.store.read, symbol, interval)
+        if stored is None or not stored.meta.get("complete"):
+            return time.time()
+        return self.next_refresh(interval, stored)
+
+    async def refresh(self, symbol: str, interval: str) -> None:
+        """Odświeża szereg i planuje jego kolejne odświeżenie."""
+        key = (symbol, interval)
+        try:
+            with request_priority(RequestPriority.BACKGROUND):
+                series = await self.repository.refresh(symbol, interval)
+            self._stats["refreshes"] += 1
+            self._due[key] = self.next_refresh(interval, series)
+            print(f"[DEBUG][WarmupScheduler] Odświeżono {symbol}/{interval} - kolejne odświeżenie: "
+                  f"{datetime.fromtimestamp(self._due[key], self.calendar.TIMEZONE).isoformat()}")
+        except RateLimitExceeded as e:
+            self._stats["rateLimited"] += 1
+            self._due[key] = time.time() + max(e.retry_after, self.TICK)
+            print(f"[WARNING][WarmupScheduler] Limit zapytań - {symbol}/{interval} ponowiony za {e.retry_after:.0f} s")
+        except Exception as e:
+            self._stats["failures"] += 1
+            self._due[key] = time.time() + self.RETRY_DELAY
+            print(f"[WARNING][WarmupScheduler] Nie udało się odświeżyć {symbol}/{interval}: {str(e)}")
+
+    async def run_once(self) -> float:
+        """
+        Odświeża szeregi, których termin minął.
+
+        Returns:
+            Czas (w sekundach) do kolejnego przeglądu listy
+        """
+        watched = self.watched()
+        for key in set(self._due) - set(watched):
+            del self._due[key]
+        for symbol, interval in watched:
+            if (symbol, interval) not in self._due:
+                self._due[(symbol, interval)] = await self._initial_due(symbol, interval)
+
+        now = time.time()
+        due = [key for key, at in self._due.items() if at <= now]
+        if due:
+            # Limit zapytań pilnuje harmonogram - zapytania w tle ustępują zapytaniom użytkowników
+            await asyncio.gather(*(self.refresh(symbol, interval) for symbol, interval in due))
+
+        next_due = min(self._due.values(), default=now + self.TICK)
+        return min(max(next_due - time.time(), 0.0), self.TICK)
+
+    async def run(self) -> None:
+        """Pętla odświeżania działająca do anulowania zadania."""
+        print(f"[DEBUG][WarmupScheduler] Start - obserwowane: {self.watchlist}, najczęstsze: {self.top_requested}")
+        while True:
+            try:
+                delay = await self.run_once()
+            except Exception as e:
+                print(f"[ERROR][WarmupScheduler] Błąd przeglądu listy obserwowanych: {str(e)}")
+                delay = self.TICK
+            await asyncio.sleep(delay)
+
+    def start(self, loop_thread: EventLoopThread) -> None:
+        """Uruchamia pętlę odświeżania we wspólnej pętli zdarzeń."""
+        if self._loop_thread is not None:
+            return
+        self._loop_thread = loop_thread
+
+        def create():
+            self._task = loop_thread.loop.create_task(self.run())
+
+        loop_thread.loop.call_soon_threadsafe(create)
+
+    def stop(self) -> None:
+        """Zatrzymuje pętlę odświeżania."""
+        if self._loop_thread is not None:
+            self._loop_thread.loop.call_soon_threadsafe(lambda: self._task and self._task.cancel())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki odświeżania i terminy kolejnych odświeżeń."""
+        return {
+            **self._stats,
+            "watched": len(self._due),
+            "schedule": {
+                f"{symbol}/{interval}": datetime.fromtimestamp(at, self.calendar.TIMEZONE).isoformat()
+                for (symbol, interval), at in sorted(list(self._due.items()), key=lambda item: item[1])
+            }
+        }
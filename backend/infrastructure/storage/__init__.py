@@ -0,0 +1 @@
+# Inicjalizacja pakietu storage
\ No newline at end of file
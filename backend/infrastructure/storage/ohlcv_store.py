@@ -0,0 +1,181 @@
+import os
+import re
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from domain.entities.stock_data import PriceSeries, datetime_to_epoch, epoch_to_datetime, is_valid_symbol
+
+logger = logging.getLogger(__name__)
+
+# Kolumny przechowywane na dysku: nazwa -> typ NumPy (int64 / float64)
+COLUMNS = PriceSeries.DTYPES
+
+# Nazwa interwału jako katalog magazynu (daily, intraday_5min, ...)
+INTERVAL_PATTERN = re.compile(r"[a-z0-9_]{1,32}")
+
+
+class StoredSeries:
+    """Szereg OHLCV odczytany z magazynu - kolumny posortowane rosnąco po czasie."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.columns = columns
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    @property
+    def first_timestamp(self) -> Optional[int]:
+        return int(self.columns["timestamp"][0]) if len(self) else None
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.columns["timestamp"][-1]) if len(self) else None
+
+    @property
+    def synced_at(self) -> float:
+        return float(self.meta.get("synced_at", 0))
+
+    def to_price_series(self) -> PriceSeries:
+        return PriceSeries.from_columns(self.columns)
+
+
+class OhlcvStore:
+    """
+    Lokalny, kolumnowy magazyn świec OHLCV.
+
+    Każda para (symbol, interwał) ma własny katalog z jednym plikiem binarnym
+    na kolumnę oraz plikiem meta.json. Nowe świece są wyłącznie dopisywane na
+    końcu plików - jedynie ogon, który został zrewidowany przez źródło
+    (np. niezamknięta świeca bieżącego dnia), jest obcinany i zapisywany ponownie.
+    Liczba poprawnie zapisanych wierszy jest trzymana w meta.json, który
+    zapisujemy jako ostatni, więc przerwany zapis nie psuje magazynu.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _series_dir(self, symbol: str, interval: str) -> str:
+        # Symbol i interwał są częścią ścieżki - bez separatorów i odwołań do katalogów nadrzędnych
+        if not is_valid_symbol(symbol) or not INTERVAL_PATTERN.fullmatch(interval):
+            raise ValueError(f"Nieprawidłowy symbol lub interwał: {symbol!r}, {interval!r}")
+        return os.path.join(self.base_dir, symbol.upper(), interval)
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = f"{symbol.upper()}/{interval}"
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _read_meta(self, series_dir: str) -> Optional[Dict[str, Any]]:
+        meta_path = os.path.join(series_dir, self.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Nie można odczytać metadanych magazynu {meta_path}: {str(e)}")
+            return None
+
+    def _write_meta(self, series_dir: str, meta: Dict[str, Any]) -> None:
+        meta_path = os.path.join(series_dir, self.META_FILE)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _read_columns(self, series_dir: str, rows: int) -> Dict[str, np.ndarray]:
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            column = np.empty(0, dtype=dtype)
+            path = os.path.join(series_dir, f"{name}.bin")
+            if rows and os.path.exists(path):
+                column = np.fromfile(path, dtype=dtype, count=rows)
+                if len(column) < rows:
+                    raise EOFError(f"Plik {path} zawiera {len(column)} z {rows} wierszy")
+            columns[name] = column
+        return columns
+
+    def read(self, symbol: str, interval: str) -> Optional[StoredSeries]:
+        """
+        Odczytuje zapisany szereg dla pary (symbol, interwał).
+
+        Returns:
+            Zapisany szereg lub None, jeśli magazyn nie zawiera danych
+        """
+        series_dir = self._series_dir(symbol, interval)
+        with self._lock(symbol, interval):
+            meta = self._read_meta(series_dir)
+            if meta is None:
+                return None
+            try:
+                columns = self._read_columns(series_dir, int(meta.get("rows", 0)))
+            except (OSError, EOFError) as e:
+                logger.error(f"Uszkodzony magazyn dla {symbol}/{interval}: {str(e)}")
+                return None
+        return StoredSeries(columns, meta)
+
+    def merge(self, symbol: str, interval: str, columns: Dict[str, Any],
+              meta: Dict[str, Any]) -> StoredSeries:
+        """
+        Scala nowe świece z zapisanym szeregiem.
+
+        Świece starsze niż pierwsza nowa świeca pozostają nietknięte, zapisany
+        ogon od pierwszej nowej świecy jest zastępowany nowymi danymi.
+
+        Args:
+            symbol: Symbol giełdowy
+            interval: Interwał danych
+            columns: Nowe kolumny (posortowane rosnąco po czasie)
+            meta: Metadane do zapisania razem z szeregiem
+
+        Returns:
+            Szereg po scaleniu
+        """
+        series_dir = self._series_dir(symbol, interval)
+        new_rows = len(columns["timestamp"])
+
+        with self._lock(symbol, interval):
+            os.makedirs(series_dir, exist_ok=True)
+            stored_meta = self._read_meta(series_dir) or {}
+            stored_rows = int(stored_meta.get("rows", 0))
+            stored = self._read_columns(series_dir, stored_rows)
+
+            # Pozycja, od której zapisany ogon zostaje zastąpiony nowymi danymi
+            keep_rows = stored_rows
+            if new_rows:
+                keep_rows = int(np.searchsorted(stored["timestamp"], columns["timestamp"][0], side="left"))
+
+            # Najpierw skracamy szereg w metadanych, aby przerwany zapis
+            # nie pozostawił wskazań na częściowo nadpisany ogon
+            if keep_rows < stored_rows:
+                self._write_meta(series_dir, dict(stored_meta, rows=keep_rows))
+
+            for name, dtype in COLUMNS.items():
+                path = os.path.join(series_dir, f"{name}.bin")
+                column = np.asarray(columns[name], dtype=dtype)
+                with open(path, "ab") as f:
+                    f.truncate(keep_rows * column.itemsize)
+                    f.write(column.tobytes())
+                stored[name] = np.concatenate((stored[name][:keep_rows], column))
+
+            merged_meta = dict(stored_meta)
+            merged_meta.update(meta)
+            merged_meta["rows"] = keep_rows + new_rows
+            merged_meta["synced_at"] = time.time()
+            self._write_meta(series_dir, merged_meta)
+
+        logger.debug(f"Magazyn {symbol}/{interval}: zachowano {keep_rows} świec, dopisano {new_rows}")
+        return StoredSeries(stored, merged_meta)
@@ -0,0 +1 @@
+# Inicjalizacja pakietu streaming w warstwie infrastruktury
\ No newline at end of file
@@ -0,0 +1,265 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+import orjson
+
+from domain.entities.stock_data import PriceSeries, epoch_to_datetime
+from domain.services.market_calendar import MarketCalendar
+from infrastructure.apis.request_scheduler import RateLimitExceeded, RequestPriority, request_priority
+from infrastructure.cache.response_cache import CLOSE_PUBLICATION_DELAY
+from infrastructure.repositories.async_local_stock_repository import AsyncLocalStockRepository
+
+# Liczba ostatnich świec porównywanych z poprzednim odczytem (źródło poprawia niezamknięte świece)
+REVISION_WINDOW = 5
+
+# Komentarz SSE podtrzymujący połączenie (i wykrywający rozłączonych klientów)
+KEEPALIVE = b": keepalive\n\n"
+
+
+def changed_bars(previous: Optional[PriceSeries], current: PriceSeries) -> PriceSeries:
+    """
+    Zwraca świece nowe lub zmienione względem poprzedniego odczytu szeregu.
+
+    Porównywany jest jedynie ogon szeregu (REVISION_WINDOW ostatnich znanych
+    świec i wszystkie nowsze) - starsze świece nie są już poprawiane.
+    """
+    if previous is None or not len(previous):
+        return current
+    since = previous.timestamp[max(len(previous) - REVISION_WINDOW, 0)]
+    tail = current.slice(int(np.searchsorted(current.timestamp, since)), len(current))
+    known = np.minimum(np.searchsorted(previous.timestamp, tail.timestamp), len(previous) - 1)
+    unchanged = previous.timestamp[known] == tail.timestamp
+    for name in ("open", "high", "low", "close", "volume"):
+        unchanged &= getattr(previous, name)[known] == getattr(tail, name)
+    return tail.take(np.flatnonzero(~unchanged))
+
+
+def encode_event(event: str, symbol: str, interval: str, bars: PriceSeries) -> bytes:
+    """Koduje świece (rosnąco po czasie) jako zdarzenie SSE; identyfikatorem jest czas ostatniej świecy."""
+    timestamps = np.datetime_as_string(bars.timestamp.astype("datetime64[s]"), unit="s").tolist()
+    payload = orjson.dumps({
+        "symbol": symbol,
+        "interval": interval,
+        "bars": [
+            {"timestamp": timestamp, "open": open, "high": high, "low": low, "close": close, "volume": volume}
+            for timestamp, open, high, low, close, volume in zip(
+                timestamps, bars.open.tolist(), bars.high.tolist(), bars.low.tolist(),
+                bars.close.tolist(), bars.volume.tolist())
+        ]
+    })
+    event_id = f"id: {int(bars.timestamp[-1])}\n".encode() if len(bars) else b""
+    return event_id + b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+
+
+class Subscription:
+    """Subskrypcja świec jednego klienta - kolejka gotowych (zakodowanych) zdarzeń SSE."""
+
+    def __init__(self, key: Tuple[str, str], snapshot: int, since: Optional[int], queue_size: int):
+        self.key = key
+        self.snapshot = snapshot
+        # Czas ostatniej świecy otrzymanej przed ponownym połączeniem (Last-Event-ID)
+        self.since = since
+        self.needs_snapshot = True
+        self.closed = False
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def push(self, message: bytes) -> bool:
+        """Dodaje zdarzenie do kolejki; przy przepełnieniu zamyka subskrypcję i zwraca False."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            # Klient nie nadąża - rozłączamy go, a po ponownym połączeniu (Last-Event-ID)
+            # otrzyma brakujące świece w migawce
+            self.close()
+            return False
+
+    def close(self) -> None:
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def next(self, timeout: float) -> Optional[bytes]:
+        """Zwraca kolejne zdarzenie, KEEPALIVE po timeout sekundach bez zdarzeń lub None po zamknięciu."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return KEEPALIVE
+
+
+class SharedBarPoller:
+    """
+    Wspólne odpytywanie źródła dla wszystkich subskrybentów pary (symbol, interwał).
+
+    W trakcie sesji szereg odświeżany jest co poll_every sekund, a poza nią -
+    raz po publikacji świec zamknięcia i ponownie na otwarciu kolejnej sesji.
+    Każdy odczyt porównywany jest z poprzednim, a nowe i zmienione świece są
+    kodowane raz i rozsyłane do wszystkich subskrybentów.
+    """
+
+    # Odstęp kolejnej próby po błędzie źródła
+    RETRY_DELAY = 60.0
+
+    def __init__(self, hub: "BarStreamHub", symbol: str, interval: str):
+        self.hub = hub
+        self.symbol = symbol
+        self.interval = interval
+        self.subscribers: Set[Subscription] = set()
+        self.series: Optional[PriceSeries] = None
+        self.task: Optional[asyncio.Task] = None
+        # Trwające odpytanie nie jest anulowane - mogą na nie czekać zapytania użytkowników (single flight)
+        self.polling = False
+        self.stopped = False
+
+    def next_delay(self) -> float:
+        """Zwraca czas (w sekundach) do kolejnego odpytania źródła."""
+        calendar = self.hub.calendar
+        now = calendar.now()
+        if calendar.is_session_open(now):
+            return self.hub.poll_every
+        wake = min(calendar.next_open(now), calendar.next_publication(now, CLOSE_PUBLICATION_DELAY))
+        return max(wake.timestamp() - time.time(), self.hub.poll_every)
+
+    def _since(self):
+        """Początek okna odświeżenia - ostatnia znana świeca (wystarcza zapytanie compact)."""
+        if self.series is not None and len(self.series):
+            return epoch_to_datetime(self.series.timestamp[-1])
+        return self.hub.calendar.now().replace(tzinfo=None) - timedelta(days=1)
+
+    async def poll(self) -> None:
+        """Odczytuje szereg i rozsyła zmiany subskrybentom."""
+        with request_priority(RequestPriority.BACKGROUND):
+            stored = await self.hub.repository.refresh(self.symbol, self.interval, self._since())
+        self.hub.stats["polls"] += 1
+        previous, series = self.series, stored.to_price_series()
+        self.series = series
+
+        # Pierwszy odczyt trafia do subskrybentów jedynie jako migawka
+        message = None
+        if previous is not None:
+            changed = changed_bars(previous, series)
+            if len(changed):
+                message = encode_event("bars", self.symbol, self.interval, changed)
+        for subscription in list(self.subscribers):
+            if subscription.needs_snapshot:
+                self.hub.send_snapshot(subscription, series)
+            elif message is not None:
+                self.hub.deliver(subscription, message)
+        if message is not None:
+            self.hub.stats["events"] += 1
+            self.hub.stats["eventBytes"] += len(message)
+
+    async def run(self) -> None:
+        """Pętla odpytywania działająca do zatrzymania (gdy nie ma już subskrybentów)."""
+        print(f"[DEBUG][BarStream] Start odpytywania {self.symbol}/{self.interval}")
+        while not self.stopped:
+            try:
+                self.polling = True
+                await self.poll()
+                delay = self.next_delay()
+            except RateLimitExceeded as e:
+                delay = max(e.retry_after, self.hub.poll_every)
+                print(f"[WARNING][BarStream] Limit zapytań - {self.symbol}/{self.interval} ponowiony za {delay:.0f} s")
+            except Exception as e:
+                self.hub.stats["pollErrors"] += 1
+                delay = self.RETRY_DELAY
+                print(f"[WARNING][BarStream] Nie udało się odświeżyć {self.symbol}/{self.interval}: {str(e)}")
+            finally:
+                self.polling = False
+            if not self.stopped:
+                await asyncio.sleep(delay)
+
+
+class BarStreamHub:
+    """
+    Strumienie świec na żywo (SSE) dla par (symbol, interwał).
+
+    Każda subskrybowana para ma jeden SharedBarPoller niezależnie od liczby
+    klientów, więc koszt zapytań do źródła zależy od liczby różnych
+    symboli, a nie od liczby otwartych kart. Metody wywoływane są w pętli
+    zdarzeń (EventLoopThread).
+    """
+
+    def __init__(self, repository: AsyncLocalStockRepository, poll_every: float = 60.0,
+                 queue_size: int = 100, max_snapshot: int = 1000,
+                 calendar: Optional[MarketCalendar] = None):
+        self.repository = repository
+        self.poll_every = poll_every
+        self.queue_size = queue_size
+        self.max_snapshot = max_snapshot
+        self.calendar = calendar or repository.calendar
+        self.pollers: Dict[Tuple[str, str], SharedBarPoller] = {}
+        self.stats = {"polls": 0, "pollErrors": 0, "events": 0, "eventBytes": 0, "dropped": 0}
+
+    async def subscribe(self, symbol: str, interval: str, snapshot: int = 1,
+                        since: Optional[int] = None) -> Subscription:
+        """
+        Rejestruje klienta; pierwszym zdarzeniem będzie migawka ostatnich świec.
+
+        Args:
+            symbol: Symbol giełdowy
+            interval: Interwał świec
+            snapshot: Liczba ostatnich świec w migawce
+            since: Czas ostatniej otrzymanej świecy (Last-Event-ID) - migawka obejmie wszystkie nowsze
+        """
+        key = (symbol.upper(), interval)
+        subscription = Subscription(key, min(snapshot, self.max_snapshot), since, self.queue_size)
+        poller = self.pollers.get(key)
+        if poller is None:
+            poller = self.pollers[key] = SharedBarPoller(self, *key)
+            poller.task = asyncio.get_running_loop().create_task(poller.run())
+        poller.subscribers.add(subscription)
+        if poller.series is not None:
+            self.send_snapshot(subscription, poller.series)
+        print(f"[DEBUG][BarStream] Subskrypcja {key[0]}/{interval} - subskrybentów: {len(poller.subscribers)}")
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Wyrejestrowuje klienta; ostatni subskrybent zatrzymuje odpytywanie pary."""
+        subscription.closed = True
+        poller = self.pollers.get(subscription.key)
+        if poller is None:
+            return
+        poller.subscribers.discard(subscription)
+        if not poller.subscribers:
+            poller.stopped = True
+            if not poller.polling:
+                poller.task.cancel()
+            del self.pollers[subscription.key]
+            print(f"[DEBUG][BarStream] Koniec odpytywania {subscription.key[0]}/{subscription.key[1]}")
+
+    def send_snapshot(self, subscription: Subscription, series: PriceSeries) -> None:
+        """Wysyła migawkę ostatnich świec (lub wszystkich nowszych niż Last-Event-ID)."""
+        start = max(len(series) - subscription.snapshot, 0)
+        if subscription.since is not None:
+            missed = int(np.searchsorted(series.timestamp, subscription.since, side="right"))
+            start = max(min(start, missed), len(series) - self.max_snapshot)
+        subscription.needs_snapshot = False
+        bars = series.slice(start, len(series))
+        self.deliver(subscription, encode_event("snapshot", subscription.key[0], subscription.key[1], bars))
+
+    def deliver(self, subscription: Subscription, message: bytes) -> None:
+        """Dodaje zdarzenie do kolejki klienta; klient, który nie nadąża, jest rozłączany."""
+        if subscription.closed:
+            return
+        if not subscription.push(message):
+            self.stats["dropped"] += 1
+            poller = self.pollers.get(subscription.key)
+            if poller is not None:
+                poller.subscribers.discard(subscription)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki strumieni (odpytywane pary i liczba subskrybentów)."""
+        pollers = list(self.pollers.items())
+        return {
+            **self.stats,
+            "streams": len(pollers),
+            "subscribers": sum(len(poller.subscribers) for _, poller in pollers),
+            "perStream": {f"{symbol}/{interval}": len(poller.subscribers) for (symbol, interval), poller in pollers}
+        }
@@ -1,18 +1,46 @@
 import os
 import sys
-from flask import Flask, jsonify, request
+import math
+import atexit
+import hashlib
+import asyncio
+import threading
+import multiprocessing
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
-import random
-from datetime import datetime, timedelta
 
 # Dodanie katalogu głównego do ścieżki importu
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from domain.entities.stock_data import is_valid_symbol
 from domain.services.stock_service import StockService
-from application.stock_application_service import StockApplicationService
-from infrastructure.apis.alpha_vantage_api import AlphaVantageAPI
-from infrastructure.repositories.alpha_vantage_repository import AlphaVantageRepository
+from domain.services.downsampling import METHODS as DOWNSAMPLE_METHODS, MIN_POINTS, OHLC
+from domain.services.indicator_state import IndicatorStateStore
+from domain.services.market_calendar import MarketCalendar
+from domain.services.monte_carlo import GBM, MIN_RETURNS
+from domain.services.technical_indicators import get_indicator, parse_spec
+from application.options_application_service import OptionsApplicationService
+from application.prediction_application_service import PredictionApplicationService
+from application.stock_application_service import PreparedResponse, StockApplicationService
+from infrastructure.apis.async_alpha_vantage_api import AsyncAlphaVantageAPI
+from infrastructure.apis.event_loop_thread import EventLoopThread
+from infrastructure.apis.http_transport import AiohttpTransport, RetryPolicy
+from infrastructure.apis.request_scheduler import RequestScheduler, RequestPriority, RateLimitExceeded
+from infrastructure.cache.body_cache import ENCODINGS, IDENTITY, EncodedBodyCache, compress
+from infrastructure.cache.indicator_cache import IndicatorResultCache
+from infrastructure.cache.response_cache import ResponseCache
+from infrastructure.cache.snapshot_cache import SnapshotCache
+from infrastructure.repositories.async_alpha_vantage_repository import AsyncAlphaVantageRepository
+from infrastructure.repositories.async_local_stock_repository import AsyncLocalStockRepository
+from infrastructure.repositories.sync_stock_repository_adapter import SyncStockRepositoryAdapter
+from infrastructure.repositories.warmup_scheduler import (
+    POPULAR_SYMBOLS, RequestTracker, WarmupScheduler, is_supported_interval, parse_watchlist
+)
+from infrastructure.streaming.bar_stream import BarStreamHub
+from infrastructure.storage.ohlcv_store import OhlcvStore
 
 load_dotenv()
 
@@ -20,22 +48,248 @@ load_dotenv()
 BACKEND_VERSION = "1.0.0"
 API_VERSION = "v1"
 
+# Procesy puli symulacji (forkserver/spawn) importują ten moduł ponownie jako __mp_main__ -
+# nie uruchamiają w nim pętli zdarzeń, puli procesów ani odświeżania w tle
+SERVER_PROCESS = multiprocessing.current_process().name == "MainProcess"
+
 # Inicjalizacja komponentów aplikacji
-api = AlphaVantageAPI()
-repository = AlphaVantageRepository(api)
-domain_service = StockService(repository)
-application_service = StockApplicationService(domain_service)
+response_cache = ResponseCache(
+    max_bytes=int(os.environ.get("RESPONSE_CACHE_MAX_MB", 64)) * 1024 * 1024,
+    disk_dir=os.environ.get("RESPONSE_CACHE_DIR") or None
+)
+request_scheduler = RequestScheduler(
+    calls_per_minute=int(os.environ.get("ALPHA_VANTAGE_CALLS_PER_MINUTE", 5)),
+    calls_per_day=int(os.environ.get("ALPHA_VANTAGE_CALLS_PER_DAY", 25)),
+    latency_budgets={
+        RequestPriority.INTERACTIVE: float(os.environ.get("UPSTREAM_LATENCY_BUDGET_SECONDS", 15))
+    }
+)
+upstream_transport = AiohttpTransport(
+    connect_timeout=float(os.environ.get("UPSTREAM_CONNECT_TIMEOUT_SECONDS", 3.05)),
+    read_timeout=float(os.environ.get("UPSTREAM_READ_TIMEOUT_SECONDS", 30)),
+    pool_maxsize=int(os.environ.get("UPSTREAM_MAX_CONNECTIONS", 100)),
+    retry_policy=RetryPolicy(max_retries=int(os.environ.get("UPSTREAM_MAX_RETRIES", 2)))
+)
+# Wspólna pętla zdarzeń dla wszystkich zapytań do źródła danych
+event_loop = EventLoopThread() if SERVER_PROCESS else None
+api = AsyncAlphaVantageAPI(cache=response_cache, scheduler=request_scheduler, transport=upstream_transport)
+ohlcv_store = OhlcvStore(os.environ.get("OHLCV_STORE_DIR", os.path.join(os.path.dirname(__file__), '..', 'data', 'ohlcv')))
+async_repository = AsyncLocalStockRepository(AsyncAlphaVantageRepository(api), ohlcv_store)
+# Synchroniczny interfejs repozytorium dla pozostałych endpointów
+repository = SyncStockRepositoryAdapter(async_repository, event_loop)
+domain_service = StockService(repository, async_repository)
+# Stan wskaźników - nowe świece dokładane są do poprzednich wyników
+indicator_states = IndicatorStateStore(max_entries=int(os.environ.get("INDICATOR_STATE_MAX_ENTRIES", 256)))
+# Gotowe wyniki wskaźników dla bieżącej wersji szeregu
+indicator_cache = IndicatorResultCache(max_bytes=int(os.environ.get("INDICATOR_CACHE_MAX_MB", 32)) * 1024 * 1024)
+application_service = StockApplicationService(
+    domain_service, indicator_states, indicator_cache,
+    batch_concurrency=int(os.environ.get("BATCH_CONCURRENCY", 8))
+)
+# Wycenione łańcuchy opcji dla bieżącej wersji szeregu instrumentu bazowego
+snapshot_cache = SnapshotCache(max_entries=int(os.environ.get("SNAPSHOT_CACHE_MAX_ENTRIES", 128)))
+options_service = OptionsApplicationService(domain_service, snapshot_cache)
+# Pula procesów dla dużych symulacji Monte Carlo (MC_WORKERS < 2 - symulacje w wątkach)
+MC_WORKERS = int(os.environ.get("MC_WORKERS", min(4, os.cpu_count() or 1)))
+# Procesy pracowników startowane przez forkserver (lub spawn) - fork procesu z wątkami
+# (pętla zdarzeń, pule wątków) mógłby skopiować blokady zajęte przez inne wątki
+MC_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+simulation_pool = ProcessPoolExecutor(
+    max_workers=MC_WORKERS, mp_context=multiprocessing.get_context(MC_START_METHOD)
+) if MC_WORKERS > 1 and SERVER_PROCESS else None
+if simulation_pool is not None:
+    atexit.register(simulation_pool.shutdown, cancel_futures=True)
+prediction_service = PredictionApplicationService(domain_service, options_service, simulation_pool, snapshot_cache)
+# Najdłuższy horyzont predykcji (dni), limity liczby ścieżek i okna kalibracji (sesje)
+MAX_PREDICTION_DAYS = 365 * 5
+MIN_SIMULATION_PATHS = 1000
+MAX_SIMULATION_PATHS = int(os.environ.get("MC_MAX_PATHS", 2_000_000))
+MAX_CALIBRATION_WINDOW = 252 * 10
+# Zapytania o wiele symboli: limit symboli i czas oczekiwania na spóźnione symbole
+MAX_BATCH_SYMBOLS = 50
+BATCH_TIMEOUT_SECONDS = float(os.environ.get("BATCH_TIMEOUT_SECONDS", 10))
+# Zserializowane i skompresowane treści odpowiedzi według ETag
+body_cache = EncodedBodyCache(max_bytes=int(os.environ.get("BODY_CACHE_MAX_MB", 64)) * 1024 * 1024)
+# Mniejszych treści nie kompresujemy - zysk nie pokrywa narzutu
+MIN_COMPRESS_BYTES = 1024
+# Odświeżanie w tle popularnych i najczęściej odpytywanych szeregów
+request_tracker = RequestTracker()
+warmup_scheduler = WarmupScheduler(
+    async_repository,
+    watchlist=parse_watchlist(os.environ.get("WARMUP_WATCHLIST", ",".join(POPULAR_SYMBOLS))),
+    tracker=request_tracker,
+    top_requested=int(os.environ.get("WARMUP_TOP_REQUESTED", 10)),
+    intraday_every=float(os.environ.get("WARMUP_INTRADAY_MINUTES", 4)) * 60
+)
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "false").lower() in ("1", "true", "yes")
+_background_lock = threading.Lock()
+# Strumienie świec na żywo - jedno odpytywanie źródła na parę (symbol, interwał)
+bar_stream = BarStreamHub(async_repository, poll_every=float(os.environ.get("STREAM_POLL_SECONDS", 60)))
+# Odstęp komentarzy podtrzymujących połączenie SSE
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+class AsyncFlask(Flask):
+    """Flask wykonujący widoki async def we wspólnej pętli zdarzeń (zamiast nowej pętli na każde żądanie)."""
+
+    def async_to_sync(self, func):
+        def run(*args, **kwargs):
+            return event_loop.run(func(*args, **kwargs))
+        return run
+
+
+app = AsyncFlask(__name__)
+
+
+def start_background_tasks():
+    """
+    Uruchamia odświeżanie w tle (WARMUP_ENABLED) - jeden raz, w procesie obsługującym zapytania.
+
+    Wywoływane przy starcie serwera (python -m presentation.app - tylko w procesie
+    potomnym automatycznego przeładowania) i przed pierwszym zapytaniem (flask run,
+    serwery WSGI). Proces nadzorujący przeładowanie i procesy puli symulacji nie
+    obsługują zapytań, więc nie zużywają limitu zapytań do źródła danych.
+    """
+    if not WARMUP_ENABLED or not SERVER_PROCESS:
+        return
+    with _background_lock:
+        warmup_scheduler.start(event_loop)
+
+
+app.before_request(start_background_tasks)
+
+
+def invalid_symbol_response(symbol):
+    """Buduje odpowiedź 400 dla symbolu o niedopuszczalnej postaci."""
+    return jsonify({
+        "status": "error",
+        "message": f"Nieprawidłowy symbol: {symbol}"
+    }), 400
 
-app = Flask(__name__)
+
+@app.before_request
+def validate_symbol():
+    """Odrzuca symbole spoza SYMBOL_PATTERN, zanim trafią do magazynu świec (ścieżki plików)."""
+    symbol = (request.view_args or {}).get('symbol')
+    if symbol is not None and not is_valid_symbol(symbol):
+        return invalid_symbol_response(symbol)
 # Konfiguracja CORS, aby umożliwić dostęp z frontendu
 CORS(app, resources={r"/api/*": {"origins": ["http://localhost:4200", "http://frontend:4200", "http://127.0.0.1:4200", "http://172.18.0.3:4200"]}}, supports_credentials=True)
 
 # Log informacyjny o trybie watchera
-print("=" * 50)
-print(f"Backend OptiQ Terminal v{BACKEND_VERSION} uruchomiony")
-print(f"API dostępne pod adresem: http://localhost:5050/api")
-print("Tryb WATCHER aktywny - zmiany plików będą automatycznie wykrywane")
-print("=" * 50)
+if SERVER_PROCESS:
+    print("=" * 50)
+    print(f"Backend OptiQ Terminal v{BACKEND_VERSION} uruchomiony")
+    print(f"API dostępne pod adresem: http://localhost:5050/api")
+    print("Tryb WATCHER aktywny - zmiany plików będą automatycznie wykrywane")
+    print("=" * 50)
+
+# Endpointy zwracające szereg symbolu - ich udane zapytania trafiają do request_tracker
+TRACKED_ENDPOINTS = frozenset({"get_stock_data", "get_technical_indicators", "get_technical_indicator"})
+
+@app.after_request
+def track_symbol_request(response):
+    """
+    Odnotowuje udane zapytania o szeregi symboli - najczęstsze trafiają na listę odświeżanych w tle.
+
+    Liczą się tylko odpowiedzi 2xx (i 304 - klient ma aktualną wersję
+    istniejącego szeregu), więc błędne symbole i interwały nie są
+    odświeżane w tle.
+    """
+    symbol = (request.view_args or {}).get('symbol')
+    if symbol and request.endpoint in TRACKED_ENDPOINTS and (response.status_code // 100 == 2
+                                                             or response.status_code == 304):
+        request_tracker.record(symbol, request.args.get('interval', 'daily'))
+    return response
+
+def rate_limited_response(error: RateLimitExceeded):
+    """Buduje odpowiedź 429 z nagłówkiem Retry-After dla odrzuconego zapytania."""
+    retry_after = max(1, math.ceil(error.retry_after))
+    response = jsonify({
+        "status": "error",
+        "message": str(error),
+        "retryAfter": retry_after
+    })
+    response.headers["Retry-After"] = str(retry_after)
+    return response, 429
+
+def negotiate_encoding() -> str:
+    """Wybiera najlepsze kodowanie treści akceptowane przez klienta (Accept-Encoding)."""
+    for encoding in ENCODINGS:
+        if request.accept_encodings.quality(encoding) > 0:
+            return encoding
+    return IDENTITY
+
+def encode_body(etag: str, encoding: str, build_payload, columnar: bool = False) -> bytes:
+    """Serializuje (i kompresuje) treść odpowiedzi, korzystając z zapisanych w body_cache wersji."""
+    body = body_cache.get(etag, encoding)
+    if body is not None:
+        return body
+    raw = body_cache.get(etag, IDENTITY) if encoding != IDENTITY else None
+    if raw is None:
+        payload = build_payload()
+        raw = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY) if columnar else app.json.dumps(payload).encode()
+        body_cache.put(etag, IDENTITY, raw)
+    if encoding == IDENTITY or len(raw) < MIN_COMPRESS_BYTES:
+        return raw
+    body = compress(raw, encoding)
+    body_cache.put(etag, encoding, body)
+    return body
+
+async def conditional_response(prepared: PreparedResponse, build_payload, columnar: bool = False) -> Response:
+    """
+    Buduje odpowiedź JSON z ETag i Last-Modified albo 304, jeśli klient ma aktualną wersję.
+    
+    ETag wyprowadzany jest z wersji danych i parametrów zapytania, więc do
+    odpowiedzi 304 wystarcza pobranie szeregu - bez obliczeń i serializacji.
+    Treść jest kompresowana zgodnie z Accept-Encoding, a zakodowane treści
+    zapisywane w body_cache pod ETagiem (powtórne zapytania o tę samą wersję
+    nie serializują danych ponownie). Budowa, serializacja i kompresja treści
+    wykonywane są w puli wątków - nie blokują wspólnej pętli zdarzeń.
+    """
+    key = repr((request.path, sorted(request.args.items(multi=True)), prepared.version))
+    etag = hashlib.sha1(key.encode()).hexdigest()[:32]
+    # Last Refreshed z Alpha Vantage podawany jest w czasie nowojorskim
+    last_modified = prepared.last_refreshed.replace(tzinfo=MarketCalendar.TIMEZONE, microsecond=0)
+    encoding = negotiate_encoding()
+    
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        not_modified = request.if_modified_since is not None and last_modified <= request.if_modified_since
+    
+    if not_modified:
+        response = Response(status=304)
+    else:
+        body = body_cache.get(etag, encoding)
+        if body is None:
+            body = await asyncio.to_thread(encode_body, etag, encoding, build_payload, columnar)
+        if len(body) < MIN_COMPRESS_BYTES:
+            encoding = IDENTITY
+        response = Response(body, mimetype="application/json")
+        if encoding != IDENTITY:
+            response.headers["Content-Encoding"] = encoding
+    
+    # Skompresowana treść nie jest identyczna bajtowo z nieskompresowaną - ETag słaby
+    response.set_etag(etag, weak=encoding != IDENTITY)
+    response.last_modified = last_modified
+    # Klient może przechowywać odpowiedź, ale przed użyciem musi ją zweryfikować (If-None-Match)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+def parse_max_points():
+    """Odczytuje parametr maxPoints (największa liczba punktów w odpowiedzi) lub None."""
+    raw = request.args.get('maxPoints')
+    if raw is None:
+        return None
+    try:
+        max_points = int(raw)
+    except ValueError:
+        max_points = 0
+    if max_points < MIN_POINTS:
+        raise ValueError(f"Parametr 'maxPoints' musi być liczbą całkowitą nie mniejszą niż {MIN_POINTS}")
+    return max_points
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -60,6 +314,32 @@ def api_info():
         }
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Endpoint zwracający metryki warstwy pobierania danych."""
+    return jsonify({
+        "status": "success",
+        "data": {
+            "responseCache": response_cache.get_stats(),
+            "upstreamSingleFlight": api.single_flight.get_stats(),
+            "upstreamScheduler": request_scheduler.get_stats(),
+            "upstreamTransport": upstream_transport.get_stats(),
+            "repositorySingleFlight": async_repository.single_flight.get_stats(),
+            "indicatorStates": indicator_states.get_stats(),
+            "indicatorCache": indicator_cache.get_stats(),
+            "bodyCache": body_cache.get_stats(),
+            "snapshotCache": snapshot_cache.get_stats(),
+            "options": options_service.get_stats(),
+            "prediction": prediction_service.get_stats(),
+            "warmup": warmup_scheduler.get_stats(),
+            "barStream": event_loop.run(_bar_stream_stats())
+        }
+    })
+
+async def _bar_stream_stats():
+    # Stan strumieni zmieniany jest w pętli zdarzeń - odczyt również odbywa się w niej
+    return bar_stream.get_stats()
+
 @app.route('/api/stocks/search', methods=['GET'])
 def search_stocks():
     """Endpoint do wyszukiwania instrumentów giełdowych."""
@@ -77,36 +357,153 @@ def search_stocks():
             "status": "success",
             "data": results
         })
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
     except Exception as e:
         return jsonify({
             "status": "error",
             "message": str(e)
         }), 500
 
+@app.route('/api/stocks/batch', methods=['GET'])
+async def get_stocks_batch():
+    """
+    Endpoint do pobierania notowań lub szeregów wielu symboli jednym zapytaniem.
+    
+    Parametr `symbols` zawiera symbole rozdzielone przecinkami. Dla `mode=quote`
+    (domyślnie) zwracane jest ostatnie notowanie, dla `mode=series` - szereg
+    z parametrami jak w /api/stocks/<symbol>. Symbole pobierane są równolegle;
+    wynik każdego symbolu ma własny status, więc błąd lub spóźnienie jednego
+    nie wpływa na pozostałe.
+    """
+    symbols = [symbol.strip() for symbol in request.args.get('symbols', '').split(',') if symbol.strip()]
+    mode = request.args.get('mode', StockApplicationService.BATCH_QUOTE)
+    format = request.args.get('format', StockApplicationService.FORMAT_ROWS)
+    downsample = request.args.get('downsample', OHLC)
+    
+    if not symbols:
+        return jsonify({
+            "status": "error",
+            "message": "Parametr 'symbols' jest wymagany"
+        }), 400
+    
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({
+            "status": "error",
+            "message": f"Maksymalna liczba symboli w zapytaniu to {MAX_BATCH_SYMBOLS}"
+        }), 400
+    
+    invalid = next((symbol for symbol in symbols if not is_valid_symbol(symbol)), None)
+    if invalid is not None:
+        return invalid_symbol_response(invalid)
+    
+    if mode not in StockApplicationService.BATCH_MODES:
+        return jsonify({
+            "status": "error",
+            "message": f"Nieobsługiwany tryb: {mode}. Dostępne: {', '.join(StockApplicationService.BATCH_MODES)}"
+        }), 400
+    
+    if format not in StockApplicationService.FORMATS or downsample not in DOWNSAMPLE_METHODS:
+        return jsonify({
+            "status": "error",
+            "message": f"Nieobsługiwany format ({format}) lub metoda downsample ({downsample})"
+        }), 400
+    
+    try:
+        max_points = parse_max_points()
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    
+    print(f"[DEBUG] Pobieranie danych dla {len(symbols)} symboli, mode: {mode}")
+    
+    try:
+        results = await application_service.get_batch_async(
+            symbols,
+            mode=mode,
+            timeout=BATCH_TIMEOUT_SECONDS,
+            interval=request.args.get('interval', 'daily'),
+            period=request.args.get('period'),
+            start_date=request.args.get('startDate'),
+            end_date=request.args.get('endDate'),
+            format=format,
+            max_points=max_points,
+            downsample=downsample
+        )
+        # Kolumny NumPy (format columnar) kodowane są bezpośrednio przez orjson (w puli wątków)
+        body = await asyncio.to_thread(orjson.dumps, {
+            "status": "success",
+            "data": results
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
+        return Response(body, mimetype="application/json")
+    except Exception as e:
+        import traceback
+        print(f"[ERROR] Błąd podczas pobierania danych dla symboli {symbols}: {str(e)}")
+        print(f"[ERROR] Szczegóły błędu: {traceback.format_exc()}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
 @app.route('/api/stocks/<symbol>', methods=['GET'])
-def get_stock_data(symbol):
+async def get_stock_data(symbol):
     """Endpoint do pobierania danych giełdowych dla określonego symbolu."""
     # Pobranie parametrów zapytania
     interval = request.args.get('interval', 'daily')
     period = request.args.get('period')
     start_date = request.args.get('startDate')
     end_date = request.args.get('endDate')
+    # Format "columnar" - równoległe kolumny zamiast obiektu dla każdej świecy
+    format = request.args.get('format', StockApplicationService.FORMAT_ROWS)
+    # Zmniejszenie liczby świec do maxPoints: "ohlc" (łączenie świec) lub "lttb"
+    downsample = request.args.get('downsample', OHLC)
     
-    print(f"[DEBUG] Pobieranie danych dla symbolu: {symbol}, interval: {interval}, period: {period}")
+    print(f"[DEBUG] Pobieranie danych dla symbolu: {symbol}, interval: {interval}, period: {period}, format: {format}")
+    
+    if format not in StockApplicationService.FORMATS:
+        return jsonify({
+            "status": "error",
+            "message": f"Nieobsługiwany format: {format}. Dostępne: {', '.join(StockApplicationService.FORMATS)}"
+        }), 400
+    
+    if downsample not in DOWNSAMPLE_METHODS:
+        return jsonify({
+            "status": "error",
+            "message": f"Nieobsługiwana metoda downsample: {downsample}. Dostępne: {', '.join(DOWNSAMPLE_METHODS)}"
+        }), 400
+    
+    try:
+        max_points = parse_max_points()
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
     
     try:
-        data = application_service.get_stock_data(
+        prepared = await application_service.prepare_stock_data_async(
             symbol,
             interval=interval,
             period=period,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            format=format,
+            max_points=max_points,
+            downsample=downsample
         )
-        print(f"[DEBUG] Pobrano dane dla symbolu {symbol} - liczba punktów: {len(data.get('prices', []))}")
-        return jsonify({
-            "status": "success",
-            "data": data
-        })
+        print(f"[DEBUG] Pobrano dane dla symbolu {symbol} - wersja: {prepared.version}")
+        return await conditional_response(
+            prepared,
+            lambda: {
+                "status": "success",
+                "data": prepared.build()
+            },
+            columnar=format == StockApplicationService.FORMAT_COLUMNAR
+        )
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
     except Exception as e:
         import traceback
         error_traceback = traceback.format_exc()
@@ -118,38 +515,79 @@ def get_stock_data(symbol):
             "details": error_traceback
         }), 500
 
-# Nowe endpointy dla opcji
-
-@app.route('/api/options/<symbol>/expirations', methods=['GET'])
-def get_option_expiration_dates(symbol):
+@app.route('/api/stocks/<symbol>/stream', methods=['GET'])
+def stream_stock_bars(symbol):
     """
-    Endpoint do pobierania dostępnych dat wygaśnięcia dla opcji.
-    W produkcji powinien pobierać rzeczywiste daty z zewnętrznego API.
+    Endpoint strumienia świec na żywo (Server-Sent Events).
+    
+    Pierwszym zdarzeniem jest "snapshot" z ostatnimi świecami (parametr
+    `snapshot`, domyślnie 1), kolejne zdarzenia "bars" zawierają jedynie
+    nowe lub zmienione świece. Identyfikatorem zdarzenia jest czas ostatniej
+    świecy - po ponownym połączeniu (nagłówek Last-Event-ID) migawka obejmuje
+    świece, które klient pominął.
     """
-    # Symulacja dat wygaśnięcia dla celów demonstracyjnych
-    # W rzeczywistości te dane powinny pochodzić z serwisu domenowego
+    interval = request.args.get('interval', 'daily')
+    
+    if not is_supported_interval(interval):
+        return jsonify({
+            "status": "error",
+            "message": f"Nieobsługiwany interwał: {interval}"
+        }), 400
+    
     try:
-        # Symulujemy 6 dat wygaśnięcia zaczynając od przyszłego miesiąca
-        dates = []
-        current_date = datetime.now().replace(day=20)
-        
-        # Sprawdź, czy symbol jest jednym z obsługiwanych
-        if symbol.upper() not in ['IBM', 'INTC', 'TSLA']:
-            return jsonify({
-                "status": "error",
-                "message": f"Brak obsługi opcji dla symbolu {symbol}. Obsługiwane symbole: IBM, INTC, TSLA"
-            }), 400
-        
-        for i in range(1, 7):
-            next_date = current_date + timedelta(days=30*i)
-            # Standaryzowany format daty wygaśnięcia opcji (trzeci piątek miesiąca)
-            # Uproszczona wersja dla celów demonstracyjnych
-            dates.append(next_date.strftime("%Y-%m-%d"))
-        
+        snapshot = int(request.args.get('snapshot', 1))
+        last_event_id = request.headers.get('Last-Event-ID')
+        since = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "Parametr 'snapshot' i nagłówek Last-Event-ID muszą być liczbami całkowitymi"
+        }), 400
+    
+    if snapshot < 0:
+        return jsonify({
+            "status": "error",
+            "message": "Parametr 'snapshot' nie może być ujemny"
+        }), 400
+    
+    print(f"[DEBUG] Strumień świec dla symbolu: {symbol}, interval: {interval}, snapshot: {snapshot}, since: {since}")
+    subscription = event_loop.run(bar_stream.subscribe(symbol, interval, snapshot, since))
+    
+    def events():
+        try:
+            while True:
+                message = event_loop.run(subscription.next(STREAM_KEEPALIVE_SECONDS))
+                if message is None:
+                    break
+                yield message
+        finally:
+            # Wywoływane także po rozłączeniu klienta (zamknięcie generatora)
+            event_loop.submit(bar_stream.unsubscribe(subscription))
+    
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers["Cache-Control"] = "no-cache"
+    # Bez buforowania odpowiedzi przez serwery pośredniczące (nginx)
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+# Endpointy opcji
+
+@app.route('/api/options/<symbol>/expirations', methods=['GET'])
+async def get_option_expiration_dates(symbol):
+    """Endpoint do pobierania dat wygaśnięcia opcji (trzecie piątki kolejnych miesięcy)."""
+    try:
+        dates = await options_service.get_expirations_async(symbol)
         return jsonify({
             "status": "success",
             "data": dates
         })
+    except LookupError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 404
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -157,99 +595,151 @@ def get_option_expiration_dates(symbol):
         }), 500
 
 @app.route('/api/options/<symbol>', methods=['GET'])
-def get_options_data(symbol):
+async def get_options_data(symbol):
     """
-    Endpoint do pobierania danych opcji dla określonego symbolu.
-    W produkcji powinien pobierać rzeczywiste dane z zewnętrznego API.
+    Endpoint do pobierania łańcucha opcji dla określonego symbolu.
+    
+    Ceny i greki wyliczane są modelem Blacka-Scholesa z ostatniej sesji
+    instrumentu bazowego; łańcuch jest wyceniany raz na wersję szeregu.
     """
-    try:
-        # Pobranie parametrów zapytania
-        expiration_date = request.args.get('expirationDate')
-        option_type = request.args.get('optionType')
-        min_strike = request.args.get('minStrike')
-        max_strike = request.args.get('maxStrike')
-        
-        # Sprawdź, czy symbol jest jednym z obsługiwanych
-        if symbol.upper() not in ['IBM', 'INTC', 'TSLA']:
+    # Pobranie parametrów zapytania
+    expiration_date = request.args.get('expirationDate')
+    option_type = request.args.get('optionType')
+    
+    if option_type:
+        option_type = option_type.lower()
+        if option_type not in ('call', 'put'):
             return jsonify({
                 "status": "error",
-                "message": f"Brak obsługi opcji dla symbolu {symbol}. Obsługiwane symbole: IBM, INTC, TSLA"
+                "message": f"Nieobsługiwany typ opcji: {option_type}. Dostępne: call, put"
             }), 400
-        
-        # Symulacja danych opcji
-        # W rzeczywistości te dane powinny pochodzić z serwisu domenowego
-        
-        # Generuj dane opcji w zależności od symbolu
-        stock_prices = {
-            'IBM': 142.25,
-            'INTC': 38.46,
-            'TSLA': 248.50
-        }
-        
-        current_price = stock_prices.get(symbol.upper(), 100.0)
-        options = []
-        
-        # Generuj opcje dla różnych cen wykonania
-        strike_range = range(int(current_price * 0.7), int(current_price * 1.3), int(current_price * 0.05))
-        
-        # Filtruj zakres strajków jeśli podano parametry
-        if min_strike:
-            strike_range = [s for s in strike_range if s >= float(min_strike)]
-        if max_strike:
-            strike_range = [s for s in strike_range if s <= float(max_strike)]
-        
-        # Filtruj po typie opcji
-        option_types = ['call', 'put']
-        if option_type and option_type.lower() in option_types:
-            option_types = [option_type.lower()]
-        
-        for strike in strike_range:
-            for opt_type in option_types:
-                # Oblicz dane bazowe opcji
-                in_the_money = (opt_type == 'call' and current_price > strike) or (opt_type == 'put' and current_price < strike)
-                moneyness = abs(current_price - strike) / current_price
-                
-                # Oblicz IV na podstawie moneyness (uproszczone)
-                iv = 0.25 + 0.15 * moneyness
-                
-                # Random dla symulacji różnorodności danych
-                random_factor = random.uniform(0.9, 1.1)
-                
-                # Cena bazowa dla opcji
-                if opt_type == 'call':
-                    price = max(0, current_price - strike) + (iv * strike * 0.1)
-                else:
-                    price = max(0, strike - current_price) + (iv * strike * 0.1)
-                
-                price = round(price * random_factor, 2)
-                
-                # Podstawowe parametry opcji
-                option = {
-                    "symbol": f"{symbol}{opt_type[0].upper()}{strike}",
-                    "underlyingSymbol": symbol.upper(),
-                    "expirationDate": expiration_date or "2025-01-17",
-                    "strikePrice": strike,
-                    "optionType": opt_type,
-                    "lastPrice": price,
-                    "bid": round(price * 0.95, 2),
-                    "ask": round(price * 1.05, 2),
-                    "change": round(random.uniform(-2, 2), 2),
-                    "percentChange": round(random.uniform(-5, 5), 2),
-                    "volume": int(random.uniform(100, 5000)),
-                    "openInterest": int(random.uniform(500, 10000)),
-                    "impliedVolatility": round(iv * 100, 2),
-                    "inTheMoney": in_the_money,
-                    "lastTradeDate": (datetime.now() - timedelta(hours=random.randint(1, 24))).strftime("%Y-%m-%d %H:%M:%S"),
-                    # Grecy dla opcji
-                    "greeks": calculate_option_greeks(current_price, strike, 0.02, iv, 30/365, opt_type)
-                }
-                
-                options.append(option)
-        
+    
+    try:
+        min_strike = request.args.get('minStrike', type=float)
+        max_strike = request.args.get('maxStrike', type=float)
+        prepared = await options_service.prepare_option_chain_async(
+            symbol,
+            expiration_date=expiration_date,
+            option_type=option_type,
+            min_strike=min_strike,
+            max_strike=max_strike
+        )
+        return await conditional_response(
+            prepared,
+            lambda: {
+                "status": "success",
+                "data": prepared.build()
+            }
+        )
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except LookupError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 404
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+@app.route('/api/options/<symbol>/greeks', methods=['GET'])
+async def get_option_greeks(symbol):
+    """
+    Endpoint zwracający greki jednego kontraktu (z wycenionego łańcucha opcji).
+    
+    Odpowiedź to obiekt GreeksData (delta, gamma, theta, vega, rho) uzupełniony
+    o zmienność implikowaną (w %) i cenę kontraktu. Opcjonalny parametr price
+    (cena rynkowa) zastępuje kwotowanie z łańcucha - greki liczone są wtedy
+    przy zmienności implikowanej z tej ceny.
+    """
+    strike = request.args.get('strikePrice', type=float)
+    expiration_date = request.args.get('expDate')
+    option_type = request.args.get('optionType', 'call').lower()
+    price = request.args.get('price', type=float)
+    
+    if strike is None or not math.isfinite(strike) or strike <= 0:
+        return jsonify({
+            "status": "error",
+            "message": "Parametr 'strikePrice' musi być liczbą dodatnią"
+        }), 400
+    
+    if price is not None and not math.isfinite(price):
+        return jsonify({
+            "status": "error",
+            "message": "Parametr 'price' musi być liczbą skończoną"
+        }), 400
+    
+    if option_type not in ('call', 'put'):
+        return jsonify({
+            "status": "error",
+            "message": f"Nieobsługiwany typ opcji: {option_type}. Dostępne: call, put"
+        }), 400
+    
+    try:
+        prepared = await options_service.prepare_greeks_async(
+            symbol,
+            strike,
+            expiration_date=expiration_date,
+            option_type=option_type,
+            price=price
+        )
+        # Frontend (StockService.getGreeksData) oczekuje samego obiektu GreeksData
+        return await conditional_response(prepared, prepared.build)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except LookupError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 404
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+@app.route('/api/options/<symbol>/surface', methods=['GET'])
+async def get_volatility_surface(symbol):
+    """
+    Endpoint zwracający powierzchnię zmienności (parametry SVI przekrojów).
+    
+    Przy podanych strike i days odpowiedź zawiera też zmienność dla tej ceny
+    wykonania i horyzontu (w dniach kalendarzowych).
+    """
+    strike = request.args.get('strike', type=float)
+    days = request.args.get('days', type=float)
+    
+    if any(value is not None and not (math.isfinite(value) and value > 0) for value in (strike, days)):
+        return jsonify({
+            "status": "error",
+            "message": "Parametry 'strike' i 'days' muszą być skończonymi liczbami dodatnimi"
+        }), 400
+    
+    try:
+        surface = await options_service.describe_surface_async(symbol, strike, days)
         return jsonify({
             "status": "success",
-            "data": options
+            "data": surface
         })
+    except LookupError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 404
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -269,315 +759,233 @@ def check_quantum_status():
     })
 
 @app.route('/api/prediction/<symbol>', methods=['POST'])
-def generate_prediction(symbol):
+async def generate_prediction(symbol):
     """
-    Endpoint do generowania predykcji rozkładu prawdopodobieństwa dla opcji.
-    W produkcji powinien używać rzeczywistych modeli predykcyjnych.
+    Endpoint do generowania predykcji rozkładu prawdopodobieństwa ceny.
+    
+    Parametry (JSON):
+        timeHorizon - horyzont w dniach (domyślnie 30)
+        volatilityMultiplier - mnożnik zmienności (domyślnie 1)
+        model - "gbm" (domyślny), "bootstrap" lub "implied"
+        paths - liczba ścieżek symulacji (domyślnie 100 000)
+        window - liczba sesji użytych do kalibracji (domyślnie 252)
+        seed - ziarno generatora (domyślnie zależne od ostatniej świecy)
+        strikePrice - cena wykonania, dla której model "implied" odczytuje
+                      zmienność z powierzchni (domyślnie bieżąca cena)
     """
+    request_data = request.get_json(silent=True) or {}
+    model = request_data.get('model', GBM)
+    
     try:
-        # Pobranie parametrów z ciała zapytania
-        request_data = request.get_json()
-        
-        # Symulacja wygenerowanego rozkładu prawdopodobieństwa
-        # W rzeczywistości te dane powinny pochodzić z modelu predykcyjnego
-        
-        # Baza do symulacji
-        expected_value = float(request_data.get('strikePrice', 100))
-        
-        distribution = {
-            "expectedValue": expected_value,
-            "variance": 25.0,
-            "skewness": 0.15,
-            "kurtosis": 3.2,
-            "confidenceIntervals": [
-                {
-                    "lowerBound": expected_value - 10,
-                    "upperBound": expected_value + 10,
-                    "confidence": 0.68
-                },
-                {
-                    "lowerBound": expected_value - 20,
-                    "upperBound": expected_value + 20,
-                    "confidence": 0.95
-                },
-                {
-                    "lowerBound": expected_value - 30,
-                    "upperBound": expected_value + 30,
-                    "confidence": 0.99
-                }
-            ],
-            "discretePoints": generate_discrete_distribution(expected_value, 25.0, 10)
-        }
-        
+        strike = request_data.get('strikePrice')
+        strike = None if strike is None else float(strike)
+        horizon_days = float(request_data.get('timeHorizon', 30))
+        volatility_multiplier = float(request_data.get('volatilityMultiplier', 1))
+        paths = int(request_data.get('paths', PredictionApplicationService.DEFAULT_PATHS))
+        window = int(request_data.get('window', PredictionApplicationService.DEFAULT_WINDOW))
+        seed = request_data.get('seed')
+        seed = None if seed is None else int(seed)
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": "error",
+            "message": "Parametry 'strikePrice', 'timeHorizon', 'volatilityMultiplier', 'paths', 'window' i 'seed' muszą być liczbami"
+        }), 400
+    
+    # float() przyjmuje też "nan" i "inf" - nie przechodzą porównań zakresów poniżej
+    if (strike is not None and not (math.isfinite(strike) and strike > 0)) \
+            or not 0 < horizon_days <= MAX_PREDICTION_DAYS \
+            or not (math.isfinite(volatility_multiplier) and volatility_multiplier > 0):
+        return jsonify({
+            "status": "error",
+            "message": f"Parametry muszą być skończonymi liczbami dodatnimi, a 'timeHorizon' nie większy niż {MAX_PREDICTION_DAYS} dni"
+        }), 400
+    
+    if not MIN_SIMULATION_PATHS <= paths <= MAX_SIMULATION_PATHS or not MIN_RETURNS <= window <= MAX_CALIBRATION_WINDOW \
+            or (seed is not None and seed < 0):
+        return jsonify({
+            "status": "error",
+            "message": f"Parametr 'paths' musi mieścić się w zakresie {MIN_SIMULATION_PATHS}-{MAX_SIMULATION_PATHS}, "
+                       f"'window' w zakresie {MIN_RETURNS}-{MAX_CALIBRATION_WINDOW}, a 'seed' nie może być ujemny"
+        }), 400
+    
+    try:
+        distribution = await prediction_service.get_distribution_async(
+            symbol,
+            strike=strike,
+            horizon_days=horizon_days,
+            volatility_multiplier=volatility_multiplier,
+            model=model,
+            paths=paths,
+            window=window,
+            seed=seed
+        )
         return jsonify({
             "status": "success",
             "data": distribution
         })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except LookupError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 404
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
     except Exception as e:
         return jsonify({
             "status": "error",
             "message": str(e)
         }), 500
 
-# Funkcje pomocnicze do obliczania Greków i rozkładów prawdopodobieństwa
-
-def calculate_option_greeks(spot, strike, rate, volatility, time_to_expiry, option_type):
-    """
-    Funkcja obliczająca przybliżone wartości Greków dla opcji.
-    W produkcji powinny być używane dokładniejsze modele.
-    
-    Args:
-        spot: Bieżąca cena instrumentu bazowego
-        strike: Cena wykonania opcji
-        rate: Stopa procentowa
-        volatility: Zmienność implikowana (w postaci dziesiętnej, np. 0.2 dla 20%)
-        time_to_expiry: Czas do wygaśnięcia opcji (w latach)
-        option_type: Typ opcji ('call' lub 'put')
-        
-    Returns:
-        Słownik z wartościami Greków
+@app.route('/api/prediction/distribution', methods=['POST'])
+async def generate_return_distribution():
     """
-    # Przybliżone wartości oparte na wzorach dla modelu Black-Scholesa
-    # W rzeczywistym systemie należy użyć bibliotek finansowych z dokładnymi obliczeniami
+    Endpoint do generowania empirycznego rozkładu ceny (jądrowy estymator
+    gęstości historycznych stóp zwrotu).
     
-    # Moneyness (dla uproszczenia obliczeń)
-    moneyness = spot / strike
-    
-    # Delta
-    if option_type == 'call':
-        delta = 0.5 + 0.5 * (moneyness - 1) / (volatility * (time_to_expiry ** 0.5))
-        delta = max(0, min(1, delta))
-    else:
-        delta = -0.5 - 0.5 * (moneyness - 1) / (volatility * (time_to_expiry ** 0.5))
-        delta = max(-1, min(0, delta))
+    Parametry (JSON): symbol, strikePrice (cena, dla której zwracane jest
+    prawdopodobieństwo przekroczenia), timeHorizon (dni), volatilityMultiplier,
+    confidenceLevel i opcjonalnie window (liczba sesji, domyślnie 252).
+    Odpowiedź to sam obiekt PredictionResult (bez koperty status/data).
+    """
+    request_data = request.get_json(silent=True) or {}
+    symbol = request_data.get('symbol')
+    if not isinstance(symbol, str) or not symbol.strip():
+        return jsonify({
+            "status": "error",
+            "message": "Parametr 'symbol' jest wymagany"
+        }), 400
     
-    # Gamma (zbliżona dla call i put)
-    gamma = 0.4 * ((volatility * (time_to_expiry ** 0.5)) ** -1) * moneyness ** (-2)
-    gamma = min(1, gamma)
+    if not is_valid_symbol(symbol.strip()):
+        return invalid_symbol_response(symbol)
     
-    # Theta (przybliżenie)
-    theta = -0.5 * spot * volatility * (time_to_expiry ** -0.5) / 365
-    if option_type == 'put':
-        theta = theta + (rate * strike * (time_to_expiry ** -1)) / 365
-    else:
-        theta = theta - (rate * strike * (time_to_expiry ** -1)) / 365
+    try:
+        strike = request_data.get('strikePrice')
+        strike = None if strike is None else float(strike)
+        horizon_days = float(request_data.get('timeHorizon', 30))
+        volatility_multiplier = float(request_data.get('volatilityMultiplier', 1))
+        confidence_level = float(request_data.get('confidenceLevel', 0.95))
+        window = int(request_data.get('window', PredictionApplicationService.DEFAULT_WINDOW))
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": "error",
+            "message": "Parametry 'strikePrice', 'timeHorizon', 'volatilityMultiplier', 'confidenceLevel' i 'window' muszą być liczbami"
+        }), 400
     
-    # Vega
-    vega = 0.4 * spot * (time_to_expiry ** 0.5) * 0.01
+    # float() przyjmuje też "nan" i "inf" - nie przechodzą porównań zakresów poniżej
+    if (strike is not None and not (math.isfinite(strike) and strike > 0)) \
+            or not 0 < horizon_days <= MAX_PREDICTION_DAYS \
+            or not (math.isfinite(volatility_multiplier) and volatility_multiplier > 0) \
+            or not 0 < confidence_level < 1 or not MIN_RETURNS <= window <= MAX_CALIBRATION_WINDOW:
+        return jsonify({
+            "status": "error",
+            "message": f"Parametry muszą być skończonymi liczbami dodatnimi, 'timeHorizon' nie większy niż {MAX_PREDICTION_DAYS} dni, "
+                       f"'confidenceLevel' w zakresie (0, 1), a 'window' w zakresie {MIN_RETURNS}-{MAX_CALIBRATION_WINDOW}"
+        }), 400
     
-    # Rho
-    if option_type == 'call':
-        rho = 0.5 * strike * time_to_expiry * 0.01
-    else:
-        rho = -0.5 * strike * time_to_expiry * 0.01
-    
-    return {
-        "delta": round(delta, 4),
-        "gamma": round(gamma, 4),
-        "theta": round(theta, 4),
-        "vega": round(vega, 4),
-        "rho": round(rho, 4)
-    }
+    try:
+        result = await prediction_service.get_return_distribution_async(
+            symbol.strip(),
+            strike=strike,
+            horizon_days=horizon_days,
+            volatility_multiplier=volatility_multiplier,
+            confidence_level=confidence_level,
+            window=window
+        )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except LookupError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 404
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+# Maksymalna liczba wskaźników w jednym zapytaniu zbiorczym
+MAX_BATCH_INDICATORS = 20
 
-def generate_discrete_distribution(mean, variance, num_points):
+@app.route('/api/indicators/<symbol>', methods=['GET'])
+async def get_technical_indicators(symbol):
     """
-    Generuje dyskretny rozkład prawdopodobieństwa.
+    Endpoint do pobierania kilku wskaźników technicznych jednym zapytaniem.
     
-    Args:
-        mean: Średnia rozkładu
-        variance: Wariancja rozkładu
-        num_points: Liczba punktów do wygenerowania
-        
-    Returns:
-        Lista punktów (wartość, prawdopodobieństwo)
+    Parametr `indicators` zawiera listę specyfikacji rozdzieloną przecinkami,
+    np. `sma:20,ema:50,rsi:14,macd:12/26/9,bb:20/2`. Szereg cen pobierany jest
+    raz dla wszystkich wskaźników, a wynik zawiera wskaźniki pod kluczami
+    równymi specyfikacjom.
     """
-    points = []
-    std_dev = variance ** 0.5
-    
-    total_prob = 0
-    for i in range(num_points):
-        # Generuj punkty równomiernie rozmieszczone w zakresie ±3 odchyleń standardowych
-        value = mean + (i - num_points / 2) * (6 * std_dev / num_points)
-        
-        # Przybliżenie rozkładu normalnego
-        prob = (1 / (std_dev * (2 * 3.14159) ** 0.5)) * (2.71828 ** (-(value - mean) ** 2 / (2 * variance)))
-        
-        points.append({
-            "value": round(value, 2),
-            "probability": round(prob, 4)
-        })
-        total_prob += prob
-    
-    # Normalizacja prawdopodobieństw
-    for point in points:
-        point["probability"] = round(point["probability"] / total_prob, 4)
-    
-    return points
-
-# Funkcje do obliczania wskaźników technicznych
-def calculate_sma(prices, period):
-    """Oblicza SMA (Simple Moving Average) dla danych cenowych."""
-    if len(prices) < period:
-        return []
-    
-    result = []
-    for i in range(period - 1, len(prices)):
-        sum_prices = sum(float(prices[j]['close']) for j in range(i - period + 1, i + 1))
-        avg = sum_prices / period
-        timestamp = prices[i]['timestamp']
-        result.append({"timestamp": timestamp, "value": avg})
-    
-    return result
-
-def calculate_ema(prices, period):
-    """Oblicza EMA (Exponential Moving Average) dla danych cenowych."""
-    if len(prices) < period:
-        return []
-    
-    # Początek z SMA
-    sma = sum(float(prices[i]['close']) for i in range(period)) / period
-    result = [{"timestamp": prices[period-1]['timestamp'], "value": sma}]
-    
-    # Mnożnik dla EMA
-    multiplier = 2 / (period + 1)
-    
-    # Obliczenie EMA dla pozostałych dni
-    ema = sma
-    for i in range(period, len(prices)):
-        ema = (float(prices[i]['close']) - ema) * multiplier + ema
-        result.append({"timestamp": prices[i]['timestamp'], "value": ema})
-    
-    return result
-
-def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
-    """Oblicza MACD (Moving Average Convergence Divergence) dla danych cenowych."""
-    if len(prices) < slow_period + signal_period:
-        return {"macdLine": [], "signalLine": [], "histogram": []}
-    
-    # Oblicz EMA dla szybkiego i wolnego okresu
-    fast_ema = calculate_ema(prices, fast_period)
-    slow_ema = calculate_ema(prices, slow_period)
-    
-    # Wyrównaj długości (EMA wolnego okresu jest krótsza)
-    start_idx = slow_period - fast_period
-    fast_ema = fast_ema[start_idx:]
-    
-    # Oblicz linię MACD (różnica między szybkim i wolnym EMA)
-    macd_line = []
-    for i in range(len(slow_ema)):
-        macd_value = fast_ema[i]['value'] - slow_ema[i]['value']
-        macd_line.append({"timestamp": slow_ema[i]['timestamp'], "value": macd_value})
-    
-    # Oblicz linię sygnału (EMA linii MACD)
-    signal_line = []
-    if len(macd_line) >= signal_period:
-        # Początek z SMA
-        signal_sma = sum(macd_line[i]['value'] for i in range(signal_period)) / signal_period
-        signal_line.append({"timestamp": macd_line[signal_period-1]['timestamp'], "value": signal_sma})
-        
-        # Mnożnik dla EMA
-        multiplier = 2 / (signal_period + 1)
+    try:
+        interval = request.args.get('interval', 'daily')
+        period = request.args.get('period', '1y')
+        specs = [spec.strip() for spec in request.args.get('indicators', '').split(',') if spec.strip()]
         
-        # Obliczenie EMA dla pozostałych dni
-        signal_ema = signal_sma
-        for i in range(signal_period, len(macd_line)):
-            signal_ema = (macd_line[i]['value'] - signal_ema) * multiplier + signal_ema
-            signal_line.append({"timestamp": macd_line[i]['timestamp'], "value": signal_ema})
-    
-    # Oblicz histogram (różnica między linią MACD i linią sygnału)
-    histogram = []
-    for i in range(len(signal_line)):
-        idx = i + signal_period
-        hist_value = macd_line[idx]['value'] - signal_line[i]['value']
-        histogram.append({"timestamp": macd_line[idx]['timestamp'], "value": hist_value})
-    
-    # Dopasuj długości danych dla frontendu
-    macd_line = macd_line[signal_period:]
-    
-    return {
-        "macdLine": macd_line,
-        "signalLine": signal_line,
-        "histogram": histogram
-    }
-
-def calculate_rsi(prices, period=14):
-    """Oblicza RSI (Relative Strength Index) dla danych cenowych."""
-    if len(prices) <= period:
-        return []
-    
-    result = []
-    
-    # Obliczanie zmian cen
-    changes = []
-    for i in range(1, len(prices)):
-        changes.append(float(prices[i]['close']) - float(prices[i-1]['close']))
-    
-    # Obliczanie początkowego RSI
-    gains = [max(0, change) for change in changes[:period]]
-    losses = [max(0, -change) for change in changes[:period]]
-    
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period
-    
-    if avg_loss == 0:
-        result.append({"timestamp": prices[period]['timestamp'], "value": 100})
-    else:
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        result.append({"timestamp": prices[period]['timestamp'], "value": rsi})
-    
-    # Obliczanie RSI dla pozostałych dni
-    for i in range(period + 1, len(prices)):
-        change = float(prices[i]['close']) - float(prices[i-1]['close'])
-        gain = max(0, change)
-        loss = max(0, -change)
+        if not specs:
+            return jsonify({
+                "status": "error",
+                "message": "Parametr 'indicators' jest wymagany"
+            }), 400
         
-        avg_gain = (avg_gain * (period - 1) + gain) / period
-        avg_loss = (avg_loss * (period - 1) + loss) / period
+        if len(specs) > MAX_BATCH_INDICATORS:
+            return jsonify({
+                "status": "error",
+                "message": f"Maksymalna liczba wskaźników w zapytaniu to {MAX_BATCH_INDICATORS}"
+            }), 400
         
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+        try:
+            for spec in specs:
+                parse_spec(spec)
+            max_points = parse_max_points()
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
         
-        result.append({"timestamp": prices[i]['timestamp'], "value": rsi})
-    
-    return result
-
-def calculate_bollinger_bands(prices, period=20, std_dev=2):
-    """Oblicza Wstęgi Bollingera dla danych cenowych."""
-    if len(prices) < period:
-        return {"upperBand": [], "middleBand": [], "lowerBand": []}
-    
-    # Obliczanie SMA (środkowa wstęga)
-    middle_band = calculate_sma(prices, period)
-    
-    # Obliczanie górnej i dolnej wstęgi
-    upper_band = []
-    lower_band = []
-    
-    for i in range(len(middle_band)):
-        idx = i + period - 1
-        # Obliczanie odchylenia standardowego
-        variance = sum((float(prices[j]['close']) - middle_band[i]['value'])**2 for j in range(idx - period + 1, idx + 1)) / period
-        std = variance ** 0.5
+        # Jedno pobranie szeregu dla wszystkich wskaźników
+        prepared = await application_service.prepare_indicators_async(
+            symbol,
+            specs,
+            interval=interval,
+            period=period,
+            start_date=request.args.get('startDate'),
+            end_date=request.args.get('endDate'),
+            max_points=max_points
+        )
         
-        # Obliczanie górnej i dolnej wstęgi
-        upper = middle_band[i]['value'] + (std_dev * std)
-        lower = middle_band[i]['value'] - (std_dev * std)
+        if prepared is None:
+            return jsonify({
+                "status": "error",
+                "message": f"Brak danych dla symbolu {symbol}"
+            }), 404
         
-        upper_band.append({"timestamp": middle_band[i]['timestamp'], "value": upper})
-        lower_band.append({"timestamp": middle_band[i]['timestamp'], "value": lower})
-    
-    return {
-        "upperBand": upper_band,
-        "middleBand": middle_band,
-        "lowerBand": lower_band
-    }
+        return await conditional_response(prepared, lambda: {
+            "status": "success",
+            "data": prepared.build()
+        })
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
 
 @app.route('/api/indicators/<symbol>/<indicator>', methods=['GET'])
-def get_technical_indicator(symbol, indicator):
+async def get_technical_indicator(symbol, indicator):
     """
     Endpoint do pobierania danych wskaźników technicznych dla określonego symbolu.
     """
@@ -586,64 +994,63 @@ def get_technical_indicator(symbol, indicator):
         interval = request.args.get('interval', 'daily')
         period = request.args.get('period', '1y')
         
+        if get_indicator(indicator) is None:
+            return jsonify({
+                "status": "error",
+                "message": f"Nieznany wskaźnik: {indicator}"
+            }), 400
+        
+        try:
+            max_points = parse_max_points()
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
+        
         # Dodatkowe parametry dla wskaźników
         params = {}
         for key in request.args:
-            if key not in ['interval', 'period', 'startDate', 'endDate']:
+            if key not in ['interval', 'period', 'startDate', 'endDate', 'maxPoints']:
                 try:
                     params[key] = float(request.args.get(key))
                 except ValueError:
                     params[key] = request.args.get(key)
         
-        # Pozyskanie danych akcji
-        stock_data = application_service.get_stock_data(
+        # Obliczanie wskaźnika na kolumnach szeregu (rejestr w domain.services.technical_indicators)
+        prepared = await application_service.prepare_indicator_async(
             symbol,
+            indicator,
+            params,
             interval=interval,
-            period=period
+            period=period,
+            max_points=max_points
         )
         
-        if not stock_data or not stock_data['prices'] or len(stock_data['prices']) == 0:
+        if prepared is None:
             return jsonify({
                 "status": "error",
                 "message": f"Brak danych dla symbolu {symbol}"
             }), 404
         
-        prices = stock_data['prices']
-        result = None
-        
-        # Obliczanie wskaźników
-        if indicator == 'sma':
-            period = int(params.get('period', 14))
-            result = calculate_sma(prices, period)
-        elif indicator == 'ema':
-            period = int(params.get('period', 14))
-            result = calculate_ema(prices, period)
-        elif indicator == 'macd':
-            fast_period = int(params.get('fastPeriod', 12))
-            slow_period = int(params.get('slowPeriod', 26))
-            signal_period = int(params.get('signalPeriod', 9))
-            result = calculate_macd(prices, fast_period, slow_period, signal_period)
-        elif indicator == 'rsi':
-            period = int(params.get('period', 14))
-            result = calculate_rsi(prices, period)
-        elif indicator == 'bb':
-            period = int(params.get('period', 20))
-            std_dev = float(params.get('stdDev', 2))
-            result = calculate_bollinger_bands(prices, period, std_dev)
-        else:
-            return jsonify({
-                "status": "error",
-                "message": f"Nieznany wskaźnik: {indicator}"
-            }), 400
-        
-        # Dodaj parametry użyte do obliczenia wskaźnika
-        if isinstance(result, dict):
-            result['params'] = params
+        def build_payload():
+            result = prepared.build()
+            # Dodaj parametry użyte do obliczenia wskaźnika (kopia - wynik może pochodzić z pamięci podręcznej)
+            if isinstance(result, dict):
+                result = dict(result, params=params)
+            return {
+                "status": "success",
+                "data": result
+            }
         
+        return await conditional_response(prepared, build_payload)
+    except ValueError as e:
         return jsonify({
-            "status": "success",
-            "data": result
-        })
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except RateLimitExceeded as e:
+        return rate_limited_response(e)
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -652,4 +1059,7 @@ def get_technical_indicator(symbol, indicator):
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
+    # Przy debug=True zapytania obsługuje proces potomny automatycznego przeładowania (WERKZEUG_RUN_MAIN)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_tasks()
     app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file